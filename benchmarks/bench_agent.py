@@ -0,0 +1,103 @@
+"""
+Benchmark for signing certificates with a CA key held by ssh-agent,
+comparing a new connection per certificate with the persistent
+connections of AgentClient, with and without pipelining
+
+Needs ssh-agent and ssh-add. Run from the repository root:
+    python -m benchmarks.bench_agent [certificates] [threads]
+"""
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+import src.sshkey_tools.cert as _CERT
+import src.sshkey_tools.keys as _KEY
+from src.sshkey_tools.agent import AgentClient, AgentPrivateKey
+
+from .bench_sign_many import create_batch
+
+
+def bench(mode: str, sign, ca: _KEY.PrivateKey, count: int) -> None:
+    """Sign a new batch and print the number of certificates per second"""
+    certificates = create_batch(ca, count)
+    start = time.perf_counter()
+    sign(certificates)
+    seconds = time.perf_counter() - start
+
+    print(f"{mode:<36} {count / seconds:>10.0f} certs/s")
+
+
+def sign_reconnecting(certificates: list, path: str) -> None:
+    """Sign each certificate over a new connection to the agent"""
+    for certificate in certificates:
+        with AgentClient(path) as client:
+            certificate.footer.signature.private_key.client = client
+            certificate.sign()
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+    threads = int(sys.argv[2]) if len(sys.argv) > 2 else 8
+
+    with tempfile.TemporaryDirectory() as folder:
+        path = os.path.join(folder, "agent.sock")
+        agent = subprocess.Popen(
+            ["ssh-agent", "-D", "-a", path], stdout=subprocess.DEVNULL
+        )
+        try:
+            while not os.path.exists(path):
+                time.sleep(0.01)
+
+            ca = _KEY.Ed25519PrivateKey.generate()
+            ca.to_file(os.path.join(folder, "ca"))
+            os.chmod(os.path.join(folder, "ca"), 0o600)
+            subprocess.run(
+                ["ssh-add", "-q", os.path.join(folder, "ca")],
+                env={**os.environ, "SSH_AUTH_SOCK": path},
+                check=True,
+            )
+
+            with AgentClient(path, max_connections=1) as client:
+                key = AgentPrivateKey.from_agent(
+                    public_key=ca.public_key, client=client
+                )
+                bench(
+                    "new connection per certificate",
+                    lambda certs: sign_reconnecting(certs, path),
+                    key,
+                    count,
+                )
+                bench(
+                    "sign() loop, 1 connection",
+                    lambda certs: [c.sign() for c in certs],
+                    key,
+                    count,
+                )
+                bench(
+                    f"sign_many {threads} threads, 1 connection",
+                    lambda certs: _CERT.SSHCertificate.sign_many(
+                        certs, max_workers=threads
+                    ),
+                    key,
+                    count,
+                )
+
+            with AgentClient(path, max_connections=4) as client:
+                key = AgentPrivateKey(ca.public_key, client)
+                bench(
+                    f"sign_many {threads} threads, 4 connections",
+                    lambda certs: _CERT.SSHCertificate.sign_many(
+                        certs, max_workers=threads
+                    ),
+                    key,
+                    count,
+                )
+        finally:
+            agent.terminate()
+            agent.wait()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,71 @@
+"""
+Benchmark for the event loop latency while signing certificates
+with an RSA-4096 CA, comparing blocking sign() calls in coroutines
+with sshkey_tools.aio.sign
+
+Run from the repository root:
+    python -m benchmarks.bench_aio [certificates] [concurrency]
+"""
+import asyncio
+import sys
+import time
+
+import src.sshkey_tools.aio as _AIO
+import src.sshkey_tools.keys as _KEY
+
+from .bench_sign_many import create_batch
+
+TICK = 0.005
+
+
+async def ticker(lags: list, stop: asyncio.Event) -> None:
+    """Measure how late the event loop wakes up a sleeping task"""
+    while not stop.is_set():
+        start = time.perf_counter()
+        await asyncio.sleep(TICK)
+        lags.append(time.perf_counter() - start - TICK)
+
+
+async def bench(mode: str, sign, certificates: list, concurrency: int) -> None:
+    """Sign the certificates while measuring the event loop latency"""
+    lags, stop = [], asyncio.Event()
+    tick_task = asyncio.ensure_future(ticker(lags, stop))
+    queue = list(certificates)
+
+    async def worker():
+        while queue:
+            await sign(queue.pop())
+
+    start = time.perf_counter()
+    await asyncio.gather(*[worker() for _ in range(concurrency)])
+    seconds = time.perf_counter() - start
+    stop.set()
+    await tick_task
+
+    lags.sort()
+    print(
+        f"{mode:<14} {len(certificates) / seconds:>6.0f} certs/s  "
+        f"loop lag p50 {lags[len(lags) // 2] * 1000:>6.1f} ms  "
+        f"p99 {lags[int(len(lags) * 0.99)] * 1000:>6.1f} ms  "
+        f"max {lags[-1] * 1000:>6.1f} ms"
+    )
+
+
+async def blocking_sign(certificate) -> None:
+    """Sign in the coroutine, blocking the event loop"""
+    certificate.sign()
+
+
+async def main(count: int, concurrency: int) -> None:
+    ca = _KEY.RsaPrivateKey.generate(4096)
+    await bench("blocking sign", blocking_sign, create_batch(ca, count), concurrency)
+    await bench("aio.sign", _AIO.sign, create_batch(ca, count), concurrency)
+
+
+if __name__ == "__main__":
+    asyncio.run(
+        main(
+            int(sys.argv[1]) if len(sys.argv) > 1 else 200,
+            int(sys.argv[2]) if len(sys.argv) > 2 else 8,
+        )
+    )
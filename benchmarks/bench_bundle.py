@@ -0,0 +1,65 @@
+"""
+Benchmark for parsing a bundle of certificate lines,
+comparing a from_string loop with parse_many
+
+Run from the repository root:
+    python -m benchmarks.bench_bundle [certificates]
+"""
+
+import sys
+import time
+from base64 import b64encode
+
+import src.sshkey_tools.cert as _CERT
+import src.sshkey_tools.keys as _KEY
+
+from .bench_decode import create_certificate
+
+
+def create_bundle(count: int) -> list:
+    """Create a list of certificate lines with a mix of key types"""
+    ca = _KEY.Ed25519PrivateKey.generate()
+    lines = []
+    for subject in (
+        _KEY.RsaPrivateKey.generate(2048),
+        _KEY.EcdsaPrivateKey.generate(),
+        _KEY.Ed25519PrivateKey.generate(),
+    ):
+        blob = create_certificate(subject, ca)
+        cert_type = _CERT.SSHCertificate.from_bytes(blob).get("pubkey_type")
+        lines.append(f"{cert_type} {b64encode(blob).decode('utf-8')} user@host\n")
+
+    return [lines[i % len(lines)] for i in range(count)]
+
+
+def bench(name: str, parse, lines: list) -> None:
+    """Parse all lines and print the number of certificates per second"""
+    start = time.perf_counter()
+    count = sum(1 for _ in parse(lines))
+    seconds = time.perf_counter() - start
+
+    print(
+        f"{name:<18} {count} certificates in {seconds:.2f}s "
+        + f"({count / seconds:.0f} certs/s)"
+    )
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 50_000
+    lines = create_bundle(count)
+
+    bench(
+        "from_string",
+        lambda lines: (_CERT.SSHCertificate.from_string(line) for line in lines),
+        lines,
+    )
+    bench("parse_many", _CERT.SSHCertificate.parse_many, lines)
+    bench(
+        "parse_many (lazy)",
+        lambda lines: _CERT.SSHCertificate.parse_many(lines, lazy=True),
+        lines,
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,63 @@
+"""
+Benchmark for the peak memory use of reading a large certificate bundle file,
+comparing from_string on the full file contents with CertificateBundleReader.
+Each mode runs in a separate process so the peak RSS can be compared.
+
+Run from the repository root:
+    python -m benchmarks.bench_bundle_file [certificates]
+"""
+import os
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+
+import src.sshkey_tools.cert as _CERT
+from src.sshkey_tools.bundle import CertificateBundleReader
+
+from .bench_bundle import create_bundle
+
+
+def run(mode: str, path: str) -> None:
+    """Parse every certificate in the file and print the time and peak RSS"""
+    start = time.perf_counter()
+    if mode == "read":
+        with open(path, "r", encoding="utf-8") as file:
+            count = sum(
+                1
+                for line in file.read().splitlines()
+                if _CERT.SSHCertificate.from_string(line)
+            )
+    else:
+        with CertificateBundleReader(path) as reader:
+            count = sum(1 for _ in reader)
+
+    seconds = time.perf_counter() - start
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+    print(
+        f"{mode:<6} {count} certificates in {seconds:.2f}s, peak RSS {peak:.0f} MiB"
+    )
+
+
+def main():
+    if len(sys.argv) > 2:
+        run(sys.argv[1], sys.argv[2])
+        return
+
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    with tempfile.TemporaryDirectory() as folder:
+        path = os.path.join(folder, "bundle")
+        with open(path, "w", encoding="utf-8") as file:
+            file.writelines(create_bundle(count))
+
+        print(f"Bundle size: {os.path.getsize(path) / 2**20:.0f} MiB")
+        for mode in ("read", "mmap"):
+            subprocess.run(
+                [sys.executable, "-m", "benchmarks.bench_bundle_file", mode, path],
+                check=True,
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,50 @@
+"""
+Benchmark for parsing a working set of certificates that are seen
+repeatedly, with and without a CertificateCache
+
+Run from the repository root:
+    python -m benchmarks.bench_cache [certificates] [working-set]
+"""
+
+import random
+import sys
+import time
+
+import src.sshkey_tools.cert as _CERT
+import src.sshkey_tools.keys as _KEY
+from src.sshkey_tools.cache import CertificateCache
+
+from .bench_decode import create_certificate
+
+
+def bench(name: str, blobs: list, count: int, cache: CertificateCache = None):
+    """Parse count certificates drawn from the working set"""
+    order = random.Random(0).choices(range(len(blobs)), k=count)
+
+    start = time.perf_counter()
+    for i in order:
+        _CERT.SSHCertificate.from_bytes(blobs[i], cache=cache)
+    seconds = time.perf_counter() - start
+
+    print(
+        f"{name:<10} {count} certificates in {seconds:.2f}s "
+        + f"({count / seconds:.0f} certs/s)"
+    )
+    if cache is not None:
+        print(f"{'':<10} {cache.stats}")
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    working_set = int(sys.argv[2]) if len(sys.argv) > 2 else 2000
+
+    ca = _KEY.Ed25519PrivateKey.generate()
+    subject = _KEY.RsaPrivateKey.generate(2048)
+    blobs = [create_certificate(subject, ca) for _ in range(working_set)]
+
+    bench("no cache", blobs, count)
+    bench("cache", blobs, count, CertificateCache(maxsize=working_set))
+
+
+if __name__ == "__main__":
+    main()
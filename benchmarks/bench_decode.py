@@ -0,0 +1,65 @@
+"""
+Benchmark for certificate parsing throughput
+
+Run from the repository root:
+    python -m benchmarks.bench_decode [iterations]
+"""
+import sys
+import timeit
+
+import src.sshkey_tools.cert as _CERT
+import src.sshkey_tools.keys as _KEY
+
+
+def create_certificate(
+    subject: _KEY.PrivateKey, ca: _KEY.PrivateKey, principals: int = 16
+) -> bytes:
+    """Create and sign a certificate, returning the raw certificate bytes"""
+    certificate = _CERT.SSHCertificate.create(
+        subject_pubkey=subject.public_key,
+        ca_privkey=ca,
+        fields=_CERT.CertificateFields(
+            key_id="benchmark",
+            principals=[f"principal-{i}" for i in range(principals)],
+            valid_before="52w",
+            extensions=["permit-pty", "permit-agent-forwarding"],
+        ),
+    )
+    certificate.sign()
+    return bytes(certificate)
+
+
+def bench(name: str, data: bytes, iterations: int) -> None:
+    """Measure and print the number of parsed certificates per second"""
+    seconds = min(
+        timeit.repeat(
+            lambda: _CERT.SSHCertificate.from_bytes(data), number=iterations, repeat=3
+        )
+    )
+    print(f"{name:<20} {len(data):>6} bytes  {iterations / seconds:>10.0f} certs/s")
+
+
+def main():
+    iterations = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+
+    rsa = _KEY.RsaPrivateKey.generate(4096)
+    ecdsa = _KEY.EcdsaPrivateKey.generate(_KEY.EcdsaCurves.P256)
+    ed25519 = _KEY.Ed25519PrivateKey.generate()
+
+    bench("RSA-4096", create_certificate(rsa, rsa), iterations)
+    bench("ECDSA P-256", create_certificate(ecdsa, ecdsa), iterations)
+    bench("Ed25519", create_certificate(ed25519, ed25519), iterations)
+    bench(
+        "RSA-4096 (1000 pr.)",
+        create_certificate(rsa, rsa, principals=1000),
+        iterations // 10,
+    )
+    bench(
+        "Ed25519 (1000 pr.)",
+        create_certificate(ed25519, ed25519, principals=1000),
+        iterations // 10,
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,55 @@
+"""
+Benchmark for an issuance pipeline that records a digest of the signed
+data for auditing, comparing hashing the data separately from signing
+with signing the digest from get_digest
+
+Run from the repository root:
+    python -m benchmarks.bench_digest [iterations] [principals]
+"""
+import hashlib
+import sys
+import timeit
+from datetime import datetime, timedelta
+
+import src.sshkey_tools.cert as _CERT
+import src.sshkey_tools.keys as _KEY
+
+
+def main():
+    iterations = int(sys.argv[1]) if len(sys.argv) > 1 else 300
+    principals = int(sys.argv[2]) if len(sys.argv) > 2 else 2000
+
+    subject = _KEY.Ed25519PrivateKey.generate().public_key
+    for name, ca in (
+        ("RSA-2048", _KEY.RsaPrivateKey.generate(2048)),
+        ("ECDSA P-256", _KEY.EcdsaPrivateKey.generate(_KEY.EcdsaCurves.P256)),
+        ("ECDSA P-521", _KEY.EcdsaPrivateKey.generate(_KEY.EcdsaCurves.P521)),
+    ):
+        certificate = _CERT.SSHCertificate.create(
+            subject_pubkey=subject,
+            ca_privkey=ca,
+            fields=_CERT.CertificateFields(
+                key_id="benchmark",
+                principals=[f"principal-{i}" for i in range(principals)],
+                valid_before=datetime.now() + timedelta(weeks=52),
+            ),
+        )
+        hash_name = certificate.footer.signature.get_hash_algorithm().name
+        audit = []
+
+        def separate():
+            audit.append(hashlib.new(hash_name, certificate.get_signable()).digest())
+            certificate.sign()
+
+        def prehashed():
+            digest = certificate.get_digest()
+            audit.append(digest)
+            certificate.sign(digest=digest)
+
+        for mode, func in (("hash + sign", separate), ("sign digest", prehashed)):
+            seconds = min(timeit.repeat(func, number=iterations, repeat=3))
+            print(f"{name:<12} {mode:<12} {iterations / seconds:>8.0f} certs/s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,96 @@
+"""
+Benchmark for certificate serialization throughput and the memory
+allocated while serializing a certificate
+
+Run from the repository root:
+    python -m benchmarks.bench_encode [iterations]
+"""
+
+import sys
+import timeit
+import tracemalloc
+
+import src.sshkey_tools.cert as _CERT
+import src.sshkey_tools.keys as _KEY
+
+
+def create_certificate(
+    subject: _KEY.PrivateKey,
+    ca: _KEY.PrivateKey,
+    principals: int = 16,
+    extensions: int = 2,
+) -> _CERT.SSHCertificate:
+    """Create and sign a certificate with the given number of principals and extensions"""
+    certificate = _CERT.SSHCertificate.create(
+        subject_pubkey=subject.public_key,
+        ca_privkey=ca,
+        fields=_CERT.CertificateFields(
+            key_id="benchmark",
+            principals=[f"principal-{i}" for i in range(principals)],
+            valid_before="52w",
+            extensions={f"extension-{i}@example.com": "" for i in range(extensions)},
+        ),
+    )
+    certificate.sign()
+    return certificate
+
+
+def encode(certificate: _CERT.SSHCertificate) -> bytes:
+    """Serialize the certificate without the kept encodings"""
+    certificate.invalidate()
+    return bytes(certificate)
+
+
+def peak_allocation(certificate: _CERT.SSHCertificate) -> int:
+    """Measure the peak memory allocated while serializing the certificate once"""
+    certificate.invalidate()
+    tracemalloc.start()
+    tracemalloc.reset_peak()
+    baseline = tracemalloc.get_traced_memory()[0]
+    data = bytes(certificate)
+    peak = tracemalloc.get_traced_memory()[1] - baseline
+    tracemalloc.stop()
+
+    # The peak includes the result, report the overhead on top of it
+    return peak - len(data)
+
+
+def bench(name: str, certificate: _CERT.SSHCertificate, iterations: int) -> None:
+    """
+    Measure and print the number of serialized certificates per second,
+    encoding every time and reusing the kept encoding
+    """
+    uncached = min(
+        timeit.repeat(lambda: encode(certificate), number=iterations, repeat=3)
+    )
+    cached = min(timeit.repeat(lambda: bytes(certificate), number=iterations, repeat=3))
+    print(
+        f"{name:<22} {len(bytes(certificate)):>7} bytes  "
+        + f"{iterations / uncached:>8.0f} certs/s  "
+        + f"{iterations / cached:>9.0f} cached/s  "
+        + f"{peak_allocation(certificate):>8} bytes overhead"
+    )
+
+
+def main():
+    iterations = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+
+    rsa = _KEY.RsaPrivateKey.generate(4096)
+    ed25519 = _KEY.Ed25519PrivateKey.generate()
+
+    bench("RSA-4096", create_certificate(rsa, rsa), iterations)
+    bench("Ed25519", create_certificate(ed25519, ed25519), iterations)
+    bench(
+        "Ed25519 (1000 pr.)",
+        create_certificate(ed25519, ed25519, principals=1000),
+        iterations // 10,
+    )
+    bench(
+        "Ed25519 (1000 ext.)",
+        create_certificate(ed25519, ed25519, extensions=1000),
+        iterations // 10,
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,60 @@
+"""
+Benchmark for the random field values of a certificate (nonce, serial
+and key ID), comparing separate draws per value with the entropy pool
+
+Run from the repository root:
+    python -m benchmarks.bench_entropy [iterations]
+"""
+import sys
+import time
+from random import randint
+from secrets import randbits
+from uuid import uuid4
+
+import src.sshkey_tools.entropy as _ENTROPY
+import src.sshkey_tools.fields as _FIELD
+
+
+def separate_draws():
+    """The previous defaults: a decimal nonce, randint and uuid4"""
+    return str(randbits(128)), randint(0, 2**64 - 1), str(uuid4())
+
+
+def pooled_draws():
+    """The defaults drawn from the entropy pool"""
+    return (
+        _ENTROPY.random_nonce(),
+        _ENTROPY.random_serial(),
+        _ENTROPY.random_keyid(),
+    )
+
+
+def field_defaults():
+    """The default fields, as created for a new certificate"""
+    return (
+        _FIELD.NonceField.factory(),
+        _FIELD.SerialField.factory(),
+        _FIELD.KeyIdField.factory(),
+    )
+
+
+def bench(name: str, func, iterations: int) -> None:
+    """Print the number of certificates' worth of values per second"""
+    start = time.perf_counter()
+    for _ in range(iterations):
+        func()
+    seconds = time.perf_counter() - start
+
+    print(f"{name:<16} {iterations / seconds:>12.0f} certs/s")
+
+
+def main():
+    iterations = int(sys.argv[1]) if len(sys.argv) > 1 else 200000
+
+    bench("separate draws", separate_draws, iterations)
+    bench("entropy pool", pooled_draws, iterations)
+    bench("field defaults", field_defaults, iterations)
+
+
+if __name__ == "__main__":
+    main()
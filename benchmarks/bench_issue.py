@@ -0,0 +1,69 @@
+"""
+Benchmark for issuing certificates: signing, exporting and verifying
+the signature as a self-check, and exporting the same certificate again
+
+Run from the repository root:
+    python -m benchmarks.bench_issue [iterations]
+"""
+import sys
+import timeit
+from datetime import datetime, timedelta
+
+import src.sshkey_tools.cert as _CERT
+import src.sshkey_tools.keys as _KEY
+
+
+def issue(subject: _KEY.PublicKey, ca: _KEY.PrivateKey, principals: list) -> str:
+    """Create, sign, export and verify a certificate"""
+    certificate = _CERT.SSHCertificate.create(
+        subject_pubkey=subject,
+        ca_privkey=ca,
+        fields=_CERT.CertificateFields(
+            key_id="benchmark",
+            principals=principals,
+            valid_before=datetime.now() + timedelta(weeks=52),
+            extensions=["permit-pty", "permit-agent-forwarding"],
+        ),
+    )
+    certificate.sign()
+    cert_string = certificate.to_string()
+    certificate.verify(ca.public_key, raise_on_error=True)
+
+    return cert_string
+
+
+def bench(name: str, ca: _KEY.PrivateKey, principals: int, iterations: int) -> None:
+    """Measure and print the number of issued and re-exported certificates per second"""
+    subject = _KEY.Ed25519PrivateKey.generate().public_key
+    names = [f"principal-{i}" for i in range(principals)]
+
+    seconds = min(
+        timeit.repeat(lambda: issue(subject, ca, names), number=iterations, repeat=3)
+    )
+
+    certificate = _CERT.SSHCertificate.from_string(issue(subject, ca, names))
+    export_seconds = min(
+        timeit.repeat(certificate.to_string, number=iterations * 10, repeat=3)
+    )
+
+    print(
+        f"{name:<22} issue {iterations / seconds:>8.0f} certs/s  "
+        + f"re-export {iterations * 10 / export_seconds:>8.0f} certs/s"
+    )
+
+
+def main():
+    iterations = int(sys.argv[1]) if len(sys.argv) > 1 else 1000
+
+    bench("Ed25519 CA", _KEY.Ed25519PrivateKey.generate(), 16, iterations)
+    bench(
+        "Ed25519 CA (1000 pr.)",
+        _KEY.Ed25519PrivateKey.generate(),
+        1000,
+        iterations // 10,
+    )
+    bench("RSA-2048 CA", _KEY.RsaPrivateKey.generate(2048), 16, iterations // 10)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,46 @@
+"""
+Benchmark for reading a single field from many certificates,
+comparing eager and lazy decoding
+
+Run from the repository root:
+    python -m benchmarks.bench_lazy [certificates]
+"""
+import sys
+import time
+
+import src.sshkey_tools.cert as _CERT
+import src.sshkey_tools.keys as _KEY
+
+from .bench_decode import create_certificate
+
+
+def bench(name: str, blobs: list, count: int, lazy: bool) -> None:
+    """Parse count certificates and read the key_id of each one"""
+    start = time.perf_counter()
+    for i in range(count):
+        _CERT.SSHCertificate.from_bytes(blobs[i % len(blobs)], lazy=lazy).get("key_id")
+    seconds = time.perf_counter() - start
+
+    print(
+        f"{name:<10} {'lazy' if lazy else 'eager':<6} "
+        + f"{count} certificates in {seconds:.2f}s ({count / seconds:.0f} certs/s)"
+    )
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+
+    ca = _KEY.Ed25519PrivateKey.generate()
+    for name, generate in (
+        ("RSA-2048", lambda: _KEY.RsaPrivateKey.generate(2048)),
+        ("ECDSA", _KEY.EcdsaPrivateKey.generate),
+        ("Ed25519", _KEY.Ed25519PrivateKey.generate),
+    ):
+        blobs = [create_certificate(generate(), ca) for _ in range(10)]
+
+        bench(name, blobs, count, lazy=False)
+        bench(name, blobs, count, lazy=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,78 @@
+"""
+Benchmark for reading the routing fields of a certificate (type, nonce,
+subject key fingerprint and serial), comparing a full from_string
+decode with SSHCertificate.peek
+
+Run from the repository root:
+    python -m benchmarks.bench_peek [iterations]
+"""
+import sys
+import timeit
+
+import src.sshkey_tools.cert as _CERT
+import src.sshkey_tools.fields as _FIELD
+import src.sshkey_tools.keys as _KEY
+from src.sshkey_tools.wire import Base64Cursor
+
+from .bench_decode import create_certificate
+
+
+def full_decode(cert_str: str) -> tuple:
+    """Read the routing fields from a fully decoded certificate"""
+    certificate = _CERT.SSHCertificate.from_string(cert_str)
+    return (
+        certificate.get("pubkey_type"),
+        certificate.get("nonce"),
+        certificate.get("public_key").get_fingerprint(),
+        certificate.get("serial"),
+    )
+
+
+def peek(cert_str: str) -> tuple:
+    """Read the routing fields with peek"""
+    fields = _CERT.SSHCertificate.peek(cert_str)
+    return (
+        fields["pubkey_type"],
+        fields["nonce"],
+        fields["public_key"].get_fingerprint(),
+        fields["serial"],
+    )
+
+
+def decoded_bytes(cert_str: str) -> int:
+    """The number of bytes decoded to read the header and serial"""
+    cert_type, cert_data = cert_str.split(" ")[:2]
+    cursor = Base64Cursor(cert_data.encode("utf-8"))
+    _FIELD.PubkeyTypeField.read(cursor)
+    _FIELD.NonceField.read(cursor)
+    getattr(_FIELD, _CERT.CERT_TYPES[cert_type][1]).read(cursor)
+    _FIELD.SerialField.read(cursor)
+    return cursor.decoded
+
+
+def main():
+    iterations = int(sys.argv[1]) if len(sys.argv) > 1 else 5000
+
+    ca = _KEY.RsaPrivateKey.generate(4096)
+    for name, subject in (
+        ("RSA-4096", _KEY.RsaPrivateKey.generate(4096)),
+        ("Ed25519", _KEY.Ed25519PrivateKey.generate()),
+    ):
+        cert_str = _CERT.SSHCertificate.from_bytes(
+            create_certificate(subject, ca)
+        ).to_string()
+
+        for mode, function in (("from_string", full_decode), ("peek", peek)):
+            seconds = min(
+                timeit.repeat(lambda: function(cert_str), number=iterations, repeat=3)
+            )
+            print(f"{name:<10} {mode:<12} {iterations / seconds:>10.0f} certs/s")
+
+        print(
+            f"{name:<10} header and serial need {decoded_bytes(cert_str)} of "
+            + f"{len(cert_str.split(' ')[1]) * 3 // 4} bytes"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,60 @@
+"""
+Benchmark for signing a batch of certificates with an RSA-4096 CA,
+comparing a sign() loop, sign_many with threads and sign_many
+with a ProcessSigner
+
+Run from the repository root:
+    python -m benchmarks.bench_process_signer [certificates] [workers]
+"""
+import os
+import sys
+import tempfile
+import time
+
+import src.sshkey_tools.cert as _CERT
+import src.sshkey_tools.keys as _KEY
+from src.sshkey_tools.signer import ProcessSigner
+
+from .bench_sign_many import create_batch
+
+
+def bench(mode: str, sign, ca: _KEY.PrivateKey, count: int) -> None:
+    """Sign a new batch and print the number of certificates per second"""
+    certificates = create_batch(ca, count)
+    start = time.perf_counter()
+    sign(certificates)
+    seconds = time.perf_counter() - start
+
+    print(f"{mode:<28} {count / seconds:>10.0f} certs/s")
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 500
+    workers = int(sys.argv[2]) if len(sys.argv) > 2 else os.cpu_count() or 1
+
+    ca = _KEY.RsaPrivateKey.generate(4096)
+    bench("sign() loop", lambda certs: [c.sign() for c in certs], ca, count)
+    bench(
+        f"sign_many {workers} threads",
+        lambda certs: _CERT.SSHCertificate.sign_many(certs, max_workers=workers),
+        ca,
+        count,
+    )
+
+    with tempfile.TemporaryDirectory() as folder:
+        ca.to_file(os.path.join(folder, "ca"))
+        with ProcessSigner(os.path.join(folder, "ca"), max_workers=workers) as signer:
+            # Start the workers before measuring
+            signer.sign(b"warmup")
+            bench(
+                f"ProcessSigner {workers} workers",
+                lambda certs: _CERT.SSHCertificate.sign_many(
+                    certs, max_workers=workers * 2, signer=signer
+                ),
+                ca,
+                count,
+            )
+
+
+if __name__ == "__main__":
+    main()
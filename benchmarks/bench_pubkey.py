@@ -0,0 +1,38 @@
+"""
+Benchmark for the public key operations used when encoding certificates
+and looking up keys: wire bytes, fingerprints and hashing
+
+Run from the repository root:
+    python -m benchmarks.bench_pubkey [iterations]
+"""
+
+import sys
+import timeit
+
+import src.sshkey_tools.fields as _FIELD
+import src.sshkey_tools.keys as _KEY
+
+
+def main():
+    iterations = int(sys.argv[1]) if len(sys.argv) > 1 else 20000
+
+    for name, private_key in (
+        ("RSA-4096", _KEY.RsaPrivateKey.generate(4096)),
+        ("ECDSA P-256", _KEY.EcdsaPrivateKey.generate()),
+        ("Ed25519", _KEY.Ed25519PrivateKey.generate()),
+    ):
+        public_key = _KEY.PublicKey.from_string(private_key.public_key.to_string())
+        index = {public_key.raw_bytes(): name}
+
+        for operation, func in (
+            ("raw_bytes", public_key.raw_bytes),
+            ("fingerprint", public_key.get_fingerprint),
+            ("field encode", lambda: _FIELD.CAPublicKeyField(public_key).encoded),
+            ("index lookup", lambda: index[public_key.raw_bytes()]),
+        ):
+            seconds = min(timeit.repeat(func, number=iterations, repeat=3))
+            print(f"{name:<12} {operation:<13} {iterations / seconds:>10.0f} ops/s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,70 @@
+"""
+Benchmark for signing certificates with a RemoteSigner, against
+a stand-in signing service with a fixed latency per call, for
+increasing batch sizes, from threads and from asyncio
+
+Run from the repository root:
+    python -m benchmarks.bench_remote [certificates] [latency ms]
+"""
+import asyncio
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import src.sshkey_tools.aio as _AIO
+import src.sshkey_tools.cert as _CERT
+import src.sshkey_tools.keys as _KEY
+from src.sshkey_tools.remote import RemoteSigner
+
+from .bench_sign_many import create_batch
+
+
+def stand_in_service(ca: _KEY.PrivateKey, latency: float):
+    """A signing service with a fixed latency per call"""
+
+    def sign_batch(data: list) -> list:
+        time.sleep(latency)
+        return [ca.sign(item) for item in data]
+
+    return sign_batch
+
+
+async def sign_async(certificates: list) -> None:
+    """Sign all certificates concurrently with sshkey_tools.aio"""
+    await asyncio.gather(*[_AIO.sign(c) for c in certificates])
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 1000
+    latency = (int(sys.argv[2]) if len(sys.argv) > 2 else 20) / 1000
+
+    ca = _KEY.Ed25519PrivateKey.generate()
+    _AIO.configure(max_concurrency=count)
+
+    for max_batch_size in (1, 8, 64, 256):
+        signer = RemoteSigner(
+            ca.public_key,
+            stand_in_service(ca, latency),
+            max_batch_size=max_batch_size,
+            max_in_flight=4,
+        )
+
+        with signer, ThreadPoolExecutor(max_workers=256) as executor:
+            certificates = create_batch(signer, count)
+            start = time.perf_counter()
+            _CERT.SSHCertificate.sign_many(certificates, executor)
+            threaded = count / (time.perf_counter() - start)
+
+            certificates = create_batch(signer, count)
+            start = time.perf_counter()
+            asyncio.run(sign_async(certificates))
+            coroutines = count / (time.perf_counter() - start)
+
+        print(
+            f"batch size {max_batch_size:<4} threads {threaded:>8.0f} certs/s"
+            + f"   asyncio {coroutines:>8.0f} certs/s"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,56 @@
+"""
+Benchmark for renewing a certificate: changing the serial and validity
+of an existing certificate object, signing and exporting it again,
+for an increasing number of principals
+
+Run from the repository root:
+    python -m benchmarks.bench_renew [iterations]
+"""
+import sys
+import timeit
+from datetime import datetime, timedelta
+
+import src.sshkey_tools.cert as _CERT
+import src.sshkey_tools.keys as _KEY
+
+
+def bench(principals: int, iterations: int) -> None:
+    """Measure and print the number of renewed certificates per second"""
+    ca = _KEY.Ed25519PrivateKey.generate()
+    certificate = _CERT.SSHCertificate.create(
+        subject_pubkey=_KEY.RsaPrivateKey.generate(4096).public_key,
+        ca_privkey=ca,
+        fields=_CERT.CertificateFields(
+            key_id="benchmark",
+            principals=[f"principal-{i}" for i in range(principals)],
+            valid_before=datetime.now() + timedelta(hours=1),
+            extensions=["permit-pty", "permit-agent-forwarding"],
+        ),
+    )
+    certificate.sign()
+    serial = iter(range(1, 2**32))
+
+    def renew():
+        now = datetime.now()
+        certificate.fields.serial = next(serial)
+        certificate.fields.valid_after = now
+        certificate.fields.valid_before = now + timedelta(hours=1)
+        certificate.sign()
+        return certificate.to_string()
+
+    seconds = min(timeit.repeat(renew, number=iterations, repeat=3))
+    print(
+        f"{principals:>5} principals  {len(bytes(certificate)):>7} bytes  "
+        + f"{iterations / seconds:>8.0f} renewals/s"
+    )
+
+
+def main():
+    iterations = int(sys.argv[1]) if len(sys.argv) > 1 else 1000
+
+    for principals in (1, 16, 256, 1000, 4000):
+        bench(principals, max(iterations * 16 // max(principals, 16), 10))
+
+
+if __name__ == "__main__":
+    main()
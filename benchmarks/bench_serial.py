@@ -0,0 +1,62 @@
+"""
+Benchmark for allocating unique serials with a SerialAllocator, for
+increasing block sizes, in one process and from several processes
+sharing a state file, compared with random serials
+
+Run from the repository root:
+    python -m benchmarks.bench_serial [serials] [processes]
+"""
+import os
+import sys
+import time
+from multiprocessing import Pool
+from tempfile import TemporaryDirectory
+
+import src.sshkey_tools.entropy as _ENTROPY
+from src.sshkey_tools.serial import SerialAllocator
+
+
+def allocate(args):
+    """Allocate serials in a worker process"""
+    allocator, count = args
+    return [allocator.next_serial() for _ in range(count)]
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+    processes = int(sys.argv[2]) if len(sys.argv) > 2 else 4
+
+    start = time.perf_counter()
+    for _ in range(count):
+        _ENTROPY.random_serial()
+    print(f"random serials            {count / (time.perf_counter() - start):>10.0f}/s")
+
+    for block_size in (1, 64, 4096):
+        with TemporaryDirectory() as directory:
+            path = os.path.join(directory, "serial")
+            allocator = SerialAllocator(path, node=1, block_size=block_size)
+
+            # Fewer serials with one fsync per serial
+            serials = count if block_size > 1 else min(count, 2000)
+            start = time.perf_counter()
+            for _ in range(serials):
+                allocator.next_serial()
+            single = serials / (time.perf_counter() - start)
+
+            with Pool(processes) as pool:
+                start = time.perf_counter()
+                results = pool.map(
+                    allocate, [(allocator, serials // processes)] * processes
+                )
+                parallel = serials / (time.perf_counter() - start)
+
+            unique = len({serial for result in results for serial in result})
+            print(
+                f"block size {block_size:<5} 1 process {single:>10.0f}/s"
+                + f"   {processes} processes {parallel:>10.0f}/s"
+                + f"   unique {unique == sum(map(len, results))}"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,76 @@
+"""
+Benchmark for signing a batch of certificates with sign_many,
+scaling from 1 to N threads, compared with a sign() loop
+
+Run from the repository root:
+    python -m benchmarks.bench_sign_many [certificates] [max threads]
+"""
+import os
+import sys
+import time
+from datetime import datetime, timedelta
+
+import src.sshkey_tools.cert as _CERT
+import src.sshkey_tools.keys as _KEY
+
+
+def create_batch(ca: _KEY.PrivateKey, count: int) -> list:
+    """Create unsigned certificates for the same subject"""
+    subject = _KEY.Ed25519PrivateKey.generate().public_key
+    valid_before = datetime.now() + timedelta(weeks=52)
+
+    return [
+        _CERT.SSHCertificate.create(
+            subject_pubkey=subject,
+            ca_privkey=ca,
+            fields=_CERT.CertificateFields(
+                serial=i,
+                key_id=f"host{i}",
+                principals=[f"host{i}.example.com"],
+                valid_before=valid_before,
+            ),
+        )
+        for i in range(count)
+    ]
+
+
+def bench(name: str, mode: str, sign, ca: _KEY.PrivateKey, count: int) -> None:
+    """Sign a new batch and print the number of certificates per second"""
+    certificates = create_batch(ca, count)
+    start = time.perf_counter()
+    sign(certificates)
+    seconds = time.perf_counter() - start
+
+    print(f"{name:<10} {mode:<14} {count / seconds:>10.0f} certs/s")
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 500
+    max_threads = int(sys.argv[2]) if len(sys.argv) > 2 else os.cpu_count() or 1
+
+    threads = [1]
+    while threads[-1] * 2 <= max_threads:
+        threads.append(threads[-1] * 2)
+    if threads[-1] != max_threads:
+        threads.append(max_threads)
+
+    for name, ca in (
+        ("RSA-4096", _KEY.RsaPrivateKey.generate(4096)),
+        ("P-521", _KEY.EcdsaPrivateKey.generate(_KEY.EcdsaCurves.P521)),
+        ("Ed25519", _KEY.Ed25519PrivateKey.generate()),
+    ):
+        bench(name, "sign() loop", lambda certs: [c.sign() for c in certs], ca, count)
+        for workers in threads:
+            bench(
+                name,
+                f"{workers} threads",
+                lambda certs, workers=workers: _CERT.SSHCertificate.sign_many(
+                    certs, max_workers=workers
+                ),
+                ca,
+                count,
+            )
+
+
+if __name__ == "__main__":
+    main()
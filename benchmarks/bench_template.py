@@ -0,0 +1,80 @@
+"""
+Benchmark for issuing certificates from a CertificateTemplate, compared
+to creating every certificate from scratch with SSHCertificate.create
+
+Run from the repository root:
+    python -m benchmarks.bench_template [iterations]
+"""
+import sys
+import timeit
+
+import src.sshkey_tools.cert as _CERT
+import src.sshkey_tools.keys as _KEY
+from src.sshkey_tools.template import CertificateTemplate
+
+EXTENSIONS = [
+    "permit-X11-forwarding",
+    "permit-agent-forwarding",
+    "permit-port-forwarding",
+    "permit-pty",
+    "permit-user-rc",
+]
+CRITICAL_OPTIONS = {"source-address": "10.0.0.0/8,192.168.0.0/16"}
+PRINCIPALS = ["user", "developers", "production"]
+
+
+def create(subjects: list, ca: _KEY.PrivateKey) -> None:
+    """Create, sign and export a certificate for each subject from scratch"""
+    for i, subject in enumerate(subjects):
+        certificate = _CERT.SSHCertificate.create(
+            subject_pubkey=subject,
+            ca_privkey=ca,
+            fields=_CERT.CertificateFields(
+                key_id=f"user-{i}",
+                principals=PRINCIPALS,
+                valid_before="8h",
+                critical_options=CRITICAL_OPTIONS,
+                extensions=EXTENSIONS,
+            ),
+        )
+        certificate.sign()
+        certificate.to_string()
+
+
+def issue(subjects: list, template: CertificateTemplate) -> None:
+    """Issue and export a certificate for each subject from the template"""
+    for i, subject in enumerate(subjects):
+        template.issue(subject, f"user-{i}", PRINCIPALS).to_string()
+
+
+def bench(name: str, ca: _KEY.PrivateKey, iterations: int) -> None:
+    """Measure and print the number of issued certificates per second"""
+    subjects = [_KEY.Ed25519PrivateKey.generate().public_key for _ in range(100)]
+    subjects *= iterations // len(subjects)
+    template = CertificateTemplate(
+        _CERT.CertificateFields(
+            valid_before="8h",
+            critical_options=CRITICAL_OPTIONS,
+            extensions=EXTENSIONS,
+        ),
+        ca,
+    )
+
+    for label, function in (
+        ("create", lambda: create(subjects, ca)),
+        ("template", lambda: issue(subjects, template)),
+    ):
+        seconds = min(timeit.repeat(function, number=1, repeat=3))
+        print(f"{name:<12} {label:<10} {len(subjects) / seconds:>8.0f} certs/s")
+
+
+def main():
+    iterations = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+
+    bench("Ed25519 CA", _KEY.Ed25519PrivateKey.generate(), iterations)
+    bench("ECDSA CA", _KEY.EcdsaPrivateKey.generate(_KEY.EcdsaCurves.P256), iterations)
+    bench("RSA-2048 CA", _KEY.RsaPrivateKey.generate(2048), iterations // 4)
+
+
+if __name__ == "__main__":
+    main()
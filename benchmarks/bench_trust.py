@@ -0,0 +1,57 @@
+"""
+Benchmark for verifying certificates from several CAs, comparing
+trying each trusted CA key in turn with a TrustStore lookup
+
+Run from the repository root:
+    python -m benchmarks.bench_trust [certificates] [CAs]
+"""
+import sys
+import time
+
+import src.sshkey_tools.keys as _KEY
+from src.sshkey_tools.trust import TrustStore
+
+from .bench_sign_many import create_batch
+
+
+def try_each_key(certificates: list, trusted_keys: list) -> int:
+    """Verify each certificate with the trusted keys until one matches"""
+    return sum(
+        any(certificate.verify(key) for key in trusted_keys)
+        for certificate in certificates
+    )
+
+
+def trust_store(certificates: list, store: TrustStore) -> int:
+    """Verify each certificate with the trusted key of its CA"""
+    return sum(store.verify(certificate) for certificate in certificates)
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 3000
+    cas = int(sys.argv[2]) if len(sys.argv) > 2 else 30
+
+    keys = [_KEY.Ed25519PrivateKey.generate() for _ in range(cas)]
+    certificates = []
+    for ca in keys:
+        for certificate in create_batch(ca, count // cas):
+            certificate.sign()
+            certificates.append(certificate)
+
+    trusted_keys = [ca.public_key for ca in keys]
+    store = TrustStore()
+    for public_key in trusted_keys:
+        store.add(public_key)
+
+    for mode, verify in (
+        ("try each CA key", lambda: try_each_key(certificates, trusted_keys)),
+        ("TrustStore", lambda: trust_store(certificates, store)),
+    ):
+        start = time.perf_counter()
+        valid = verify()
+        seconds = time.perf_counter() - start
+        print(f"{mode:<16} {valid / seconds:>8.0f} certs/s   valid {valid}")
+
+
+if __name__ == "__main__":
+    main()
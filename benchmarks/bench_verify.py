@@ -0,0 +1,43 @@
+"""
+Benchmark for verifying the same certificates repeatedly,
+with and without a VerificationCache
+
+Run from the repository root:
+    python -m benchmarks.bench_verify [iterations]
+"""
+
+import sys
+import timeit
+
+import src.sshkey_tools.cert as _CERT
+import src.sshkey_tools.keys as _KEY
+from src.sshkey_tools.cache import VerificationCache
+
+from .bench_decode import create_certificate
+
+
+def main():
+    iterations = int(sys.argv[1]) if len(sys.argv) > 1 else 5000
+
+    subject = _KEY.Ed25519PrivateKey.generate()
+    for name, ca in (
+        ("RSA-4096", _KEY.RsaPrivateKey.generate(4096)),
+        ("ECDSA P-256", _KEY.EcdsaPrivateKey.generate()),
+        ("Ed25519", _KEY.Ed25519PrivateKey.generate()),
+    ):
+        certificate = _CERT.SSHCertificate.from_bytes(create_certificate(subject, ca))
+        cache = VerificationCache()
+
+        for mode, kwargs in (("no cache", {}), ("cache", {"cache": cache})):
+            seconds = min(
+                timeit.repeat(
+                    lambda: certificate.verify(ca.public_key, True, **kwargs),
+                    number=iterations,
+                    repeat=3,
+                )
+            )
+            print(f"{name:<12} {mode:<9} {iterations / seconds:>10.0f} verifications/s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,79 @@
+"""
+Benchmark for auditing a bundle of certificates signed by several CAs,
+comparing a loop over from_string and verify with verify_many over
+parse_many, streaming the bundle from a file
+
+Run from the repository root:
+    python -m benchmarks.bench_verify_many [certificates] [CAs] [threads]
+"""
+import os
+import sys
+import time
+from tempfile import TemporaryDirectory
+
+import src.sshkey_tools.cert as _CERT
+import src.sshkey_tools.keys as _KEY
+
+from .bench_sign_many import create_batch
+
+
+def verify_loop(path: str, trusted_keys: list) -> int:
+    """Load and verify each certificate, finding the CA by its public key"""
+    trusted = {key.raw_bytes(): key for key in trusted_keys}
+    valid = 0
+    with open(path, "r", encoding="utf-8") as file:
+        for line in file:
+            certificate = _CERT.SSHCertificate.from_string(line)
+            public_key = trusted.get(certificate.get("ca_pubkey").raw_bytes())
+            valid += public_key is not None and certificate.verify(public_key)
+
+    return valid
+
+
+def verify_many(path: str, trusted_keys: list, threads: int, lazy: bool) -> int:
+    """Verify the certificates streamed from the file with verify_many"""
+    with open(path, "rb") as file:
+        results = _CERT.SSHCertificate.verify_many(
+            _CERT.SSHCertificate.parse_many(file, lazy=lazy, collect_errors=True),
+            trusted_keys,
+            max_workers=threads,
+        )
+
+    return results.count(_CERT.VerifyResult.VALID)
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 30000
+    cas = int(sys.argv[2]) if len(sys.argv) > 2 else 30
+    threads = int(sys.argv[3]) if len(sys.argv) > 3 else os.cpu_count() or 1
+
+    keys = [
+        _KEY.Ed25519PrivateKey.generate() if i % 2 else _KEY.EcdsaPrivateKey.generate()
+        for i in range(cas)
+    ]
+
+    with TemporaryDirectory() as directory:
+        path = os.path.join(directory, "bundle")
+        with open(path, "w", encoding="utf-8") as file:
+            for ca in keys:
+                for certificate in create_batch(ca, count // cas):
+                    certificate.sign()
+                    file.write(certificate.to_string() + "\n")
+
+        trusted_keys = [ca.public_key for ca in keys]
+        for mode, audit in (
+            ("from_string + verify", lambda: verify_loop(path, trusted_keys)),
+            ("verify_many", lambda: verify_many(path, trusted_keys, threads, False)),
+            (
+                "verify_many lazy",
+                lambda: verify_many(path, trusted_keys, threads, True),
+            ),
+        ):
+            start = time.perf_counter()
+            valid = audit()
+            seconds = time.perf_counter() - start
+            print(f"{mode:<21} {valid / seconds:>8.0f} certs/s   valid {valid}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,65 @@
+"""
+Benchmark for writing many certificates to disk,
+comparing a to_file loop with CertificateWriter
+
+Run from the repository root:
+    python -m benchmarks.bench_writer [certificates]
+"""
+
+import os
+import sys
+import tempfile
+import time
+
+import src.sshkey_tools.cert as _CERT
+import src.sshkey_tools.keys as _KEY
+from src.sshkey_tools.writer import CertificateWriter, FsyncPolicy
+
+from .bench_decode import create_certificate
+
+
+def bench(name: str, write, count: int) -> None:
+    """Run the write function and print the number of certificates per second"""
+    with tempfile.TemporaryDirectory(dir=".") as folder:
+        paths = [os.path.join(folder, f"host{i}-cert.pub") for i in range(count)]
+        start = time.perf_counter()
+        write(folder, paths)
+        seconds = time.perf_counter() - start
+
+    print(f"{name:<28} {count / seconds:>10.0f} certificates/s")
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 5000
+
+    ca = _KEY.Ed25519PrivateKey.generate()
+    certificate = _CERT.SSHCertificate.from_bytes(
+        create_certificate(_KEY.Ed25519PrivateKey.generate(), ca)
+    )
+    certificates = [certificate] * count
+
+    def to_file(_, paths):
+        for path, cert in zip(paths, certificates):
+            cert.to_file(path)
+
+    bench("to_file", to_file, count)
+    for policy in FsyncPolicy:
+        writer = CertificateWriter(fsync=policy)
+        bench(
+            f"write_files fsync={policy.value}",
+            lambda _, paths, writer=writer: writer.write_files(
+                zip(paths, certificates)
+            ),
+            count,
+        )
+        bench(
+            f"write_bundle fsync={policy.value}",
+            lambda folder, _, writer=writer: writer.write_bundle(
+                os.path.join(folder, "bundle"), certificates
+            ),
+            count,
+        )
+
+
+if __name__ == "__main__":
+    main()
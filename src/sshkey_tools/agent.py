@@ -0,0 +1,538 @@
+"""
+Signing with CA keys held by an ssh-agent, so the private keys never
+enter the issuing process.
+
+The client keeps a pool of persistent connections to the agent socket.
+Requests are sent as soon as they are made, also while earlier requests
+on the same connection are still pending. The agent answers the requests
+on a connection in order, and a reader thread per connection hands each
+response to the request that is waiting for it.
+"""
+import os
+import socket
+import threading
+from collections import deque
+from concurrent.futures import Future
+from typing import List, Tuple, Union
+
+from cryptography.hazmat.primitives.asymmetric.utils import encode_dss_signature
+
+from . import exceptions as _EX
+from .fields import MpIntegerField
+from .keys import (
+    EcdsaPublicKey,
+    FingerprintHashes,
+    PrivateKey,
+    PublicKey,
+    RsaAlgs,
+    RsaPublicKey,
+)
+from .wire import UINT32, DecodeCursor, EncodeBuffer
+
+SSH_AGENT_FAILURE = 5
+SSH_AGENTC_REQUEST_IDENTITIES = 11
+SSH_AGENT_IDENTITIES_ANSWER = 12
+SSH_AGENTC_SIGN_REQUEST = 13
+SSH_AGENT_SIGN_RESPONSE = 14
+
+SSH_AGENT_RSA_SHA2_256 = 2
+SSH_AGENT_RSA_SHA2_512 = 4
+
+RSA_SIGN_FLAGS = {
+    RsaAlgs.SHA1: 0,
+    RsaAlgs.SHA256: SSH_AGENT_RSA_SHA2_256,
+    RsaAlgs.SHA512: SSH_AGENT_RSA_SHA2_512,
+}
+
+FINGERPRINT_METHODS = {
+    "MD5": FingerprintHashes.MD5,
+    "SHA256": FingerprintHashes.SHA256,
+    "SHA512": FingerprintHashes.SHA512,
+}
+
+# The maximum message length accepted by OpenSSH
+MAX_MESSAGE_LENGTH = 256 * 1024
+
+
+class AgentConnection:
+    """
+    A persistent connection to an ssh-agent, which can be shared by
+    several threads. Requests are pipelined: they are written to the
+    socket without waiting for the responses to the earlier requests.
+
+    Args:
+        path (str): The path of the agent socket
+    """
+
+    def __init__(self, path: str):
+        self.socket = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        try:
+            self.socket.connect(path)
+        except OSError:
+            self.socket.close()
+            raise
+
+        self.closed = False
+        self._lock = threading.Lock()
+        self._pending = deque()
+
+        self._reader = threading.Thread(target=self._read_responses, daemon=True)
+        self._reader.start()
+
+    @property
+    def pending(self) -> int:
+        """
+        The number of requests waiting for a response
+        """
+        return len(self._pending)
+
+    def submit(self, message: bytes) -> Future:
+        """
+        Sends a message to the agent
+
+        Args:
+            message (bytes): The message, including its length prefix
+
+        Raises:
+            ConnectionError: The connection is closed
+
+        Returns:
+            Future: Future for the response, without its length prefix
+        """
+        future = Future()
+        future.set_running_or_notify_cancel()
+
+        with self._lock:
+            if self.closed:
+                raise ConnectionError("The connection to the agent is closed")
+
+            self._pending.append(future)
+            try:
+                self.socket.sendall(message)
+            except OSError as ex:
+                self._fail(ex)
+                raise
+
+        return future
+
+    def close(self) -> None:
+        """
+        Closes the connection, failing the requests that are still pending
+        """
+        with self._lock:
+            self._fail(ConnectionError("The connection to the agent was closed"))
+
+        if self._reader is not threading.current_thread():
+            self._reader.join()
+
+    def _read_responses(self) -> None:
+        """
+        Reads the responses and completes the pending requests in order,
+        until the connection is closed
+        """
+        try:
+            while True:
+                length = UINT32.unpack(self._receive(4))[0]
+                if length > MAX_MESSAGE_LENGTH:
+                    raise _EX.InvalidDataException("The agent response is too long")
+
+                response = self._receive(length)
+                with self._lock:
+                    if not self._pending:
+                        raise _EX.InvalidDataException("Unexpected agent response")
+                    future = self._pending.popleft()
+
+                future.set_result(response)
+        except (OSError, ValueError) as ex:
+            with self._lock:
+                self._fail(ex)
+
+    def _receive(self, length: int) -> bytes:
+        """
+        Receives an exact number of bytes
+
+        Args:
+            length (int): The number of bytes
+
+        Raises:
+            ConnectionError: The agent closed the connection
+
+        Returns:
+            bytes: The received bytes
+        """
+        data = bytearray(length)
+        view, received = memoryview(data), 0
+        while received < length:
+            count = self.socket.recv_into(view[received:])
+            if count == 0:
+                raise ConnectionError("The agent closed the connection")
+            received += count
+
+        return bytes(data)
+
+    def _fail(self, exception: Exception) -> None:
+        """
+        Closes the socket and fails the pending requests.
+        Must be called with the lock held.
+
+        Args:
+            exception (Exception): The exception for the pending requests
+        """
+        if not self.closed:
+            self.closed = True
+            try:
+                self.socket.shutdown(socket.SHUT_RDWR)
+            except OSError:
+                pass
+            self.socket.close()
+
+        while self._pending:
+            self._pending.popleft().set_exception(exception)
+
+
+class AgentClient:
+    """
+    Client for an ssh-agent, with a pool of persistent connections.
+    A new connection is opened when all open connections have pending
+    requests, up to max_connections. After that, the requests are
+    pipelined on the connection with the fewest pending requests.
+
+    Args:
+        path (str, optional): The path of the agent socket.
+                              Defaults to the SSH_AUTH_SOCK environment variable.
+        max_connections (int, optional): The maximum number of connections.
+                                         Defaults to 4.
+
+    Raises:
+        _EX.SignatureNotPossibleException: No agent socket is given or set
+    """
+
+    def __init__(self, path: str = None, max_connections: int = 4):
+        self.path = path or os.environ.get("SSH_AUTH_SOCK")
+        if not self.path:
+            raise _EX.SignatureNotPossibleException(
+                "No agent socket, pass the path or set SSH_AUTH_SOCK"
+            )
+
+        self.max_connections = max(1, max_connections)
+        self.connections = []
+        self._lock = threading.Lock()
+
+    def __enter__(self) -> "AgentClient":
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+    def connection(self) -> AgentConnection:
+        """
+        Gets a connection for the next request
+
+        Returns:
+            AgentConnection: An open connection
+        """
+        with self._lock:
+            self.connections = [c for c in self.connections if not c.closed]
+
+            connection = min(self.connections, key=lambda c: c.pending, default=None)
+            if connection is None or (
+                connection.pending and len(self.connections) < self.max_connections
+            ):
+                connection = AgentConnection(self.path)
+                self.connections.append(connection)
+
+            return connection
+
+    def submit(self, message: bytes) -> Future:
+        """
+        Sends a message to the agent without waiting for the response
+
+        Args:
+            message (bytes): The message, including its length prefix
+
+        Returns:
+            Future: Future for the response, without its length prefix
+        """
+        return self.connection().submit(message)
+
+    def request(self, message: bytes) -> bytes:
+        """
+        Sends a message to the agent and waits for the response
+
+        Args:
+            message (bytes): The message, including its length prefix
+
+        Returns:
+            bytes: The response, without its length prefix
+        """
+        return self.submit(message).result()
+
+    def request_identities(self) -> List[Tuple[PublicKey, str]]:
+        """
+        Lists the keys held by the agent. Keys of types that are
+        not supported by this library are left out.
+
+        Returns:
+            List[Tuple[PublicKey, str]]: The public keys and their comments
+        """
+        message = EncodeBuffer()
+        start = message.begin_string()
+        message.write_uint8(SSH_AGENTC_REQUEST_IDENTITIES)
+        message.end_string(start)
+
+        cursor = self.check_response(
+            self.request(message.getvalue()), SSH_AGENT_IDENTITIES_ANSWER
+        )
+
+        identities = []
+        for _ in range(cursor.read_uint32()):
+            key_blob = cursor.read_string()
+            comment = str(cursor.read_string(), "utf-8", "replace")
+            try:
+                identities.append((PublicKey.from_bytes(key_blob), comment))
+            except _EX.InvalidKeyException:
+                continue
+
+        return identities
+
+    def submit_sign(self, key_blob: bytes, data: bytes, flags: int = 0) -> Future:
+        """
+        Sends a signing request to the agent without waiting for the response
+
+        Args:
+            key_blob (bytes): The public key in the SSH wire format
+            data (bytes): The data to sign
+            flags (int, optional): The signing flags, e.g. SSH_AGENT_RSA_SHA2_512.
+                                   Defaults to 0.
+
+        Returns:
+            Future: Future for the response, see check_response
+        """
+        message = EncodeBuffer()
+        start = message.begin_string()
+        message.write_uint8(SSH_AGENTC_SIGN_REQUEST)
+        message.write_string(key_blob)
+        message.write_string(data)
+        message.write_uint32(flags)
+        message.end_string(start)
+
+        return self.submit(message.getvalue())
+
+    def sign(self, key_blob: bytes, data: bytes, flags: int = 0) -> Tuple[str, bytes]:
+        """
+        Signs data with a key held by the agent
+
+        Args:
+            key_blob (bytes): The public key in the SSH wire format
+            data (bytes): The data to sign
+            flags (int, optional): The signing flags, e.g. SSH_AGENT_RSA_SHA2_512.
+                                   Defaults to 0.
+
+        Raises:
+            _EX.SignatureNotPossibleException: The agent refused to sign
+
+        Returns:
+            Tuple[str, bytes]: The signature type and the signature
+                               in the SSH wire format
+        """
+        cursor = self.check_response(
+            self.submit_sign(key_blob, data, flags).result(), SSH_AGENT_SIGN_RESPONSE
+        )
+        signature = cursor.read_cursor()
+
+        return str(signature.read_string(), "utf-8"), bytes(signature.read_string())
+
+    @staticmethod
+    def check_response(response: bytes, expected: int) -> DecodeCursor:
+        """
+        Checks the type of an agent response
+
+        Args:
+            response (bytes): The response
+            expected (int): The expected message type
+
+        Raises:
+            _EX.SignatureNotPossibleException: The agent refused the request
+            _EX.InvalidDataException: The response has an unexpected type
+
+        Returns:
+            DecodeCursor: Cursor positioned after the message type
+        """
+        cursor = DecodeCursor(response)
+        message_type = cursor.read_uint8()
+
+        if message_type == SSH_AGENT_FAILURE:
+            raise _EX.SignatureNotPossibleException("The agent refused the request")
+
+        if message_type != expected:
+            raise _EX.InvalidDataException(
+                f"Unexpected agent response type {message_type}"
+            )
+
+        return cursor
+
+    def close(self) -> None:
+        """
+        Closes the connections to the agent
+        """
+        with self._lock:
+            connections, self.connections = self.connections, []
+
+        for connection in connections:
+            connection.close()
+
+
+class AgentPrivateKey(PrivateKey):
+    """
+    A private key held by an ssh-agent. Can be used as the CA private key
+    of a certificate, like the other PrivateKey classes, but the key
+    cannot be exported.
+
+    Args:
+        public_key (PublicKey): The public key of the agent key
+        client (AgentClient): The client for the agent holding the key
+        comment (str, optional): The comment of the key in the agent.
+                                 Defaults to "".
+        owns_client (bool, optional): Close the client when the key is closed.
+                                      Defaults to False.
+    """
+
+    def __init__(
+        self,
+        public_key: PublicKey,
+        client: AgentClient,
+        comment: str = "",
+        owns_client: bool = False,
+    ):
+        super().__init__(None, public_key)
+        self.client = client
+        self.comment = comment
+        self.owns_client = owns_client
+
+    def __enter__(self) -> "AgentPrivateKey":
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+    @classmethod
+    def from_agent(
+        cls,
+        fingerprint: str = None,
+        public_key: PublicKey = None,
+        client: AgentClient = None,
+        path: str = None,
+    ) -> "AgentPrivateKey":
+        """
+        Finds a key in the agent by its fingerprint or public key
+
+        Args:
+            fingerprint (str, optional): The fingerprint of the key,
+                                         e.g. SHA256:... Defaults to None.
+            public_key (PublicKey, optional): The public key. Defaults to None.
+            client (AgentClient, optional): The client for the agent. Defaults
+                                            to a new client, owned by the key
+                                            and closed with it.
+            path (str, optional): The path of the agent socket, for a new client.
+                                  Defaults to the SSH_AUTH_SOCK environment variable.
+
+        Raises:
+            _EX.InvalidKeyException: The key is not held by the agent
+
+        Returns:
+            AgentPrivateKey: The agent key
+        """
+        if (fingerprint is None) == (public_key is None):
+            raise _EX.InvalidKeyException(
+                "Provide either the fingerprint or the public key"
+            )
+
+        if fingerprint is not None:
+            hash_method = FINGERPRINT_METHODS.get(fingerprint.partition(":")[0])
+            if hash_method is None:
+                raise _EX.InvalidKeyException(
+                    "Unsupported fingerprint, expected e.g. SHA256:..."
+                )
+
+        owns_client = client is None
+        client = client or AgentClient(path)
+        try:
+            for key, comment in client.request_identities():
+                if (
+                    key == public_key
+                    if fingerprint is None
+                    else key.get_fingerprint(hash_method) == fingerprint
+                ):
+                    return cls(key, client, comment, owns_client)
+        except BaseException:
+            if owns_client:
+                client.close()
+            raise
+
+        if owns_client:
+            client.close()
+
+        raise _EX.InvalidKeyException("The key was not found in the agent")
+
+    def close(self) -> None:
+        """
+        Closes the client, if it was created for the key by from_agent
+        """
+        if self.owns_client:
+            self.client.close()
+
+    def sign(self, data: bytes, hash_alg: RsaAlgs = RsaAlgs.SHA512) -> bytes:
+        """
+        Signs data with the key in the agent
+
+        Args:
+            data (bytes): The data to sign
+            hash_alg (RsaAlgs, optional): The hash algorithm for RSA keys.
+                                          Defaults to RsaAlgs.SHA512.
+
+        Raises:
+            _EX.SignatureNotPossibleException: The agent did not sign as requested
+
+        Returns:
+            bytes: The signature, in the same format as the other
+                   PrivateKey classes return it
+        """
+        key_blob = self.public_key.raw_bytes()
+        if isinstance(self.public_key, RsaPublicKey):
+            flags, expected = RSA_SIGN_FLAGS[hash_alg], hash_alg.value[0]
+        else:
+            flags, expected = 0, str(DecodeCursor(key_blob).read_string(), "utf-8")
+
+        signature_type, signature = self.client.sign(key_blob, data, flags)
+        if signature_type != expected:
+            raise _EX.SignatureNotPossibleException(
+                f"The agent signed with {signature_type} instead of {expected}"
+            )
+
+        if isinstance(self.public_key, EcdsaPublicKey):
+            cursor = DecodeCursor(signature)
+            return encode_dss_signature(
+                MpIntegerField.read(cursor), MpIntegerField.read(cursor)
+            )
+
+        return signature
+
+    def sign_digest(self, digest: bytes, hash_alg: RsaAlgs = RsaAlgs.SHA512) -> bytes:
+        """
+        Not supported, the agent hashes the data itself
+
+        Raises:
+            _EX.SignatureNotPossibleException: Always
+        """
+        raise _EX.SignatureNotPossibleException(
+            "The agent cannot sign a digest, sign the data instead"
+        )
+
+    def to_bytes(self, password: Union[str, bytes] = None) -> bytes:
+        """
+        Not supported, the private key cannot be exported from the agent
+
+        Raises:
+            _EX.InvalidKeyException: Always
+        """
+        raise _EX.InvalidKeyException("The private key is held by the agent")
@@ -0,0 +1,271 @@
+"""
+Asynchronous versions of the blocking operations, for use with asyncio.
+
+Signing, verifying, loading keys and certificates and generating keys
+run in an executor, so they do not block the event loop. The number of
+operations running at the same time is bounded by a semaphore.
+
+The module functions use a shared AsyncRunner, which can be replaced
+with configure().
+"""
+import asyncio
+from concurrent.futures import Executor
+from functools import partial
+from typing import Callable, Union
+from weakref import WeakKeyDictionary
+
+from . import fields as _FIELD
+from .cache import CertificateCache, VerificationCache
+from .cert import SSHCertificate
+from .keys import Ed25519PrivateKey, PrivateKey, PublicKey
+
+
+class AsyncRunner:
+    """
+    Runs blocking operations in an executor, with at most
+    max_concurrency operations running at the same time
+
+    Cancelling an operation that is waiting for the semaphore or the
+    executor stops it from running. A signature that is still being
+    created when the operation is cancelled is discarded, so the
+    certificate is left unchanged.
+
+    Args:
+        executor (Executor, optional): The executor to run the operations in.
+                                       Defaults to the default executor of the loop.
+        max_concurrency (int, optional): The maximum number of operations running
+                                         at the same time. Defaults to 32.
+    """
+
+    def __init__(self, executor: Executor = None, max_concurrency: int = 32):
+        self.executor = executor
+        self.max_concurrency = max_concurrency
+
+        # asyncio semaphores belong to a single event loop
+        self._semaphores = WeakKeyDictionary()
+
+    def semaphore(self) -> asyncio.Semaphore:
+        """
+        Gets the semaphore for the running event loop
+
+        Returns:
+            asyncio.Semaphore: The semaphore bounding the concurrent operations
+        """
+        loop = asyncio.get_running_loop()
+        semaphore = self._semaphores.get(loop)
+        if semaphore is None:
+            semaphore = self._semaphores[loop] = asyncio.Semaphore(self.max_concurrency)
+
+        return semaphore
+
+    async def run(self, func: Callable, *args, **kwargs):
+        """
+        Runs a blocking function in the executor
+
+        Args:
+            func (Callable): The function to run
+            *args: Positional arguments for the function
+            **kwargs: Keyword arguments for the function
+
+        Returns:
+            The return value of the function
+        """
+        async with self.semaphore():
+            return await asyncio.get_running_loop().run_in_executor(
+                self.executor, partial(func, *args, **kwargs)
+            )
+
+    async def sign(self, certificate: SSHCertificate, **kwargs) -> bool:
+        """
+        Signs a certificate. The certificate is checked and encoded in the
+        event loop, only the signing itself runs in the executor. Signers
+        with a submit method, e.g. a sshkey_tools.remote.RemoteSigner or a
+        sshkey_tools.signer.ProcessSigner, are awaited without the executor.
+
+        Args:
+            certificate (SSHCertificate): The certificate to sign
+            **kwargs: Arguments to pass to the signature signing method
+                      ex. hash_alg for RSA signatures
+
+        Raises:
+            _EX.SignatureNotPossibleException: The certificate cannot be signed
+
+        Returns:
+            bool: Whether successful
+        """
+        certificate.can_sign()
+        field = certificate.footer.signature
+        signer = field.get_signer(kwargs.get("signer"))
+
+        if hasattr(signer, "submit") and kwargs.get("digest") is None:
+            # Signers with their own queue, e.g. a RemoteSigner, are awaited
+            # directly, so every waiting signature can join the next batch
+            args = []
+            if "hash_alg" in kwargs and isinstance(field, _FIELD.RsaSignatureField):
+                args = [kwargs["hash_alg"]]
+
+            async with self.semaphore():
+                signature = await asyncio.wrap_future(
+                    signer.submit(certificate.get_signable(), *args)
+                )
+        else:
+            signature = await self.run(
+                field.create_signature, certificate.get_signable(), **kwargs
+            )
+        certificate.set_signature(signature, **kwargs)
+
+        return True
+
+    async def verify(
+        self,
+        certificate: SSHCertificate,
+        public_key: PublicKey = None,
+        raise_on_error: bool = False,
+        cache: VerificationCache = None,
+    ) -> bool:
+        """
+        Verifies the signature on a certificate, see SSHCertificate.verify
+
+        Args:
+            certificate (SSHCertificate): The certificate to verify
+            public_key (PublicKey, optional): The public key to use for verification
+            raise_on_error (bool, default False): Raise an exception if the
+                                                  certificate is invalid
+            cache (VerificationCache, optional): Cache of successful verifications.
+                                                 Defaults to None.
+
+        Raises:
+            _EX.InvalidSignatureException: The signature is invalid
+
+        Returns:
+            bool: Whether the signature is valid
+        """
+        return await self.run(
+            certificate.verify, public_key, raise_on_error, cache=cache
+        )
+
+    async def load_private_key(
+        self, path: str, password: Union[str, bytes] = None
+    ) -> PrivateKey:
+        """
+        Loads an SSH private key from a file. The key derivation for
+        encrypted keys runs in the executor.
+
+        Args:
+            path (str): The path to the file
+            password (Union[str, bytes], optional): The encryption password.
+                                                    Defaults to None.
+
+        Returns:
+            PrivateKey: Any of the PrivateKey child classes
+        """
+        return await self.run(PrivateKey.from_file, path, password)
+
+    async def load_certificate(
+        self,
+        path: str,
+        encoding: str = "utf-8",
+        lazy: bool = False,
+        cache: CertificateCache = None,
+    ) -> SSHCertificate:
+        """
+        Loads an SSH certificate from a file
+
+        Args:
+            path (str): The path to the certificate file
+            encoding (str, optional): The encoding of the file. Defaults to 'utf-8'.
+            lazy (bool, optional): Decode the field values on first access.
+                                   Defaults to False.
+            cache (CertificateCache, optional): Cache of parsed certificates.
+                                                Defaults to None.
+
+        Returns:
+            SSHCertificate: SSHCertificate child class
+        """
+        return await self.run(
+            SSHCertificate.from_file, path, encoding, lazy=lazy, cache=cache
+        )
+
+    async def generate(
+        self, key_class: type = Ed25519PrivateKey, **kwargs
+    ) -> PrivateKey:
+        """
+        Generates a new private key
+
+        Args:
+            key_class (type, optional): The PrivateKey child class.
+                                        Defaults to Ed25519PrivateKey.
+            **kwargs: Arguments for the generate method, ex. key_size for RSA keys
+
+        Returns:
+            PrivateKey: The generated private key
+        """
+        return await self.run(key_class.generate, **kwargs)
+
+
+_RUNNER = AsyncRunner()
+
+
+def configure(executor: Executor = None, max_concurrency: int = 32) -> AsyncRunner:
+    """
+    Replaces the runner used by the module functions
+
+    Args:
+        executor (Executor, optional): The executor to run the operations in.
+                                       Defaults to the default executor of the loop.
+        max_concurrency (int, optional): The maximum number of operations running
+                                         at the same time. Defaults to 32.
+
+    Returns:
+        AsyncRunner: The new runner
+    """
+    # pylint: disable=global-statement
+    global _RUNNER
+    _RUNNER = AsyncRunner(executor, max_concurrency)
+
+    return _RUNNER
+
+
+async def sign(certificate: SSHCertificate, **kwargs) -> bool:
+    """
+    Signs a certificate, see AsyncRunner.sign
+    """
+    return await _RUNNER.sign(certificate, **kwargs)
+
+
+async def verify(
+    certificate: SSHCertificate,
+    public_key: PublicKey = None,
+    raise_on_error: bool = False,
+    cache: VerificationCache = None,
+) -> bool:
+    """
+    Verifies the signature on a certificate, see AsyncRunner.verify
+    """
+    return await _RUNNER.verify(certificate, public_key, raise_on_error, cache)
+
+
+async def load_private_key(path: str, password: Union[str, bytes] = None) -> PrivateKey:
+    """
+    Loads an SSH private key from a file, see AsyncRunner.load_private_key
+    """
+    return await _RUNNER.load_private_key(path, password)
+
+
+async def load_certificate(
+    path: str,
+    encoding: str = "utf-8",
+    lazy: bool = False,
+    cache: CertificateCache = None,
+) -> SSHCertificate:
+    """
+    Loads an SSH certificate from a file, see AsyncRunner.load_certificate
+    """
+    return await _RUNNER.load_certificate(path, encoding, lazy, cache)
+
+
+async def generate(key_class: type = Ed25519PrivateKey, **kwargs) -> PrivateKey:
+    """
+    Generates a new private key, see AsyncRunner.generate
+    """
+    return await _RUNNER.generate(key_class, **kwargs)
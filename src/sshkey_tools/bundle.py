@@ -0,0 +1,318 @@
+"""
+Readers for large files containing one certificate or public key per line,
+such as certificate bundles or authorized_keys-style public key lists.
+
+The files are memory-mapped and parsed one line at a time, so resident
+memory does not grow with the size of the file.
+"""
+from array import array
+from base64 import b64decode
+import mmap as _MMAP
+from typing import Iterator, Tuple
+
+from . import exceptions as _EX
+from .cert import SSHCertificate
+from .keys import PublicKey
+from .wire import DecodeCursor
+
+WHITESPACE = b" \t\r\n"
+
+# Pages of the mapping are released in chunks of this size
+# when iterating, to keep the resident memory bounded
+RELEASE_CHUNK = 16 * 2**20
+
+
+class BundleReader:
+    """
+    Base class for reading entries from a memory-mapped bundle file,
+    one entry per line in the format [type] [base64-encoded-data] [optional-comment].
+    Blank lines and lines starting with # are skipped.
+
+    Use one of the child classes, CertificateBundleReader or
+    PublicKeyBundleReader, to parse the entries.
+    """
+
+    def __init__(self, path: str):
+        if self.__class__.__name__ == "BundleReader":
+            raise _EX.InvalidClassCallException(
+                "You cannot instantiate BundleReader directly. Use \n"
+                + "CertificateBundleReader or PublicKeyBundleReader"
+            )
+
+        self.path = path
+        self._index = None
+        self._mmap = None
+
+        with open(path, "rb") as file:
+            # Empty files cannot be memory-mapped
+            if file.seek(0, 2) > 0:
+                self._mmap = _MMAP.mmap(file.fileno(), 0, access=_MMAP.ACCESS_READ)
+                self.advise("MADV_SEQUENTIAL")
+
+        self._view = memoryview(self._mmap if self._mmap is not None else b"")
+
+    def __enter__(self) -> "BundleReader":
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+    def __iter__(self) -> Iterator:
+        released = 0
+        for start, end in self.spans():
+            yield self.parse_entry(*self.split(start, end))
+
+            if start - released >= RELEASE_CHUNK:
+                boundary = start - start % _MMAP.PAGESIZE
+                self.advise("MADV_DONTNEED", released, boundary - released)
+                released = boundary
+
+    def __len__(self) -> int:
+        return len(self.index)
+
+    def __getitem__(self, item: int):
+        start = self.index[item]
+        return self.parse_entry(*self.split(start, self._line_end(start)))
+
+    @property
+    def closed(self) -> bool:
+        """
+        Whether the reader has been closed
+        """
+        return self._view is None
+
+    @property
+    def index(self) -> array:
+        """
+        The offsets of the start of each entry in the file,
+        built on first access
+
+        Returns:
+            array: Array of entry offsets
+        """
+        if self._index is None:
+            self._index = array("Q", (start for start, _ in self.spans()))
+
+        return self._index
+
+    def advise(self, option: str, start: int = 0, length: int = None) -> None:
+        """
+        Gives the kernel a hint on how the mapping is used,
+        if supported by the platform
+
+        Args:
+            option (str): The name of the madvise option, e.g. MADV_SEQUENTIAL
+            start (int, optional): The page-aligned start offset. Defaults to 0.
+            length (int, optional): The length of the range. Defaults to the full mapping.
+        """
+        if self._mmap is not None and hasattr(_MMAP, option):
+            length = len(self._mmap) - start if length is None else length
+            self._mmap.madvise(getattr(_MMAP, option), start, length)
+
+    def close(self) -> None:
+        """
+        Releases the memory mapping. Entries already returned
+        by the reader remain usable.
+        """
+        if self._view is not None:
+            self._view.release()
+            self._view = None
+
+        if self._mmap is not None:
+            self._mmap.close()
+            self._mmap = None
+
+    def spans(self) -> Iterator[Tuple[int, int]]:
+        """
+        Finds the entries in the file
+
+        Raises:
+            _EX.InvalidDataException: The reader has been closed
+
+        Yields:
+            Tuple[int, int]: The start and end offset of each entry
+        """
+        if self._view is None:
+            raise _EX.InvalidDataException("The bundle reader has been closed")
+
+        view, pos = self._view, 0
+        while pos < len(view):
+            start, end = pos, self._line_end(pos)
+            while start < end and view[start] in WHITESPACE:
+                start += 1
+
+            if start < end and view[start] != ord("#"):
+                yield start, end
+
+                # The view is released when the reader is closed meanwhile
+                if self._view is None:
+                    raise _EX.InvalidDataException(
+                        "The bundle reader was closed while reading entries"
+                    )
+
+            pos = self._mmap.find(b"\n", end)
+            pos = len(view) if pos == -1 else pos + 1
+
+    def split(self, start: int, end: int) -> Tuple[memoryview, memoryview, memoryview]:
+        """
+        Splits an entry into the type, the base64-encoded data
+        and the comment without copying it
+
+        Args:
+            start (int): The start offset of the entry
+            end (int): The end offset of the entry
+
+        Returns:
+            Tuple[memoryview, memoryview, memoryview]: The type, data and comment
+        """
+        if self._view is None:
+            raise _EX.InvalidDataException("The bundle reader has been closed")
+
+        type_end = self._find_whitespace(start, end)
+        if type_end == -1:
+            raise _EX.InvalidDataException(
+                f"Expected a type and base64-encoded data at offset {start}"
+            )
+
+        data_start = self._skip_spaces(type_end, end)
+        data_end = self._find_whitespace(data_start, end)
+        data_end = end if data_end == -1 else data_end
+
+        return (
+            self._view[start:type_end],
+            self._view[data_start:data_end],
+            self._view[self._skip_spaces(data_end, end) : end],
+        )
+
+    def parse_entry(
+        self, entry_type: memoryview, data: memoryview, comment: memoryview
+    ):
+        """
+        Parses a single entry. Implemented by the child classes.
+
+        Args:
+            entry_type (memoryview): The type of the entry
+            data (memoryview): The base64-encoded data
+            comment (memoryview): The comment, empty if not present
+        """
+        raise _EX.InvalidClassCallException("The base class has no entry type")
+
+    def _find_whitespace(self, start: int, end: int) -> int:
+        """
+        Finds the first whitespace character on a line
+
+        Args:
+            start (int): The offset to start from
+            end (int): The end of the line
+
+        Returns:
+            int: The offset of the first whitespace character, or -1
+        """
+        found = (self._mmap.find(bytes((char,)), start, end) for char in WHITESPACE)
+        return min((pos for pos in found if pos != -1), default=-1)
+
+    def _skip_spaces(self, start: int, end: int) -> int:
+        """
+        Finds the first non-whitespace character on a line
+
+        Args:
+            start (int): The offset to start from
+            end (int): The end of the line
+
+        Returns:
+            int: The offset of the first non-whitespace character, or end
+        """
+        view = self._view
+        while start < end and view[start] in WHITESPACE:
+            start += 1
+
+        return start
+
+    def _line_end(self, start: int) -> int:
+        """
+        Finds the end of the line starting at the given offset,
+        excluding trailing whitespace
+
+        Args:
+            start (int): The offset in the file
+
+        Returns:
+            int: The offset after the last non-whitespace character on the line
+        """
+        view = self._view
+        end = self._mmap.find(b"\n", start)
+        end = len(view) if end == -1 else end
+        while end > start and view[end - 1] in WHITESPACE:
+            end -= 1
+
+        return end
+
+
+class CertificateBundleReader(BundleReader):
+    """
+    Reads OpenSSH certificates from a memory-mapped bundle file
+
+    Args:
+        path (str): The path to the bundle file
+        lazy (bool, optional): Decode the certificate fields on first access
+                               instead of up front. Defaults to False.
+    """
+
+    def __init__(self, path: str, lazy: bool = False):
+        super().__init__(path)
+        self.lazy = lazy
+
+    # pylint: disable=unused-argument
+    def parse_entry(
+        self, entry_type: memoryview, data: memoryview, comment: memoryview
+    ) -> SSHCertificate:
+        """
+        Decodes a certificate entry
+
+        Args:
+            entry_type (memoryview): The certificate type
+            data (memoryview): The base64-encoded certificate
+            comment (memoryview): The comment, empty if not present
+
+        Returns:
+            SSHCertificate: SSHCertificate child class
+        """
+        return SSHCertificate.from_bytes(b64decode(data), lazy=self.lazy)
+
+
+class PublicKeyBundleReader(BundleReader):
+    """
+    Reads OpenSSH public keys from a memory-mapped file,
+    e.g. a list of public keys in the authorized_keys format
+    without options
+
+    Args:
+        path (str): The path to the public key file
+    """
+
+    def parse_entry(
+        self, entry_type: memoryview, data: memoryview, comment: memoryview
+    ) -> PublicKey:
+        """
+        Decodes a public key entry
+
+        Args:
+            entry_type (memoryview): The key type
+            data (memoryview): The base64-encoded public key
+            comment (memoryview): The comment, empty if not present
+
+        Raises:
+            _EX.InvalidKeyException: The key type does not match the key data
+
+        Returns:
+            PublicKey: Any of the PublicKey child classes
+        """
+        key_data = b64decode(data)
+        public_key = PublicKey.from_bytes(key_data)
+        if DecodeCursor(key_data).read_string() != entry_type:
+            raise _EX.InvalidKeyException("The key type does not match the key data")
+
+        if len(comment) > 0:
+            public_key.comment = bytes(comment)
+
+        return public_key
@@ -0,0 +1,302 @@
+"""
+Caches for parsed and verified certificates
+"""
+from collections import OrderedDict
+from copy import copy
+from datetime import datetime
+from hashlib import blake2b
+from heapq import heapify, heappop, heappush
+from itertools import count
+from threading import Lock
+from time import time
+from typing import Callable
+
+from .keys import PublicKey
+from .wire import BufferTypes
+
+
+# pylint: disable=too-many-instance-attributes
+class ExpiringCache:
+    """
+    Thread-safe mapping with a bounded size, where each entry can have an
+    expiry time. The least recently used entry is evicted when the cache
+    is full, and entries are dropped as soon as they expire.
+
+    Args:
+        maxsize (int, optional): The maximum number of entries. Defaults to 4096.
+        clock (Callable[[], float], optional): Function returning the current
+                                               time as a UNIX timestamp.
+                                               Defaults to time.time.
+    """
+
+    def __init__(self, maxsize: int = 4096, clock: Callable[[], float] = time):
+        self.maxsize = maxsize
+        self.clock = clock
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+        # Entries are stored as (value, expiry, generation)
+        self._entries = OrderedDict()
+        self._expiry = []
+        self._generation = count()
+        self._lock = Lock()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, key) -> bool:
+        return key in self._entries
+
+    @property
+    def stats(self) -> dict:
+        """
+        The cache counters
+
+        Returns:
+            dict: Hits, misses, evictions, expirations and the current size
+        """
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "expirations": self.expirations,
+            "size": len(self._entries),
+        }
+
+    @staticmethod
+    def get_expiry(certificate) -> float:
+        """
+        Get the end of the validity of a certificate as a UNIX timestamp
+
+        Args:
+            certificate (SSHCertificate): The certificate
+
+        Returns:
+            float: The valid_before time, or None if it cannot be determined
+        """
+        valid_before = certificate.get("valid_before")
+        if isinstance(valid_before, datetime):
+            return valid_before.timestamp()
+
+        if isinstance(valid_before, int):
+            return float(valid_before)
+
+        return None
+
+    def get(self, key):
+        """
+        Get a value from the cache
+
+        Args:
+            key: The cache key
+
+        Returns:
+            The cached value, or None if not cached
+        """
+        with self._lock:
+            self._expire()
+
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+
+            self._entries.move_to_end(key)
+            self.hits += 1
+
+        return entry[0]
+
+    def put(self, key, value, expires: float = None) -> None:
+        """
+        Add a value to the cache. Values that have already expired are not added.
+
+        Args:
+            key: The cache key
+            value: The value to store
+            expires (float, optional): The expiry as a UNIX timestamp. Defaults to None.
+        """
+        with self._lock:
+            self._expire()
+            if expires is not None and expires <= self.clock():
+                return
+
+            generation = next(self._generation)
+            self._entries[key] = (value, expires, generation)
+            self._entries.move_to_end(key)
+            if expires is not None:
+                heappush(self._expiry, (expires, generation, key))
+
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+            # Drop the expiry records of evicted or replaced entries
+            if len(self._expiry) > 2 * self.maxsize:
+                self._expiry = [
+                    (entry_expires, entry_generation, entry_key)
+                    for entry_key, (_, entry_expires, entry_generation) in (
+                        self._entries.items()
+                    )
+                    if entry_expires is not None
+                ]
+                heapify(self._expiry)
+
+    def clear(self) -> None:
+        """
+        Remove all entries from the cache. The counters are kept.
+        """
+        with self._lock:
+            self._entries.clear()
+            self._expiry.clear()
+
+    def _expire(self) -> None:
+        """
+        Drop the entries that have expired. Must be called with the lock held.
+        """
+        now = self.clock()
+        while self._expiry and self._expiry[0][0] <= now:
+            _, generation, key = heappop(self._expiry)
+
+            # The entry may have been evicted or replaced since
+            entry = self._entries.get(key)
+            if entry is not None and entry[2] == generation:
+                del self._entries[key]
+                self.expirations += 1
+
+
+class CertificateCache(ExpiringCache):
+    """
+    Bounded cache of parsed certificates, keyed by a digest of the
+    certificate bytes.
+
+    The least recently used certificate is evicted when the cache is full,
+    and certificates are dropped as soon as their valid_before time
+    has passed. The cache stores its own copy of each certificate and
+    returns a new copy on every hit, so callers can modify the returned
+    certificates without affecting each other.
+
+    Use by passing the cache to SSHCertificate.from_bytes, from_string or from_file.
+
+    Args:
+        maxsize (int, optional): The maximum number of certificates. Defaults to 4096.
+        clock (Callable[[], float], optional): Function returning the current
+                                               time as a UNIX timestamp.
+                                               Defaults to time.time.
+    """
+
+    @staticmethod
+    def key(data: BufferTypes) -> bytes:
+        """
+        Calculates the cache key for the certificate bytes
+
+        Args:
+            data (BufferTypes): The certificate bytes
+
+        Returns:
+            bytes: The digest of the data
+        """
+        return blake2b(data, digest_size=16).digest()
+
+    def get(self, key: bytes):
+        """
+        Get a copy of a cached certificate
+
+        Args:
+            key (bytes): The cache key
+
+        Returns:
+            SSHCertificate: A copy of the certificate, or None if not cached
+        """
+        certificate = super().get(key)
+
+        return None if certificate is None else copy(certificate)
+
+    # pylint: disable=arguments-differ
+    def put(self, key: bytes, certificate) -> None:
+        """
+        Add a certificate to the cache. The cache keeps its own copy.
+        Certificates that have already expired are not added.
+
+        Args:
+            key (bytes): The cache key
+            certificate (SSHCertificate): The certificate to add
+        """
+        super().put(key, copy(certificate), self.get_expiry(certificate))
+
+
+class VerificationCache(ExpiringCache):
+    """
+    Bounded cache of successful certificate signature verifications,
+    keyed by a digest of the signed data, the CA public key fingerprint
+    and the signature.
+
+    Only successful verifications are stored. Entries expire at the
+    valid_before time of the certificate or after the TTL,
+    whichever comes first.
+
+    Use by passing the cache to SSHCertificate.verify. The cache can be
+    shared between threads.
+
+    Args:
+        maxsize (int, optional): The maximum number of entries. Defaults to 4096.
+        ttl (float, optional): The maximum time to keep an entry, in seconds.
+                               Defaults to 3600.
+        clock (Callable[[], float], optional): Function returning the current
+                                               time as a UNIX timestamp.
+                                               Defaults to time.time.
+    """
+
+    def __init__(
+        self, maxsize: int = 4096, ttl: float = 3600, clock: Callable[[], float] = time
+    ):
+        super().__init__(maxsize, clock)
+        self.ttl = ttl
+
+    @staticmethod
+    def key(signable: bytes, public_key: PublicKey, signature: bytes) -> tuple:
+        """
+        Calculates the cache key for a signature verification
+
+        Args:
+            signable (bytes): The signed data
+            public_key (PublicKey): The public key used for verification
+            signature (bytes): The encoded signature
+
+        Returns:
+            tuple: The digest of the signed data, the key fingerprint and the signature
+        """
+        return (
+            blake2b(signable, digest_size=32).digest(),
+            public_key.get_fingerprint(),
+            signature,
+        )
+
+    def is_verified(self, key: tuple) -> bool:
+        """
+        Check if a signature verification has been cached
+
+        Args:
+            key (tuple): The cache key
+
+        Returns:
+            bool: True if the signature has been verified before
+        """
+        return self.get(key) is not None
+
+    def add(self, key: tuple, certificate) -> None:
+        """
+        Record a successful signature verification
+
+        Args:
+            key (tuple): The cache key
+            certificate (SSHCertificate): The verified certificate
+        """
+        expires = self.clock() + self.ttl
+        valid_before = self.get_expiry(certificate)
+        if valid_before is not None:
+            expires = min(expires, valid_before)
+
+        self.put(key, True, expires)
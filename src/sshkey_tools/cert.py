@@ -1,4 +1,4 @@
-# pylint: disable=super-with-arguments
+# pylint: disable=super-with-arguments,too-many-lines
 """
 Contains classes for OpenSSH Certificates, generation, parsing and signing
 Raises:
@@ -8,16 +8,23 @@ Raises:
     _EX.NoPrivateKeyException: The certificate contains no private key
     _EX.NotSignedException: The certificate is not signed and cannot be exported
 """
+import os
+from array import array
 from base64 import b64decode, b64encode
-from dataclasses import dataclass
-from typing import Tuple, Union
+from collections import deque
+from concurrent.futures import Executor, ThreadPoolExecutor
+from dataclasses import dataclass, fields as dataclass_fields
+from enum import IntEnum
+from typing import BinaryIO, Iterable, Iterator, List, Tuple, Union
 
 from prettytable import PrettyTable
 
 from . import exceptions as _EX
 from . import fields as _FIELD
+from .cache import CertificateCache, VerificationCache
 from .keys import PrivateKey, PublicKey
-from .utils import concat_to_bytestring, concat_to_string, ensure_bytestring
+from .utils import concat_to_string, ensure_bytestring
+from .wire import UINT32, Base64Cursor, BufferTypes, DecodeCursor, EncodeBuffer
 
 CERT_TYPES = {
     "ssh-rsa-cert-v01@openssh.com": ("RsaCertificate", "RsaPubkeyField"),
@@ -41,6 +48,19 @@ CERT_TYPES = {
     ),
 }
 
+REVISIONS = _FIELD.REVISIONS
+
+
+class VerifyResult(IntEnum):
+    """
+    Result codes of SSHCertificate.verify_many
+    """
+
+    VALID = 0
+    UNTRUSTED_CA = 1
+    INVALID_SIGNATURE = 2
+    INVALID_CERTIFICATE = 3
+
 
 @dataclass
 class Fieldset:
@@ -48,10 +68,23 @@ class Fieldset:
 
     DECODE_ORDER = []
 
+    # Stamp of the last change to the fieldset
+    _revision = 0
+
     def __table__(self):
         return [getattr(self, item).__table__() for item in self.getattrs()]
 
+    def __copy__(self):
+        return self.from_fields(
+            {
+                name: value if isinstance(value, type) else value.__copy__()
+                for name, value in self.__dict__.items()
+                if not name.startswith("_")
+            }
+        )
+
     def __setattr__(self, name, value):
+        super().__setattr__("_revision", next(REVISIONS))
         field = getattr(self, name, None)
 
         if isinstance(value, _FIELD.CertificateField):
@@ -72,6 +105,55 @@ class Fieldset:
             field.value = value
             super().__setattr__(name, field)
 
+    @classmethod
+    def from_fields(cls, fields: dict) -> "Fieldset":
+        """Create the fieldset from already created field instances,
+        without going through the field defaults and __setattr__
+
+        Args:
+            fields (dict): The field instances by name, in the order of
+                           the dataclass fields
+
+        Returns:
+            Fieldset: The fieldset (Header, Fields or Footer)
+        """
+        cl_instance = cls.__new__(cls)
+        cl_instance.__dict__.update(fields)
+        cl_instance.__dict__["_revision"] = next(REVISIONS)
+
+        return cl_instance
+
+    @property
+    def revision(self) -> int:
+        """
+        Stamp of the last change to the fieldset or any of its fields.
+        Every change gets a new, unique stamp, also across fieldsets.
+        """
+        return self.get_revision()
+
+    def get_revision(self, exclude: tuple = ()) -> int:
+        """Get the stamp of the last change to the fieldset or its fields
+
+        Args:
+            exclude (tuple, optional): Names of fields to leave out,
+            e.g. fields that are not encoded with the others. Defaults to ().
+
+        Returns:
+            int: The revision stamp
+        """
+        # Fields that are not set yet are classes, without a revision
+        fields = max(
+            (
+                value.revision
+                for name, value in self.__dict__.items()
+                if name[0] != "_"
+                and name not in exclude
+                and not isinstance(value, type)
+            ),
+            default=0,
+        )
+        return max(self._revision, fields)
+
     def replace_field(self, name: str, value: Union[_FIELD.CertificateField, type]):
         """Completely replace field instead of just setting value (original __setattr__ behaviour)
 
@@ -80,6 +162,7 @@ class Fieldset:
             value (Union[_FIELD.CertificateField, type]): The CertificateField
             subclass or instance to replace with
         """
+        super(Fieldset, self).__setattr__("_revision", next(REVISIONS))
         super(Fieldset, self).__setattr__(name, value)
 
     def get(self, name: str, default=None):
@@ -100,6 +183,26 @@ class Fieldset:
             return field.value
         return field
 
+    def __bytes__(self):
+        buffer = EncodeBuffer()
+        self.write_to(buffer)
+        return buffer.getvalue()
+
+    def write_to(self, buffer: EncodeBuffer) -> None:
+        """Write the encoded fields to a buffer. Implemented by the child classes.
+
+        Args:
+            buffer (EncodeBuffer): The buffer to write to
+        """
+        raise _EX.InvalidClassCallException("The base class has no fields to write")
+
+    def invalidate(self) -> None:
+        """Drop the kept encodings of all fields"""
+        for name in self.getattrs():
+            field = getattr(self, name)
+            if not isinstance(field, type):
+                field.invalidate()
+
     def getattrs(self) -> tuple:
         """Get all class attributes
 
@@ -127,19 +230,38 @@ class Fieldset:
         return True if len(ex) == 0 else ex
 
     @classmethod
-    def decode(cls, data: bytes) -> Tuple["Fieldset", bytes]:
-        """Decode the certificate field data from a stream of bytes
+    def from_cursor(cls, cursor: DecodeCursor, lazy: bool = False) -> "Fieldset":
+        """Decode the certificate field data at the position of the cursor
+
+        Args:
+            cursor (DecodeCursor): The cursor to read the fields from
+            lazy (bool, optional): Only record the position of each field and
+                                   decode the value on first access. Defaults to False.
 
         Returns:
-            Tuple[Fieldset, bytes]: A tuple with the fieldset (Header, Fields or Footer)
-            and the remaining bytes.
+            Fieldset: The fieldset (Header, Fields or Footer)
         """
         cl_instance = cls()
         for item in cls.DECODE_ORDER:
-            decoded, data = getattr(cl_instance, item).from_decode(data)
-            setattr(cl_instance, item, decoded)
+            field = getattr(cl_instance, item)
+            setattr(
+                cl_instance,
+                item,
+                field.from_lazy(cursor) if lazy else field.from_cursor(cursor),
+            )
 
-        return cl_instance, data
+        return cl_instance
+
+    @classmethod
+    def decode(cls, data: BufferTypes) -> Tuple["Fieldset", bytes]:
+        """Decode the certificate field data from a stream of bytes
+
+        Returns:
+            Tuple[Fieldset, bytes]: A tuple with the fieldset (Header, Fields or Footer)
+            and the remaining bytes.
+        """
+        cursor = DecodeCursor(data)
+        return cls.from_cursor(cursor), cursor.remainder()
 
 
 @dataclass
@@ -152,21 +274,23 @@ class CertificateHeader(Fieldset):
 
     DECODE_ORDER = ["pubkey_type", "nonce"]
 
-    def __bytes__(self):
-        return concat_to_bytestring(
-            bytes(self.pubkey_type), bytes(self.nonce), bytes(self.public_key)
-        )
+    def write_to(self, buffer: EncodeBuffer) -> None:
+        self.pubkey_type.write_to(buffer)
+        self.nonce.write_to(buffer)
+        self.public_key.write_to(buffer)
 
     @classmethod
-    def decode(cls, data: bytes) -> Tuple["CertificateHeader", bytes]:
-        cl_instance, data = super().decode(data)
-
-        target_class = CERT_TYPES[cl_instance.get("pubkey_type")]
-
-        public_key, data = getattr(_FIELD, target_class[1]).from_decode(data)
-        cl_instance.public_key = public_key
+    def from_cursor(
+        cls, cursor: DecodeCursor, lazy: bool = False
+    ) -> "CertificateHeader":
+        cl_instance = super().from_cursor(cursor, lazy)
+
+        target_class = getattr(_FIELD, CERT_TYPES[cl_instance.get("pubkey_type")][1])
+        cl_instance.public_key = (
+            target_class.from_lazy(cursor) if lazy else target_class.from_cursor(cursor)
+        )
 
-        return cl_instance, data
+        return cl_instance
 
 
 @dataclass
@@ -194,17 +318,15 @@ class CertificateFields(Fieldset):
         "extensions",
     ]
 
-    def __bytes__(self):
-        return concat_to_bytestring(
-            bytes(self.serial),
-            bytes(self.cert_type),
-            bytes(self.key_id),
-            bytes(self.principals),
-            bytes(self.valid_after),
-            bytes(self.valid_before),
-            bytes(self.critical_options),
-            bytes(self.extensions),
-        )
+    def write_to(self, buffer: EncodeBuffer) -> None:
+        self.serial.write_to(buffer)
+        self.cert_type.write_to(buffer)
+        self.key_id.write_to(buffer)
+        self.principals.write_to(buffer)
+        self.valid_after.write_to(buffer)
+        self.valid_before.write_to(buffer)
+        self.critical_options.write_to(buffer)
+        self.extensions.write_to(buffer)
 
 
 @dataclass
@@ -217,10 +339,133 @@ class CertificateFooter(Fieldset):
 
     DECODE_ORDER = ["reserved", "ca_pubkey", "signature"]
 
-    def __bytes__(self):
-        return concat_to_bytestring(bytes(self.reserved), bytes(self.ca_pubkey))
+    def write_to(self, buffer: EncodeBuffer) -> None:
+        self.reserved.write_to(buffer)
+        self.ca_pubkey.write_to(buffer)
+
 
+class DecodePlan:
+    """
+    The decoding steps for one certificate type, compiled on first use.
+
+    The plan holds the field classes for every field of the certificate,
+    including the type-specific public key, in the encoded order,
+    and fills the header, fields and footer directly without
+    looking up or validating the default fields.
+    """
 
+    PLANS = {}
+
+    def __init__(self, cert_type: str):
+        cert_class, pubkey_class = CERT_TYPES[cert_type]
+
+        self.cert_type = cert_type
+        self.certificate_class = globals()[cert_class]
+        self.sections = tuple(
+            (
+                section,
+                tuple(field.name for field in dataclass_fields(section)),
+                tuple(
+                    (
+                        name,
+                        (
+                            getattr(_FIELD, pubkey_class)
+                            if name == "public_key"
+                            else section.__annotations__[name]
+                        ),
+                    )
+                    for name in order
+                ),
+            )
+            for section, order in (
+                (CertificateHeader, CertificateHeader.DECODE_ORDER + ["public_key"]),
+                (CertificateFields, CertificateFields.DECODE_ORDER),
+                (CertificateFooter, CertificateFooter.DECODE_ORDER),
+            )
+        )
+
+    @classmethod
+    def for_type(cls, cert_type: str) -> "DecodePlan":
+        """
+        Get the decode plan for a certificate type
+
+        Args:
+            cert_type (str): The certificate type, e.g. ssh-ed25519-cert-v01@openssh.com
+
+        Raises:
+            _EX.InvalidCertificateFormatException: Unknown certificate type
+
+        Returns:
+            DecodePlan: The decode plan
+        """
+        plan = cls.PLANS.get(cert_type)
+        if plan is None:
+            if cert_type not in CERT_TYPES:
+                raise _EX.InvalidCertificateFormatException(
+                    f"Unknown certificate type {cert_type}"
+                )
+
+            plan = cls.PLANS[cert_type] = cls(cert_type)
+
+        return plan
+
+    @classmethod
+    def for_cursor(cls, cursor: DecodeCursor) -> "DecodePlan":
+        """
+        Get the decode plan for the certificate at the position of the cursor,
+        without advancing the cursor
+
+        Args:
+            cursor (DecodeCursor): The cursor positioned at the certificate
+
+        Returns:
+            DecodePlan: The decode plan
+        """
+        return cls.for_type(str(cursor.peek_string(), "utf-8"))
+
+    def decode(
+        self, cursor: DecodeCursor, lazy: bool = False, certificate_class: type = None
+    ) -> "SSHCertificate":
+        """
+        Decode the certificate at the position of the cursor
+
+        Args:
+            cursor (DecodeCursor): The cursor positioned at the certificate
+            lazy (bool, optional): Decode the field values on first access
+                                   instead of up front. Defaults to False.
+            certificate_class (type, optional): The SSHCertificate child class to
+                                                create. Defaults to the class for
+                                                the certificate type.
+
+        Returns:
+            SSHCertificate: SSHCertificate child class
+        """
+        sections = []
+        for section, names, steps in self.sections:
+            decoded = {
+                name: field.from_lazy(cursor) if lazy else field.from_cursor(cursor)
+                for name, field in steps
+            }
+            sections.append(
+                section.from_fields({name: decoded[name] for name in names})
+            )
+
+        return (certificate_class or self.certificate_class)(
+            header=sections[0], fields=sections[1], footer=sections[2]
+        )
+
+
+# The order of all fields in an encoded certificate, with the field class.
+# The class of the public key depends on the certificate type.
+PEEK_ORDER = [
+    (name, section.__annotations__[name])
+    for section in (CertificateHeader, CertificateFields, CertificateFooter)
+    for name in section.DECODE_ORDER
+]
+PEEK_ORDER.insert(2, ("public_key", None))
+
+
+# pylint: disable=too-many-public-methods
 class SSHCertificate:
     """
     General class for SSH Certificates, used for loading and parsing.
@@ -230,6 +475,12 @@ class SSHCertificate:
 
     DEFAULT_KEY_TYPE = "none@openssh.com"
 
+    # The encoded signable data and certificate, and the
+    # revisions of the fieldsets they were encoded from
+    _signable = None
+    _wire = None
+    _revisions = None
+
     # pylint: disable=too-many-arguments, too-many-positional-arguments
     def __init__(
         self,
@@ -273,13 +524,26 @@ class SSHCertificate:
                 "Failed exporting certificate: Certificate is not signed"
             )
 
-        return concat_to_bytestring(
-            bytes(self.header),
-            bytes(self.fields),
-            bytes(self.footer),
-            bytes(self.footer.signature),
+        self._check_revisions()
+        if self._wire is None:
+            self._wire = self.get_signable() + bytes(self.footer.signature)
+
+        return self._wire
+
+    def __copy__(self) -> "SSHCertificate":
+        copied = self.__class__(
+            header=self.header.__copy__(),
+            fields=self.fields.__copy__(),
+            footer=self.footer.__copy__(),
         )
 
+        # The copy has the same contents, so the cached encodings still apply
+        if self._revisions == self.get_revisions():
+            copied._signable, copied._wire = self._signable, self._wire
+            copied._revisions = copied.get_revisions()
+
+        return copied
+
     def __str__(self) -> str:
         table = PrettyTable(["Field", "Value"])
 
@@ -327,39 +591,70 @@ class SSHCertificate:
         )
 
     @classmethod
-    def decode(cls, data: bytes) -> "SSHCertificate":
+    def decode(cls, data: BufferTypes, lazy: bool = False) -> "SSHCertificate":
         """
         Decode an existing certificate and import it into a new object
 
         Args:
-            data (bytes): The certificate bytes, base64 decoded middle part of the certificate
+            data (BufferTypes): The certificate bytes, base64 decoded middle part
+                                of the certificate. Accepts bytes, bytearray,
+                                memoryview or mmap objects.
+            lazy (bool, optional): Decode the field values on first access
+                                   instead of up front. Defaults to False.
 
         Returns:
             SSHCertificate: SSHCertificate child class
         """
-        cert_header, data = CertificateHeader.decode(data)
-        cert_fields, data = CertificateFields.decode(data)
-        cert_footer, data = CertificateFooter.decode(data)
-
-        return cls(header=cert_header, fields=cert_fields, footer=cert_footer)
+        cursor = DecodeCursor(data)
+        return DecodePlan.for_cursor(cursor).decode(cursor, lazy, cls)
 
     @classmethod
-    def from_bytes(cls, cert_bytes: bytes):
+    def from_bytes(
+        cls,
+        cert_bytes: BufferTypes,
+        lazy: bool = False,
+        cache: CertificateCache = None,
+    ):
         """
         Loads an existing certificate from the byte value.
 
+        In lazy mode, the certificate is scanned once to find the position of
+        each field, and the fields (including the subject and CA public keys
+        and the signature) are only decoded when they are accessed. The
+        certificate keeps a reference to cert_bytes while fields are undecoded.
+
         Args:
-            cert_bytes (bytes): Certificate bytes, base64 decoded middle part of the certificate
+            cert_bytes (BufferTypes): Certificate bytes, base64 decoded middle part
+                                      of the certificate
+            lazy (bool, optional): Decode the field values on first access
+                                   instead of up front. Defaults to False.
+            cache (CertificateCache, optional): Cache to look up and store
+                                                parsed certificates. Defaults to None.
 
         Returns:
             SSHCertificate: SSHCertificate child class
         """
-        cert_type, _ = _FIELD.StringField.decode(cert_bytes)
-        target_class = CERT_TYPES[cert_type]
-        return globals()[target_class[0]].decode(cert_bytes)
+        if cache is not None:
+            key = cache.key(cert_bytes)
+            certificate = cache.get(key)
+            if certificate is None:
+                # The cached copy must not reference the caller's buffer
+                certificate = cls.from_bytes(bytes(cert_bytes), lazy)
+                cache.put(key, certificate)
+
+            return certificate
+
+        cursor = DecodeCursor(cert_bytes)
+        return DecodePlan.for_cursor(cursor).decode(cursor, lazy)
 
     @classmethod
-    def from_string(cls, cert_str: Union[str, bytes], encoding: str = "utf-8"):
+    def from_string(
+        cls,
+        cert_str: Union[str, bytes],
+        encoding: str = "utf-8",
+        lazy: bool = False,
+        cache: CertificateCache = None,
+    ):
         """
         Loads an existing certificate from a string in the format
         [certificate-type] [base64-encoded-certificate] [optional-comment]
@@ -367,6 +662,10 @@ class SSHCertificate:
         Args:
             cert_str (str): The string containing the certificate
             encoding (str, optional): The encoding of the string. Defaults to 'utf-8'.
+            lazy (bool, optional): Decode the field values on first access
+                                   instead of up front. Defaults to False.
+            cache (CertificateCache, optional): Cache to look up and store
+                                                parsed certificates. Defaults to None.
 
         Returns:
             SSHCertificate: SSHCertificate child class
@@ -374,22 +673,175 @@ class SSHCertificate:
         cert_str = ensure_bytestring(cert_str, encoding)
 
         certificate = b64decode(cert_str.split(b" ")[1])
-        return cls.from_bytes(cert_bytes=certificate)
+        return cls.from_bytes(cert_bytes=certificate, lazy=lazy, cache=cache)
 
     @classmethod
-    def from_file(cls, path: str, encoding: str = "utf-8"):
+    def from_file(
+        cls,
+        path: str,
+        encoding: str = "utf-8",
+        lazy: bool = False,
+        cache: CertificateCache = None,
+    ):
         """
         Loads an existing certificate from a file
 
         Args:
             path (str): The path to the certificate file
             encoding (str, optional): Encoding of the file. Defaults to 'utf-8'.
+            lazy (bool, optional): Decode the field values on first access
+                                   instead of up front. Defaults to False.
+            cache (CertificateCache, optional): Cache to look up and store
+                                                parsed certificates. Defaults to None.
 
         Returns:
             SSHCertificate: SSHCertificate child class
         """
         with open(path, "r", encoding=encoding) as file:
-            return cls.from_string(file.read())
+            return cls.from_string(file.read(), lazy=lazy, cache=cache)
+
+    @classmethod
+    def parse_many(
+        cls,
+        lines: Union[Iterable[Union[str, bytes]], BinaryIO],
+        encoding: str = "utf-8",
+        lazy: bool = False,
+        collect_errors: bool = False,
+    ) -> Iterator[Union["SSHCertificate", Tuple[int, Exception]]]:
+        """
+        Parses certificates from an iterable of lines in the format
+        [certificate-type] [base64-encoded-certificate] [optional-comment],
+        e.g. a list of strings or a file opened in binary mode.
+
+        Lines are read one at a time, so memory use does not depend on the
+        size of the bundle. Blank lines and lines starting with # are skipped,
+        and the certificate class is only resolved once per certificate type.
+
+        Args:
+            lines (Union[Iterable[Union[str, bytes]], BinaryIO]): The certificate lines
+            encoding (str, optional): The encoding of str lines. Defaults to 'utf-8'.
+            lazy (bool, optional): Decode the field values on first access
+                                   instead of up front. Defaults to False.
+            collect_errors (bool, optional): Yield a tuple of (line number, exception)
+                                             for invalid lines instead of raising.
+                                             Defaults to False.
+
+        Raises:
+            _EX.InvalidCertificateFormatException: Invalid certificate on a line,
+                                                   unless collect_errors is set
+
+        Yields:
+            Union[SSHCertificate, Tuple[int, Exception]]: SSHCertificate child class,
+                                                          or an error in collect mode
+        """
+        dispatch = {}
+        for line_no, line in enumerate(lines, start=1):
+            if isinstance(line, str):
+                line = line.encode(encoding)
+
+            line = line.strip()
+            if not line or line.startswith(b"#"):
+                continue
+
+            try:
+                parts = line.split(maxsplit=2)
+                if len(parts) < 2:
+                    raise _EX.InvalidCertificateFormatException(
+                        "Expected a certificate type and base64-encoded data"
+                    )
+
+                if parts[0] not in dispatch:
+                    cert_type = parts[0].decode("utf-8", "replace")
+                    dispatch[parts[0]] = (
+                        None
+                        if cert_type not in CERT_TYPES
+                        else (
+                            DecodePlan.for_type(cert_type),
+                            UINT32.pack(len(parts[0])) + parts[0],
+                        )
+                    )
+
+                if dispatch[parts[0]] is None:
+                    raise _EX.InvalidCertificateFormatException(
+                        f"Unknown certificate type {parts[0]!r}"
+                    )
+
+                plan, expected_head = dispatch[parts[0]]
+                certificate = b64decode(parts[1])
+                if not certificate.startswith(expected_head):
+                    raise _EX.InvalidCertificateFormatException(
+                        "The certificate type does not match the certificate data"
+                    )
+
+                certificate = plan.decode(DecodeCursor(certificate), lazy)
+            except (ValueError, KeyError, IndexError, OverflowError, OSError) as ex:
+                if not collect_errors:
+                    raise _EX.InvalidCertificateFormatException(
+                        f"Invalid certificate on line {line_no}: {ex}"
+                    ) from ex
+
+                yield line_no, ex
+            else:
+                yield certificate
+
+    @staticmethod
+    def peek(
+        cert_str: Union[str, bytes],
+        fields: Iterable[str] = ("pubkey_type", "nonce", "public_key", "serial"),
+        encoding: str = "utf-8",
+    ) -> dict:
+        """
+        Reads selected fields from a certificate string without decoding
+        the full certificate. The base64 data is only decoded up to the
+        last requested field, and fields in between are skipped.
+
+        For routing or indexing certificates by e.g. the subject key fingerprint
+        and serial, this avoids decoding the signature and CA key.
+
+        Args:
+            cert_str (Union[str, bytes]): The string containing the certificate
+            fields (Iterable[str], optional): The names of the fields to read.
+                Defaults to pubkey_type, nonce, public_key and serial.
+            encoding (str, optional): The encoding of the string. Defaults to 'utf-8'.
+
+        Raises:
+            _EX.InvalidCertificateFieldException: Unknown field name
+            _EX.InvalidCertificateFormatException: Invalid certificate string
+
+        Returns:
+            dict: The field names and the decoded values
+        """
+        wanted = set(fields)
+        unknown = wanted.difference(name for name, _ in PEEK_ORDER)
+        if unknown:
+            raise _EX.InvalidCertificateFieldException(
+                f"Unknown certificate field(s): {', '.join(sorted(unknown))}"
+            )
+
+        cert_str = ensure_bytestring(cert_str, encoding).strip()
+        start = cert_str.find(b" ") + 1
+        stop = cert_str.find(b" ", start)
+        if start == 0:
+            raise _EX.InvalidCertificateFormatException(
+                "Expected a certificate type and base64-encoded data"
+            )
+
+        cursor = Base64Cursor(memoryview(cert_str)[start : stop if stop > 0 else None])
+        values = {}
+        for name, field_class in PEEK_ORDER:
+            if not wanted:
+                break
+
+            if name == "public_key":
+                field_class = getattr(_FIELD, CERT_TYPES[values["pubkey_type"]][1])
+
+            if name in wanted or name == "pubkey_type":
+                values[name] = field_class.from_cursor(cursor).value
+                wanted.discard(name)
+            else:
+                field_class.skip(cursor)
+
+        return {name: values[name] for name in fields}
 
     def get(self, field: str):
         """
@@ -487,20 +939,104 @@ class SSHCertificate:
 
         return True
 
-    def get_signable(self) -> bytes:
+    def get_revisions(self) -> Tuple[int, int, int, int]:
         """
-        Retrieves the signable data for the certificate in byte form
+        Get the revisions of the header, fields, footer and signature. The
+        revisions change whenever a field is set on one of the fieldsets.
+        The footer revision leaves out the signature, which is not part
+        of the signable data.
+
+        Returns:
+            Tuple[int, int, int, int]: The header, fields, footer
+                                       and signature revisions
         """
-        return concat_to_bytestring(
-            bytes(self.header), bytes(self.fields), bytes(self.footer)
+        return (
+            self.header.revision,
+            self.fields.revision,
+            self.footer.get_revision(exclude=("signature",)),
+            self.footer.signature.revision,
         )
 
+    def _check_revisions(self) -> None:
+        """
+        Drops the cached encodings if any of the fieldsets has changed
+        since they were encoded. A new signature only drops the
+        encoding of the whole certificate, not the signable data.
+        """
+        revisions = self.get_revisions()
+        if revisions != self._revisions:
+            if revisions[:3] != (self._revisions or ())[:3]:
+                self._signable = None
+
+            self._revisions = revisions
+            self._wire = None
+
+    def invalidate(self) -> None:
+        """
+        Drops the cached encodings of the certificate and its fields.
+        Not needed after changing field values, also not in place,
+        e.g. appending to the principals list, as those are noticed.
+        """
+        self._revisions = self._signable = self._wire = None
+
+        for fieldset in (self.header, self.fields, self.footer):
+            fieldset.invalidate()
+
+    def get_signable(self) -> bytes:
+        """
+        Retrieves the signable data for the certificate in byte form.
+
+        The data is encoded once and reused until a field is changed
+        through set(), replace_ca() or on one of the fieldsets.
+        """
+        self._check_revisions()
+        if self._signable is None:
+            buffer = EncodeBuffer()
+            self.write_to(buffer, signature=False)
+            self._signable = buffer.getvalue()
+
+        return self._signable
+
+    def get_digest(self, **kwargs) -> bytes:
+        """
+        Hashes the signable data with the hash algorithm of the signature,
+        ex. SHA-512 for RSA signatures with the default hash_alg.
+        Pass the digest to sign() as digest to sign it without hashing
+        the data again, and reuse it e.g. for audit records.
+
+        Args:
+            **kwargs: The arguments for signing, ex. hash_alg for RSA signatures
+
+        Returns:
+            bytes: The digest, or None for ED25519 signatures,
+                   which sign the data without hashing it first
+        """
+        return self.footer.signature.get_digest(self.get_signable(), **kwargs)
+
+    def write_to(self, buffer: EncodeBuffer, signature: bool = True) -> None:
+        """
+        Writes the encoded certificate to a buffer
+
+        Args:
+            buffer (EncodeBuffer): The buffer to write to
+            signature (bool, optional): Include the signature. Without it,
+                                        the signable data is written.
+                                        Defaults to True.
+        """
+        self.header.write_to(buffer)
+        self.fields.write_to(buffer)
+        self.footer.write_to(buffer)
+        if signature:
+            self.footer.signature.write_to(buffer)
+
     def sign(self, **kwargs) -> bool:
         """Sign the certificate
 
         Args:
             **kwargs: Arguments to pass to the signature signing method
-                      ex. hash_alg for RSA signatures
+                      ex. hash_alg for RSA signatures, signer to sign
+                      with a sshkey_tools.signer.ProcessSigner, or digest
+                      to sign the digest from get_digest()
 
         Raises:
             _EX.NotSignedException: The certificate could not be signed
@@ -509,13 +1045,100 @@ class SSHCertificate:
             bool: Whether successful
         """
         if self.can_sign():
-            self.footer.signature.sign(data=self.get_signable(), **kwargs)
+            signature = self.footer.signature.create_signature(
+                self.get_signable(), **kwargs
+            )
+            self.set_signature(signature, **kwargs)
 
             return True
         raise _EX.NotSignedException("There was an error while signing the certificate")
 
+    def set_signature(self, signature: bytes, **kwargs) -> None:
+        """
+        Sets a signature on the certificate that was created separately
+        from sign(), e.g. in another thread or process, with
+        footer.signature.create_signature(get_signable())
+
+        Args:
+            signature (bytes): The signature bytes
+            **kwargs: The arguments the signature was created with
+                      ex. hash_alg for RSA signatures
+        """
+        self.footer.signature.attach(signature, **kwargs)
+        self._wire = None
+
+    @classmethod
+    # pylint: disable=broad-exception-caught
+    def sign_many(
+        cls,
+        certificates: Iterable["SSHCertificate"],
+        executor: Executor = None,
+        max_workers: int = None,
+        **kwargs,
+    ) -> List[Union[bool, Exception]]:
+        """
+        Signs a batch of certificates, with the private key operations
+        running in a thread pool.
+
+        The certificates are checked and encoded in the calling thread,
+        only the signing itself is sent to the pool. A certificate that
+        cannot be signed does not stop the rest of the batch.
+
+        Args:
+            certificates (Iterable[SSHCertificate]): The certificates to sign
+            executor (Executor, optional): The executor to sign with. Defaults to
+                                           a new thread pool for the batch.
+            max_workers (int, optional): The number of threads for the new thread pool.
+                                         Defaults to the ThreadPoolExecutor default.
+            **kwargs: Arguments to pass to the signature signing method
+                      ex. hash_alg for RSA signatures
+
+        Returns:
+            List[Union[bool, Exception]]: For each certificate in input order,
+                                          True if it was signed, or the exception
+                                          that prevented signing it
+        """
+        results, jobs = [], []
+        for certificate in certificates:
+            try:
+                certificate.can_sign()
+                jobs.append((len(results), certificate, certificate.get_signable()))
+                results.append(None)
+            except Exception as ex:
+                results.append(ex)
+
+        pool = ThreadPoolExecutor(max_workers) if executor is None else executor
+        try:
+            futures = [
+                (
+                    index,
+                    certificate,
+                    pool.submit(
+                        certificate.footer.signature.create_signature,
+                        signable,
+                        **kwargs,
+                    ),
+                )
+                for index, certificate, signable in jobs
+            ]
+
+            for index, certificate, future in futures:
+                try:
+                    certificate.set_signature(future.result(), **kwargs)
+                    results[index] = True
+                except Exception as ex:
+                    results[index] = ex
+        finally:
+            if executor is None:
+                pool.shutdown()
+
+        return results
+
     def verify(
-        self, public_key: PublicKey = None, raise_on_error: bool = False
+        self,
+        public_key: PublicKey = None,
+        raise_on_error: bool = False,
+        cache: VerificationCache = None,
     ) -> bool:
         """Verify the signature on the certificate to make sure the data is not corrupted,
            and that the signature comes from the given public key or the key included in the
@@ -524,6 +1147,9 @@ class SSHCertificate:
         Args:
             public_key (PublicKey, optional): The public key to use for verification
             raise_on_error (bool, default False): Raise an exception if the certificate is invalid
+            cache (VerificationCache, optional): Cache of successful verifications,
+                                                 to skip verifying the same signature again.
+                                                 Defaults to None.
 
         Raises:
             _EX.InvalidSignatureException: The signature is invalid
@@ -531,15 +1157,165 @@ class SSHCertificate:
         if not public_key:
             public_key = self.get("ca_pubkey")
 
+        signable = self.get_signable()
+        if cache is not None:
+            key = cache.key(signable, public_key, bytes(self.footer.signature))
+            if cache.is_verified(key):
+                return True
+
         try:
-            public_key.verify(self.get_signable(), self.footer.get("signature"))
+            public_key.verify(signable, self.footer.get("signature"))
         except _EX.InvalidSignatureException as exception:
             if raise_on_error:
                 raise exception
             return False
 
+        if cache is not None:
+            cache.add(key, self)
+
         return True
 
+    @classmethod
+    # pylint: disable=too-many-arguments, too-many-positional-arguments
+    def verify_many(
+        cls,
+        certificates: Iterable[Union["SSHCertificate", object]],
+        trusted_keys: Iterable[PublicKey],
+        executor: Executor = None,
+        max_workers: int = None,
+        chunk_size: int = 256,
+    ) -> array:
+        """
+        Verifies a stream of certificates against a set of trusted CA keys,
+        with the signature verifications running in a thread pool.
+
+        Each certificate is matched to a trusted key by the encoded CA public
+        key, without decoding it, and verified with the trusted key object.
+        The certificates are read in chunks, and only about two chunks per
+        worker of the pool, also of a given executor, are waiting at a time,
+        so a generator, e.g. from parse_many, is verified without keeping all
+        certificates in memory.
+
+        Args:
+            certificates (Iterable[Union[SSHCertificate, object]]): The certificates
+                to verify. Other items, e.g. the errors from parse_many with
+                collect_errors, are counted as invalid certificates.
+            trusted_keys (Iterable[PublicKey]): The public keys of the trusted CAs
+            executor (Executor, optional): The executor to verify with. Defaults to
+                                           a new thread pool for the batch.
+            max_workers (int, optional): The number of threads for the new thread pool.
+                                         Defaults to the ThreadPoolExecutor default.
+            chunk_size (int, optional): The number of certificates verified per task.
+                                        Defaults to 256.
+
+        Returns:
+            array: A VerifyResult code for each certificate, in input order
+        """
+        trusted = {
+            bytes(_FIELD.CAPublicKeyField.encode(key.raw_bytes())): key
+            for key in trusted_keys
+        }
+
+        results = array("B")
+        pool = ThreadPoolExecutor(max_workers) if executor is None else executor
+        pending = deque()
+        # Executors without a known number of workers are assumed to have
+        # one per CPU, like the process and thread pools by default
+        workers = getattr(pool, "_max_workers", None) or os.cpu_count() or 1
+        max_pending = 2 * workers
+        try:
+            chunk = []
+            for certificate in certificates:
+                chunk.append(cls._verify_job(certificate, trusted, len(results)))
+                results.append(VerifyResult.VALID)
+
+                if len(chunk) >= chunk_size:
+                    pending.append(pool.submit(cls._verify_chunk, chunk))
+                    chunk = []
+
+                    while len(pending) > max_pending:
+                        cls._collect_chunk(pending.popleft(), results)
+
+            if chunk:
+                pending.append(pool.submit(cls._verify_chunk, chunk))
+
+            while pending:
+                cls._collect_chunk(pending.popleft(), results)
+        finally:
+            if executor is None:
+                pool.shutdown()
+
+        return results
+
+    @staticmethod
+    # pylint: disable=broad-exception-caught
+    def _verify_job(certificate: "SSHCertificate", trusted: dict, index: int) -> tuple:
+        """
+        Prepares the verification of a certificate in the calling thread
+
+        Args:
+            certificate (SSHCertificate): The certificate
+            trusted (dict): The trusted public keys by encoded CA public key
+            index (int): The position of the certificate in the input
+
+        Returns:
+            tuple: The index, and the result code or the arguments for verify
+        """
+        try:
+            public_key = trusted.get(bytes(certificate.footer.ca_pubkey.encoded))
+            if public_key is None:
+                return index, VerifyResult.UNTRUSTED_CA
+
+            signature = certificate.footer.signature
+            args = (certificate.get_signable(), signature.value)
+            if isinstance(signature, _FIELD.RsaSignatureField):
+                args += (signature.hash_alg,)
+
+            return index, (public_key, args)
+        except Exception:
+            return index, VerifyResult.INVALID_CERTIFICATE
+
+    @staticmethod
+    # pylint: disable=broad-exception-caught
+    def _verify_chunk(chunk: list) -> list:
+        """
+        Verifies the signatures of a chunk of prepared certificates
+
+        Args:
+            chunk (list): The prepared verifications
+
+        Returns:
+            list: The index and result code for each certificate
+        """
+        results = []
+        for index, job in chunk:
+            if isinstance(job, VerifyResult):
+                results.append((index, job))
+                continue
+
+            public_key, args = job
+            try:
+                public_key.verify(*args)
+                results.append((index, VerifyResult.VALID))
+            except _EX.InvalidSignatureException:
+                results.append((index, VerifyResult.INVALID_SIGNATURE))
+            except Exception:
+                results.append((index, VerifyResult.INVALID_CERTIFICATE))
+
+        return results
+
+    @staticmethod
+    def _collect_chunk(future, results: array) -> None:
+        """
+        Writes the result codes of a verified chunk to the results
+
+        Args:
+            future (Future): The future of the chunk
+            results (array): The result codes
+        """
+        for index, result in future.result():
+            results[index] = result
+
     def to_string(self, comment: str = "", encoding: str = "utf-8"):
         """Export the certificate to a string
 
@@ -595,9 +1371,11 @@ class EcdsaCertificate(SSHCertificate):
 
     def __post_init__(self):
         """Set the key name from the public key curve size"""
-        self.header.pubkey_type = self.header.get("pubkey_type").replace(
-            "[curve_size]", str(self.header.public_key.value.key.curve.key_size)
-        )
+        pubkey_type = self.header.get("pubkey_type")
+        if "[curve_size]" in pubkey_type:
+            self.header.pubkey_type = pubkey_type.replace(
+                "[curve_size]", str(self.header.public_key.value.key.curve.key_size)
+            )
 
 
 class Ed25519Certificate(SSHCertificate):
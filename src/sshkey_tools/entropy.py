@@ -0,0 +1,154 @@
+"""
+Buffered pool of secure random bytes for the random field values of
+certificates: nonces, serials and key IDs.
+
+The pool is refilled from os.urandom in large blocks instead of drawing
+a few bytes from the operating system for every value, and the values
+are prepared for a whole block at once. The pool is thread-safe, and a
+child process created with fork starts with an empty pool, so it never
+hands out the same values as its parent.
+"""
+import os
+from collections import deque
+from struct import unpack
+
+from .forksafe import ForkSafe
+
+# Size of the nonce generated by OpenSSH
+NONCE_LENGTH = 32
+
+# Translation tables setting the version (4) and variant bits of a random UUID
+UUID_VERSION = bytes((i & 0x0F) | 0x40 for i in range(256))
+UUID_VARIANT = bytes((i & 0x3F) | 0x80 for i in range(256))
+
+
+class EntropyPool(ForkSafe):
+    """
+    Pool of secure random values, refilled from os.urandom
+
+    Args:
+        buffer_size (int, optional): The number of bytes drawn from the operating
+                                     system per refill. Defaults to 16 KiB.
+    """
+
+    def __init__(self, buffer_size: int = 2**14):
+        self.buffer_size = max(buffer_size, NONCE_LENGTH)
+        super().__init__()
+
+    def _reset(self) -> None:
+        """
+        Empties the pool
+        """
+        super()._reset()
+        self._buffer = b""
+        self._offset = 0
+
+        self._nonces = deque()
+        self._serials = deque()
+        self._keyids = deque()
+
+    def _draw(self, values: deque, fill) -> object:
+        """
+        Takes the next value from a queue, filling it when it is empty.
+        Taking a value from a deque is atomic, so only the refill
+        needs the lock.
+
+        Args:
+            values (deque): The queue of values
+            fill (Callable): Function returning a list of new values
+
+        Returns:
+            object: The value
+        """
+        while True:
+            try:
+                return values.popleft()
+            except IndexError:
+                with self._lock:
+                    if not values:
+                        values.extend(fill())
+
+    def _fill_nonces(self) -> list:
+        data = os.urandom(self.buffer_size)
+        return [
+            data[i : i + NONCE_LENGTH]
+            for i in range(0, len(data) - NONCE_LENGTH + 1, NONCE_LENGTH)
+        ]
+
+    def _fill_serials(self) -> list:
+        count = self.buffer_size // 8
+        return list(unpack(f">{count}Q", os.urandom(count * 8)))
+
+    def _fill_keyids(self) -> list:
+        data = bytearray(os.urandom(self.buffer_size // 16 * 16))
+        data[6::16] = data[6::16].translate(UUID_VERSION)
+        data[8::16] = data[8::16].translate(UUID_VARIANT)
+
+        data = data.hex()
+        return [
+            f"{data[i:i + 8]}-{data[i + 8:i + 12]}-{data[i + 12:i + 16]}"
+            + f"-{data[i + 16:i + 20]}-{data[i + 20:i + 32]}"
+            for i in range(0, len(data), 32)
+        ]
+
+    def random_bytes(self, length: int) -> bytes:
+        """
+        Gets secure random bytes
+
+        Args:
+            length (int): The number of bytes
+
+        Returns:
+            bytes: The random bytes
+        """
+        with self._lock:
+            offset = self._offset
+            end = offset + length
+            if end > len(self._buffer):
+                self._buffer = os.urandom(max(self.buffer_size, length))
+                offset, end = 0, length
+
+            self._offset = end
+            return self._buffer[offset:end]
+
+    def random_nonce(self, length: int = NONCE_LENGTH) -> bytes:
+        """
+        Gets a random nonce for a certificate
+
+        Args:
+            length (int, optional): The length of the nonce in bytes. Defaults to 32.
+
+        Returns:
+            bytes: The nonce
+        """
+        if length != NONCE_LENGTH:
+            return self.random_bytes(length)
+
+        return self._draw(self._nonces, self._fill_nonces)
+
+    def random_serial(self) -> int:
+        """
+        Gets a random 64-bit serial number
+
+        Returns:
+            int: The serial
+        """
+        return self._draw(self._serials, self._fill_serials)
+
+    def random_keyid(self) -> str:
+        """
+        Gets a random key ID, formatted as a random (version 4) UUID
+
+        Returns:
+            str: The key ID
+        """
+        return self._draw(self._keyids, self._fill_keyids)
+
+
+POOL = EntropyPool()
+
+# Functions drawing from the shared pool
+random_bytes = POOL.random_bytes
+random_nonce = POOL.random_nonce
+random_serial = POOL.random_serial
+random_keyid = POOL.random_keyid
@@ -113,3 +113,10 @@ class DeprecatedClassCalled(ValueError):
     """
     Raised when trying to instantiate a deprecated class
     """
+
+
+class UntrustedCAException(InvalidSignatureException):
+    """
+    Raised when a certificate is not signed by a trusted CA,
+    or the CA is not trusted for the certificate
+    """
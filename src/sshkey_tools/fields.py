@@ -3,11 +3,12 @@ Field types for SSH Certificates
 """
 
 # pylint: disable=invalid-name,too-many-lines,arguments-differ
+import hashlib
 import re
-from base64 import b64encode
 from datetime import datetime, timedelta
 from enum import Enum
-from struct import pack, unpack
+from functools import lru_cache
+from itertools import count
 from typing import Tuple, Union
 
 from cryptography.hazmat.primitives.asymmetric.utils import (
@@ -16,7 +17,9 @@ from cryptography.hazmat.primitives.asymmetric.utils import (
 )
 
 from . import exceptions as _EX
+from .entropy import random_keyid, random_nonce, random_serial
 from .keys import (
+    ECDSA_HASHES,
     EcdsaPrivateKey,
     EcdsaPublicKey,
     Ed25519PrivateKey,
@@ -28,16 +31,12 @@ from .keys import (
     RsaPublicKey,
 )
 from .utils import (
-    bytes_to_long,
-    concat_to_string,
     ensure_bytestring,
     ensure_string,
-    generate_secure_nonce,
     long_to_bytes,
-    random_keyid,
-    random_serial,
     str_to_time_delta,
 )
+from .wire import BufferTypes, DecodeCursor, EncodeBuffer
 
 NoneType = type(None)
 MAX_INT32 = 2**32
@@ -50,6 +49,11 @@ ECDSA_CURVE_MAP = {
     "secp521r1": "nistp521",
 }
 
+# Hash algorithms of the ECDSA signature types
+ECDSA_SIGNATURE_HASHES = {
+    f"ecdsa-sha2-{curve}": ECDSA_HASHES[name] for name, curve in ECDSA_CURVE_MAP.items()
+}
+
 SUBJECT_PUBKEY_MAP = {
     RsaPublicKey: "RsaPubkeyField",
     EcdsaPublicKey: "EcdsaPubkeyField",
@@ -62,12 +66,28 @@ CA_SIGNATURE_MAP = {
     Ed25519PrivateKey: "Ed25519SignatureField",
 }
 
+# Signature fields for private keys held elsewhere, e.g. in an ssh-agent,
+# by the type of their public key
+CA_PUBKEY_SIGNATURE_MAP = {
+    RsaPublicKey: "RsaSignatureField",
+    EcdsaPublicKey: "EcdsaSignatureField",
+    Ed25519PublicKey: "Ed25519SignatureField",
+}
+
 SIGNATURE_TYPE_MAP = {
     b"rsa": "RsaSignatureField",
     b"ecdsa": "EcdsaSignatureField",
     b"ed25519": "Ed25519SignatureField",
 }
 
+# Signature field classes by the full signature type, filled on first use
+SIGNATURE_CLASSES = {}
+
+
+# Every change to a field or fieldset is stamped with a new number from
+# this counter, so cached encodings can tell if anything changed since
+REVISIONS = count(1)
+
 
 class CERT_TYPE(Enum):
     """
@@ -78,6 +98,7 @@ class CERT_TYPE(Enum):
     HOST = 2
 
 
+# pylint: disable=too-many-instance-attributes
 class CertificateField:
     """
     The base class for certificate fields
@@ -88,6 +109,25 @@ class CertificateField:
     REQUIRED = False
     DATA_TYPE = NoneType
 
+    # Keep the validation result until the value is set again
+    KEEP_VALIDATION = True
+
+    # Encoded field data that has not been decoded yet (lazy decoding)
+    _raw = None
+    _value = None
+
+    # Stamp of the last change to the value
+    _revision = 0
+
+    # Encoding and validation result of the current value,
+    # kept until the value is set again or changed in place
+    _encoded = None
+    _valid = None
+
+    # Contents of a list, dict or set value when it was last encoded,
+    # validated or decoded, to notice changes in place
+    _snapshot = None
+
     def __init__(self, value=None):
         self.value = value
         self.exception = None
@@ -101,9 +141,104 @@ class CertificateField:
         return f"{self.name}: {self.value}"
 
     def __bytes__(self) -> bytes:
+        if self._raw is not None:
+            return bytes(self._raw)
+
         return self.encode(self.value)
 
+    def __copy__(self) -> "CertificateField":
+        field = self.__class__.__new__(self.__class__)
+        field.__dict__ = self.__dict__.copy()
+
+        # Immutable values are shared, mutable containers are copied
+        if isinstance(self._value, (list, dict, set)):
+            field._value = self._value.copy()
+
+        return field
+
+    @property
+    def value(self):
+        """
+        The value of the field. For lazily decoded fields, the value
+        is decoded from the encoded data on first access.
+        """
+        if self._raw is not None:
+            self._value = self.read_value(DecodeCursor(self._raw))
+            self._raw = None
+            self._snapshot = self._freeze(self._value)
+
+        return self._value
+
+    @value.setter
+    def value(self, value):
+        self._raw = None
+        self._value = value
+        self._encoded = None
+        self._valid = None
+        self._snapshot = None
+        self._revision = next(REVISIONS)
+
+    @property
+    def encoded(self) -> BufferTypes:
+        """
+        The encoded field. The value is encoded on first access, and the
+        encoding is reused until the value is set again. For lazily decoded
+        fields, this is the undecoded data.
+        """
+        if self._raw is not None:
+            return self._raw
+
+        self._check_in_place()
+        if self._encoded is None:
+            self._encoded = bytes(self)
+            self._snapshot = self._freeze(self._value)
+
+        return self._encoded
+
+    def invalidate(self) -> None:
+        """
+        Drops the kept encoding and validation result of the value.
+        Changes in place to list, dict and set values are noticed
+        without it.
+        """
+        self._encoded = None
+        self._valid = None
+        self._snapshot = None
+        self._revision = next(REVISIONS)
+
+    @property
+    def revision(self) -> int:
+        """
+        Stamp of the last change to the value, including changes in place.
+        Every change gets a new, unique stamp, also across fields and fieldsets.
+        """
+        self._check_in_place()
+        return self._revision
+
+    @staticmethod
+    def _freeze(value) -> Union[tuple, None]:
+        """
+        Copies the contents of a list, dict or set value, to compare
+        against later. Other values can only be replaced, not changed.
+        """
+        if isinstance(value, dict):
+            return tuple(value.items())
+
+        if isinstance(value, (list, set)):
+            return tuple(value)
+
+        return None
+
+    def _check_in_place(self) -> None:
+        """
+        Drops the kept encoding and validation result, and stamps a new
+        revision, when the value was changed in place since it was kept
+        """
+        if self._snapshot is not None and self._freeze(self._value) != self._snapshot:
+            self.invalidate()
+
     @classmethod
+    @lru_cache(maxsize=128)
     def get_name(cls) -> str:
         """
         Fetch the name of the field (identifier format)
@@ -151,8 +286,13 @@ class CertificateField:
     # pylint: disable=not-callable
     def validate(self) -> bool:
         """
-        Validates all field contents and types
+        Validates all field contents and types. The result is kept
+        until the value is set again, unless KEEP_VALIDATION is False.
         """
+        self._check_in_place()
+        if self._valid is not None:
+            return self._valid
+
         if isinstance(self.value, NoneType) and self.DEFAULT is not None:
             self.value = self.DEFAULT() if callable(self.DEFAULT) else self.DEFAULT
 
@@ -162,30 +302,129 @@ class CertificateField:
             self.__validate_value__(),
         )
 
-        return self.exception == (True, True, True)
+        valid = self.exception == (True, True, True)
+        if self.KEEP_VALIDATION:
+            self._valid = valid
+            self._snapshot = self._freeze(self._value)
 
-    @staticmethod
-    def decode(data: bytes) -> tuple:
+        return valid
+
+    @classmethod
+    def read(cls, cursor: DecodeCursor):
+        """
+        Reads the value of the field from a cursor, advancing it
+        past the field
+        """
+
+    @classmethod
+    def read_value(cls, cursor: DecodeCursor):
+        """
+        Reads the value as stored in the field from a cursor.
+        Differs from read() for fields that decode to more than one value.
+        """
+        return cls.read(cursor)
+
+    @classmethod
+    def skip(cls, cursor: DecodeCursor) -> None:
+        """
+        Advances the cursor past the field without decoding it
+        """
+        cls.read(cursor)
+
+    @classmethod
+    def decode(cls, data: BufferTypes, *args, **kwargs) -> tuple:
         """
         Returns the decoded value of the field
+
+        Args:
+            data (bytes): The byte string starting with the encoded field
+
+        Returns:
+            tuple: The decoded value and the remainder of the data
         """
+        cursor = DecodeCursor(data)
+        return cls.read(cursor, *args, **kwargs), cursor.remainder()
 
     @classmethod
-    def encode(cls, value) -> bytes:
+    def encode(cls, value, *args, **kwargs) -> bytes:
         """
         Returns the encoded value of the field
+
+        Args:
+            value: The value to encode
+            *args, **kwargs: Additional arguments for the write method
+                             of the field class
+
+        Returns:
+            bytes: The encoded value
+        """
+        buffer = EncodeBuffer()
+        cls.write(buffer, value, *args, **kwargs)
+        return buffer.getvalue()
+
+    @classmethod
+    def write(cls, buffer: EncodeBuffer, value) -> None:
+        """
+        Writes the encoded value of the field to a buffer
+
+        Args:
+            buffer (EncodeBuffer): The buffer to write to
+            value: The value to encode
+        """
+
+    def write_to(self, buffer: EncodeBuffer) -> None:
         """
+        Writes the encoded field to a buffer. Fields that have not changed
+        since they were last encoded are written from the kept encoding,
+        and lazily decoded fields from the encoded data without decoding them.
+
+        Args:
+            buffer (EncodeBuffer): The buffer to write to
+        """
+        buffer.write(self.encoded)
 
     @classmethod
-    def from_decode(cls, data: bytes) -> Tuple["CertificateField", bytes]:
+    def from_cursor(cls, cursor: DecodeCursor) -> "CertificateField":
+        """
+        Creates a field class from the data at the position of the cursor
+
+        Args:
+            cursor (DecodeCursor): The cursor to read the field from
+
+        Returns:
+            CertificateField: The decoded field
+        """
+        return cls(cls.read(cursor))
+
+    @classmethod
+    def from_decode(cls, data: BufferTypes) -> Tuple["CertificateField", bytes]:
         """
         Creates a field class based on encoded bytes
 
         Returns:
             tuple: CertificateField, remaining bytes
         """
-        value, data = cls.decode(data)
-        return cls(value), data
+        cursor = DecodeCursor(data)
+        return cls.from_cursor(cursor), cursor.remainder()
+
+    @classmethod
+    def from_lazy(cls, cursor: DecodeCursor) -> "CertificateField":
+        """
+        Creates a field class that keeps a reference to the encoded data at
+        the position of the cursor, and decodes the value on first access
+
+        Args:
+            cursor (DecodeCursor): The cursor to read the field from
+
+        Returns:
+            CertificateField: The field, with the value not yet decoded
+        """
+        start = cursor.offset
+        cls.skip(cursor)
+
+        field = cls()
+        field._raw = cursor.buffer[start : cursor.offset]
+        return field
 
     @classmethod
     # pylint: disable=not-callable
@@ -216,28 +455,30 @@ class BooleanField(CertificateField):
     DATA_TYPE = (bool, int)
 
     @classmethod
-    def encode(cls, value: Union[int, bool]) -> bytes:
+    def write(cls, buffer: EncodeBuffer, value: Union[int, bool]) -> None:
         """
-        Encodes a boolean value to a byte string
+        Writes an encoded boolean value to a buffer
 
         Args:
+            buffer (EncodeBuffer): The buffer to write to
             value (bool): Boolean to encode
-
-        Returns:
-            bytes: Packed byte representing the boolean
         """
         cls.__validate_type__(value, True)
-        return pack("B", 1 if value else 0)
+        buffer.write_uint8(1 if value else 0)
 
-    @staticmethod
-    def decode(data: bytes) -> Tuple[bool, bytes]:
+    @classmethod
+    def read(cls, cursor: DecodeCursor) -> bool:
         """
-        Decodes a boolean from a bytestring
+        Reads a boolean from a cursor
 
         Args:
-            data (bytes): The byte string starting with an encoded boolean
+            cursor (DecodeCursor): The cursor positioned at an encoded boolean
         """
-        return bool(unpack("B", data[:1])[0]), data[1:]
+        return bool(cursor.read_uint8())
+
+    @classmethod
+    def skip(cls, cursor: DecodeCursor) -> None:
+        cursor.skip(1)
 
     def __validate_value__(self) -> Union[bool, Exception]:
         """
@@ -261,39 +502,42 @@ class BytestringField(CertificateField):
     DEFAULT = b""
 
     @classmethod
-    def encode(cls, value: bytes, encoding: str = "utf-8") -> bytes:
+    def write(cls, buffer: EncodeBuffer, value: bytes, encoding: str = "utf-8") -> None:
         """
-        Encodes a string or bytestring into a packed byte string
+        Writes a string or bytestring as a length-prefixed string to a buffer
 
         Args:
+            buffer (EncodeBuffer): The buffer to write to
             value (Union[str, bytes]): The string/bytestring to encode
             encoding (str): The optional encoding, not used when passing
                             a byte value.
-
-        Returns:
-            bytes: Packed byte string containing the source data
         """
         cls.__validate_type__(value, True)
-        return pack(">I", len(value)) + ensure_bytestring(value, encoding)
+        buffer.write_string(ensure_bytestring(value, encoding))
 
-    @staticmethod
-    def decode(data: bytes, encoding: str = None) -> Tuple[bytes, bytes]:
+    @classmethod
+    def read(cls, cursor: DecodeCursor, encoding: str = None) -> bytes:
         """
-        Unpacks the next string from a packed byte string
+        Reads the next string from a cursor
 
         Args:
-            data (bytes): The packed byte string to unpack
+            cursor (DecodeCursor): The cursor positioned at a packed string
+            encoding (str): Decode the bytes to a string with this
+                            encoding. Defaults to None (bytes).
 
         Returns:
-            tuple(bytes, bytes):  The next block of bytes from the packed byte
-                                  string and remainder of the data
+            bytes: The next block of bytes from the cursor
         """
-        length = unpack(">I", data[:4])[0] + 4
+        value = cursor.read_string()
 
         if encoding is not None:
-            return ensure_string(data[4:length], encoding), data[length:]
+            return str(value, encoding)
 
-        return ensure_bytestring(data[4:length]), data[length:]
+        return bytes(value)
+
+    @classmethod
+    def skip(cls, cursor: DecodeCursor) -> None:
+        cursor.skip_string()
 
 
 class StringField(BytestringField):
@@ -305,32 +549,30 @@ class StringField(BytestringField):
     DEFAULT = ""
 
     @classmethod
-    def encode(cls, value: str, encoding: str = "utf-8"):
+    def write(cls, buffer: EncodeBuffer, value: str, encoding: str = "utf-8") -> None:
         """
-        Encodes a string or bytestring into a packed byte string
+        Writes a string or bytestring as a length-prefixed string to a buffer
 
         Args:
+            buffer (EncodeBuffer): The buffer to write to
             value (Union[str, bytes]): The string/bytestring to encode
             encoding (str): The encoding to user for the string
-
-        Returns:
-            bytes: Packed byte string containing the source data
         """
-        return super().encode(value, encoding)
+        super().write(buffer, value, encoding)
 
-    @staticmethod
-    def decode(data: bytes, encoding: str = "utf-8") -> Tuple[str, bytes]:
+    @classmethod
+    def read(cls, cursor: DecodeCursor, encoding: str = "utf-8") -> str:
         """
-        Unpacks the next string from a packed byte string
+        Reads the next string from a cursor
 
         Args:
-            data (bytes): The packed byte string to unpack
+            cursor (DecodeCursor): The cursor positioned at a packed string
+            encoding (str): The encoding of the string
 
         Returns:
-            tuple(bytes, bytes):  The next block of bytes from the packed byte
-                                  string and remainder of the data
+            str: The next string from the cursor
         """
-        return BytestringField.decode(data, encoding)
+        return BytestringField.read(cursor, encoding)
 
 
 class Integer32Field(CertificateField):
@@ -342,29 +584,31 @@ class Integer32Field(CertificateField):
     DEFAULT = 0
 
     @classmethod
-    def encode(cls, value: int) -> bytes:
-        """Encodes a 32-bit integer value to a packed byte string
+    def write(cls, buffer: EncodeBuffer, value: int) -> None:
+        """Writes a packed 32-bit integer value to a buffer
 
         Args:
-            source_int (int): Integer to be packed
-
-        Returns:
-            bytes: Packed byte string containing integer
+            buffer (EncodeBuffer): The buffer to write to
+            value (int): Integer to be packed
         """
         cls.__validate_type__(value, True)
-        return pack(">I", value)
+        buffer.write_uint32(value)
 
-    @staticmethod
-    def decode(data: bytes) -> Tuple[int, bytes]:
-        """Decodes a 32-bit integer from a block of bytes
+    @classmethod
+    def read(cls, cursor: DecodeCursor) -> int:
+        """Reads a 32-bit integer from a cursor
 
         Args:
-            data (bytes): Block of bytes containing an integer
+            cursor (DecodeCursor): Cursor positioned at an integer
 
         Returns:
-            tuple: Tuple with integer and remainder of data
+            int: The integer
         """
-        return int(unpack(">I", data[:4])[0]), data[4:]
+        return cursor.read_uint32()
+
+    @classmethod
+    def skip(cls, cursor: DecodeCursor) -> None:
+        cursor.skip(4)
 
     def __validate_value__(self) -> Union[bool, Exception]:
         """
@@ -392,29 +636,31 @@ class Integer64Field(CertificateField):
     DEFAULT = 0
 
     @classmethod
-    def encode(cls, value: int) -> bytes:
-        """Encodes a 64-bit integer value to a packed byte string
+    def write(cls, buffer: EncodeBuffer, value: int) -> None:
+        """Writes a packed 64-bit integer value to a buffer
 
         Args:
-            source_int (int): Integer to be packed
-
-        Returns:
-            bytes: Packed byte string containing integer
+            buffer (EncodeBuffer): The buffer to write to
+            value (int): Integer to be packed
         """
         cls.__validate_type__(value, True)
-        return pack(">Q", value)
+        buffer.write_uint64(value)
 
-    @staticmethod
-    def decode(data: bytes) -> Tuple[int, bytes]:
-        """Decodes a 64-bit integer from a block of bytes
+    @classmethod
+    def read(cls, cursor: DecodeCursor) -> int:
+        """Reads a 64-bit integer from a cursor
 
         Args:
-            data (bytes): Block of bytes containing an integer
+            cursor (DecodeCursor): Cursor positioned at an integer
 
         Returns:
-            tuple: Tuple with integer and remainder of data
+            int: The integer
         """
-        return int(unpack(">Q", data[:8])[0]), data[8:]
+        return cursor.read_uint64()
+
+    @classmethod
+    def skip(cls, cursor: DecodeCursor) -> None:
+        cursor.skip(8)
 
     def __validate_value__(self) -> Union[bool, Exception]:
         """
@@ -442,9 +688,12 @@ class DateTimeField(Integer64Field):
     DATA_TYPE = (datetime, int, str)
     DEFAULT = datetime.now
 
+    # Relative times and the valid_before check depend on the current time
+    KEEP_VALIDATION = False
+
     @classmethod
-    def encode(cls, value: Union[datetime, int, str]) -> bytes:
-        """Encodes a datetime object, integer or time string to a byte string
+    def write(cls, buffer: EncodeBuffer, value: Union[datetime, int, str]) -> None:
+        """Writes a datetime object, integer or time string to a buffer
            Time strings are parsed with pytimeparse2, for example:
             32m
             2h32m
@@ -457,21 +706,33 @@ class DateTimeField(Integer64Field):
             4:13:02.266
             forever (Returns as MAX_INT64)
 
+           datetime.max, as certificates valid forever are decoded,
+           is written as forever as well.
+
         Args:
+            buffer (EncodeBuffer): The buffer to write to
             value (datetime, int, str): Datetime object
-
-        Returns:
-            bytes: Packed byte string containing datetime timestamp
         """
         cls.__validate_type__(value, True)
 
         if isinstance(value, str):
             value = cls.parse_string_value(value)
 
+        if value == datetime.max:
+            value = MAX_INT64 - 1
+
         if isinstance(value, datetime):
             value = int(value.timestamp())
 
-        return Integer64Field.encode(value)
+        Integer64Field.write(buffer, value)
+
+    @property
+    def encoded(self) -> BufferTypes:
+        # Relative times, e.g. 1w, depend on the time they are encoded at
+        if self._raw is None and isinstance(self._value, str):
+            return bytes(self)
+
+        return super().encoded
 
     @staticmethod
     def parse_string_value(value: str) -> int:
@@ -492,18 +753,29 @@ class DateTimeField(Integer64Field):
 
         return int((datetime.now() + str_to_time_delta(value)).timestamp())
 
-    @staticmethod
-    def decode(data: bytes) -> datetime:
-        """Decodes a datetime object from a block of bytes
+    @classmethod
+    def read(cls, cursor: DecodeCursor) -> datetime:
+        """Reads a datetime object from a cursor
 
         Args:
-            data (bytes): Block of bytes containing a datetime object
+            cursor (DecodeCursor): Cursor positioned at a timestamp
+
+        Raises:
+            _EX.InvalidDataException: The timestamp is out of range for datetime
 
         Returns:
-            tuple: Tuple with datetime and remainder of data
+            datetime: The decoded datetime, datetime.max for forever
         """
-        timestamp, data = Integer64Field.decode(data)
-        return datetime.fromtimestamp(timestamp), data
+        timestamp = cursor.read_uint64()
+        if timestamp == MAX_INT64 - 1:
+            return datetime.max
+
+        try:
+            return datetime.fromtimestamp(timestamp)
+        except (OverflowError, OSError, ValueError) as ex:
+            raise _EX.InvalidDataException(
+                f"The timestamp {timestamp} is out of range"
+            ) from ex
 
     def __validate_value__(self) -> Union[bool, Exception]:
         """
@@ -539,32 +811,29 @@ class MpIntegerField(BytestringField):
     DEFAULT = 0
 
     @classmethod
-    def encode(cls, value: int) -> bytes:
+    def write(cls, buffer: EncodeBuffer, value: int) -> None:
         """
-        Encodes a multiprecision integer (integer larger than 64bit)
-        into a packed byte string
+        Writes a multiprecision integer (integer larger than 64bit)
+        to a buffer
 
         Args:
+            buffer (EncodeBuffer): The buffer to write to
             value (int): Large integer
-
-        Returns:
-            bytes: Packed byte string containing integer
         """
         cls.__validate_type__(value, True)
-        return BytestringField.encode(long_to_bytes(value))
+        buffer.write_string(long_to_bytes(value))
 
-    @staticmethod
-    def decode(data: bytes) -> Tuple[int, bytes]:
-        """Decodes a multiprecision integer (integer larger than 64bit)
+    @classmethod
+    def read(cls, cursor: DecodeCursor) -> int:
+        """Reads a multiprecision integer (integer larger than 64bit)
 
         Args:
-            data (bytes): Block of bytes containing a long (mp) integer
+            cursor (DecodeCursor): Cursor positioned at a long (mp) integer
 
         Returns:
-            tuple: Tuple with integer and remainder of data
+            int: The integer
         """
-        mpint, data = BytestringField.decode(data)
-        return bytes_to_long(mpint), data
+        return int.from_bytes(cursor.read_string(), "big")
 
 
 class ListField(CertificateField):
@@ -576,15 +845,12 @@ class ListField(CertificateField):
     DEFAULT = []
 
     @classmethod
-    def encode(cls, value: Union[list, tuple, set]) -> bytes:
-        """Encodes a list or tuple to a byte string
+    def write(cls, buffer: EncodeBuffer, value: Union[list, tuple, set]) -> None:
+        """Writes a list or tuple of strings to a buffer
 
         Args:
-            source_list (list): list of strings
-            null_separator (bool, optional): Insert blank string string between items. Default None
-
-        Returns:
-            bytes: Packed byte string containing the source data
+            buffer (EncodeBuffer): The buffer to write to
+            value (list): list of strings
         """
         cls.__validate_type__(value, True)
 
@@ -596,25 +862,31 @@ class ListField(CertificateField):
                 "Expected list or tuple containing strings or bytes"
             ) from TypeError
 
-        return BytestringField.encode(b"".join([StringField.encode(x) for x in value]))
+        start = buffer.begin_string()
+        for item in value:
+            buffer.write_string(ensure_bytestring(item))
+        buffer.end_string(start)
 
-    @staticmethod
-    def decode(data: bytes) -> Tuple[list, bytes]:
-        """Decodes a list of strings from a block of bytes
+    @classmethod
+    def read(cls, cursor: DecodeCursor) -> list:
+        """Reads a list of strings from a cursor
 
         Args:
-            data (bytes): The block of bytes containing a list of strings
+            cursor (DecodeCursor): Cursor positioned at a list of strings
         Returns:
-            tuple: _description_
+            list: The decoded strings
         """
-        list_bytes, data = BytestringField.decode(data)
+        list_cursor = cursor.read_cursor()
 
         decoded = []
-        while len(list_bytes) > 0:
-            elem, list_bytes = StringField.decode(list_bytes)
-            decoded.append(elem)
+        while not list_cursor.at_end():
+            decoded.append(StringField.read(list_cursor))
+
+        return decoded
 
-        return ensure_string(decoded), data
+    @classmethod
+    def skip(cls, cursor: DecodeCursor) -> None:
+        cursor.skip_string()
 
     def __validate_value__(self) -> Union[bool, Exception]:
         """
@@ -644,67 +916,61 @@ class KeyValueField(CertificateField):
     DEFAULT = {}
 
     @classmethod
-    def encode(cls, value: Union[list, tuple, dict, set]) -> bytes:
+    def write(cls, buffer: EncodeBuffer, value: Union[list, tuple, dict, set]) -> None:
         """
-        Encodes a dict, set, list or tuple into a key-value byte string.
+        Writes a dict, set, list or tuple as a key-value list to a buffer.
         If a set, list or tuple is provided, the items are considered keys
         and added with empty values.
 
         Args:
-            source_list (dict, set, list, tuple): list of strings
-
-        Returns:
-            bytes: Packed byte string containing the source data
+            buffer (EncodeBuffer): The buffer to write to
+            value (dict, set, list, tuple): list of strings
         """
         cls.__validate_type__(value, True)
 
         if not isinstance(value, dict):
             value = {item: "" for item in value}
 
-        list_data = b""
-
+        start = buffer.begin_string()
         for key, item in value.items():
-            list_data += StringField.encode(key)
+            StringField.write(buffer, key)
 
-            item = (
-                StringField.encode("")
-                if item in ["", b""]
-                else ListField.encode(
-                    [item] if isinstance(item, (str, bytes)) else item
+            if item in ("", b""):
+                StringField.write(buffer, "")
+            else:
+                ListField.write(
+                    buffer, [item] if isinstance(item, (str, bytes)) else item
                 )
-            )
 
-            list_data += item
+        buffer.end_string(start)
 
-        return BytestringField.encode(list_data)
-
-    @staticmethod
-    def decode(data: bytes) -> Tuple[dict, bytes]:
-        """Decodes a list of strings from a block of bytes
+    @classmethod
+    def read(cls, cursor: DecodeCursor) -> Union[dict, list]:
+        """Reads a list or dict of key-value pairs from a cursor
 
         Args:
-            data (bytes): The block of bytes containing a list of strings
+            cursor (DecodeCursor): Cursor positioned at the key-value list
         Returns:
-            tuple: _description_
+            Union[dict, list]: Dict with the key-value pairs, or a list
+                               of keys if no values are set
         """
-        list_bytes, data = BytestringField.decode(data)
+        list_cursor = cursor.read_cursor()
 
         decoded = {}
-        while len(list_bytes) > 0:
-            key, list_bytes = StringField.decode(list_bytes)
-            value, list_bytes = BytestringField.decode(list_bytes)
-
-            if value != b"":
-                value = StringField.decode(value)[0]
-
-            decoded[key] = value
+        while not list_cursor.at_end():
+            key = StringField.read(list_cursor)
+            value = list_cursor.read_cursor()
 
-        decoded = ensure_string(decoded)
+            decoded[key] = StringField.read(value) if not value.at_end() else ""
 
         if "".join(decoded.values()) == "":
-            return list(decoded.keys()), data
+            return list(decoded.keys())
 
-        return decoded, data
+        return decoded
+
+    @classmethod
+    def skip(cls, cursor: DecodeCursor) -> None:
+        cursor.skip_string()
 
     def __validate_value__(self) -> Union[bool, Exception]:
         """
@@ -772,10 +1038,10 @@ class NonceField(BytestringField):
     """
     Contains the nonce for the certificate, randomly generated
     this protects the integrity of the private key, especially
-    for ecdsa.
+    for ecdsa. Defaults to 32 random bytes from the entropy pool.
     """
 
-    DEFAULT = generate_secure_nonce
+    DEFAULT = random_nonce
     DATA_TYPE = (str, bytes)
 
     def __validate_value__(self) -> Union[bool, Exception]:
@@ -816,18 +1082,19 @@ class PublicKeyField(CertificateField):
         )
 
     @classmethod
-    def encode(cls, value: PublicKey) -> bytes:
+    def write(cls, buffer: EncodeBuffer, value: PublicKey) -> None:
         """
-        Encode the certificate field to a byte string
+        Writes the public key to a buffer, without the key type
 
         Args:
+            buffer (EncodeBuffer): The buffer to write to
             value (RsaPublicKey): The public key to encode
-
-        Returns:
-            bytes: A byte string with the encoded public key
         """
         cls.__validate_type__(value, True)
-        return BytestringField.decode(value.raw_bytes())[1]
+
+        cursor = DecodeCursor(value.raw_bytes())
+        cursor.skip_string()
+        buffer.write(cursor.buffer[cursor.offset :])
 
     @staticmethod
     def from_object(public_key: PublicKey):
@@ -860,22 +1127,24 @@ class RsaPubkeyField(PublicKeyField):
     DEFAULT = None
     DATA_TYPE = RsaPublicKey
 
-    @staticmethod
-    def decode(data: bytes) -> Tuple[RsaPublicKey, bytes]:
+    @classmethod
+    def read(cls, cursor: DecodeCursor) -> RsaPublicKey:
         """
-        Decode the certificate field from a byte string
-        starting with the encoded public key
+        Read the public key from a cursor positioned
+        at the encoded public key
 
         Args:
-            data (bytes): The byte string starting with the encoded key
+            cursor (DecodeCursor): The cursor positioned at the encoded key
 
         Returns:
-            Tuple[RsaPublicKey, bytes]: The PublicKey field and remainder of the data
+            RsaPublicKey: The public key
         """
-        e, data = MpIntegerField.decode(data)
-        n, data = MpIntegerField.decode(data)
+        return RsaPublicKey.from_wire(cursor)
 
-        return RsaPublicKey.from_numbers(e=e, n=n), data
+    @classmethod
+    def skip(cls, cursor: DecodeCursor) -> None:
+        cursor.skip_string()
+        cursor.skip_string()
 
 
 class DsaPubkeyField(PublicKeyField):
@@ -883,17 +1152,14 @@ class DsaPubkeyField(PublicKeyField):
     Holds the DSA Public Key for DSA Certificates
     """
 
-    @staticmethod
-    def decode(data: bytes):
+    @classmethod
+    def read(cls, cursor: DecodeCursor):
         """
-        Decode the certificate field from a byte string
-        starting with the encoded public key
+        Read the public key from a cursor positioned
+        at the encoded public key
 
         Args:
-            data (bytes): The byte string starting with the encoded key
-
-        Returns:
-            Tuple[RsaPublicKey, bytes]: The PublicKey field and remainder of the data
+            cursor (DecodeCursor): The cursor positioned at the encoded key
         """
         raise _EX.DeprecatedClassCalled("DSA is deprecated, use RSA or ECDSA instead")
 
@@ -906,35 +1172,24 @@ class EcdsaPubkeyField(PublicKeyField):
     DEFAULT = None
     DATA_TYPE = EcdsaPublicKey
 
-    @staticmethod
-    def decode(data: bytes) -> Tuple[EcdsaPublicKey, bytes]:
+    @classmethod
+    def read(cls, cursor: DecodeCursor) -> EcdsaPublicKey:
         """
-        Decode the certificate field from a byte string
-        starting with the encoded public key
+        Read the public key from a cursor positioned
+        at the encoded public key
 
         Args:
-            data (bytes): The byte string starting with the encoded key
+            cursor (DecodeCursor): The cursor positioned at the encoded key
 
         Returns:
-            Tuple[ECPublicKey, bytes]: The PublicKey field and remainder of the data
+            EcdsaPublicKey: The public key
         """
-        curve, data = StringField.decode(data)
-        key, data = BytestringField.decode(data)
-
-        key_type = "ecdsa-sha2-" + curve
+        return EcdsaPublicKey.from_wire(cursor)
 
-        return (
-            EcdsaPublicKey.from_string(
-                key_type
-                + " "
-                + b64encode(
-                    StringField.encode(key_type)
-                    + StringField.encode(curve)
-                    + BytestringField.encode(key)
-                ).decode("utf-8")
-            ),
-            data,
-        )
+    @classmethod
+    def skip(cls, cursor: DecodeCursor) -> None:
+        cursor.skip_string()
+        cursor.skip_string()
 
 
 class Ed25519PubkeyField(PublicKeyField):
@@ -945,21 +1200,23 @@ class Ed25519PubkeyField(PublicKeyField):
     DEFAULT = None
     DATA_TYPE = Ed25519PublicKey
 
-    @staticmethod
-    def decode(data: bytes) -> Tuple[Ed25519PublicKey, bytes]:
+    @classmethod
+    def read(cls, cursor: DecodeCursor) -> Ed25519PublicKey:
         """
-        Decode the certificate field from a byte string
-        starting with the encoded public key
+        Read the public key from a cursor positioned
+        at the encoded public key
 
         Args:
-            data (bytes): The byte string starting with the encoded key
+            cursor (DecodeCursor): The cursor positioned at the encoded key
 
         Returns:
-            Tuple[Ed25519PublicKey, bytes]: The PublicKey field and remainder of the data
+            Ed25519PublicKey: The public key
         """
-        pubkey, data = BytestringField.decode(data)
+        return Ed25519PublicKey.from_wire(cursor)
 
-        return Ed25519PublicKey.from_raw_bytes(pubkey), data
+    @classmethod
+    def skip(cls, cursor: DecodeCursor) -> None:
+        cursor.skip_string()
 
 
 class SerialField(Integer64Field):
@@ -984,22 +1241,20 @@ class CertificateTypeField(Integer32Field):
     ALLOWED_VALUES = (CERT_TYPE.USER, CERT_TYPE.HOST, 1, 2)
 
     @classmethod
-    def encode(cls, value: Union[CERT_TYPE, int]) -> bytes:
+    def write(cls, buffer: EncodeBuffer, value: Union[CERT_TYPE, int]) -> None:
         """
-        Encode the certificate type field to a byte string
+        Writes the certificate type to a buffer
 
         Args:
+            buffer (EncodeBuffer): The buffer to write to
             value (Union[CERT_TYPE, int]): The type of the certificate
-
-        Returns:
-            bytes: A byte string with the encoded public key
         """
         cls.__validate_type__(value, True)
 
         if isinstance(value, CERT_TYPE):
             value = value.value
 
-        return Integer32Field.encode(value)
+        Integer32Field.write(buffer, value)
 
     def __validate_value__(self) -> Union[bool, Exception]:
         """
@@ -1229,6 +1484,9 @@ class CAPublicKeyField(BytestringField):
         )
 
     def __bytes__(self) -> bytes:
+        if self._raw is not None:
+            return bytes(self._raw)
+
         return self.encode(self.value.raw_bytes())
 
     def __table__(self) -> tuple:
@@ -1248,27 +1506,19 @@ class CAPublicKeyField(BytestringField):
 
         return True
 
-    @staticmethod
-    def decode(data: bytes) -> Tuple[PublicKey, bytes]:
+    @classmethod
+    def read(cls, cursor: DecodeCursor) -> PublicKey:
         """
-        Decode the certificate field from a byte string
-        starting with the encoded public key
+        Read the public key from a cursor positioned
+        at the encoded public key
 
         Args:
-            data (bytes): The byte string starting with the encoded key
+            cursor (DecodeCursor): The cursor positioned at the encoded key
 
         Returns:
-            Tuple[PublicKey, bytes]: The PublicKey field and remainder of the data
+            PublicKey: The public key
         """
-        pubkey, data = BytestringField.decode(data)
-        pubkey_type = StringField.decode(pubkey)[0]
-
-        return (
-            PublicKey.from_string(
-                concat_to_string(pubkey_type, " ", b64encode(pubkey))
-            ),
-            data,
-        )
+        return PublicKey.from_bytes(cursor.read_string())
 
     @classmethod
     def from_object(cls, public_key: PublicKey) -> "CAPublicKeyField":
@@ -1308,7 +1558,9 @@ class SignatureField(CertificateField):
     @staticmethod
     def from_object(private_key: PrivateKey):
         """
-        Load a private key from a PrivateKey object
+        Load a private key from a PrivateKey object. Keys held elsewhere,
+        e.g. an sshkey_tools.agent.AgentPrivateKey, get the signature field
+        for the type of their public key.
 
         Args:
             private_key (PrivateKey): Private key to use for signing
@@ -1320,21 +1572,73 @@ class SignatureField(CertificateField):
             SignatureField: SignatureField child class
         """
         try:
-            return globals()[CA_SIGNATURE_MAP[private_key.__class__]](
-                private_key=private_key
-            )
+            signature_class = CA_SIGNATURE_MAP.get(private_key.__class__)
+            if signature_class is None:
+                signature_class = CA_PUBKEY_SIGNATURE_MAP[
+                    getattr(private_key, "public_key", None).__class__
+                ]
+
+            return globals()[signature_class](private_key=private_key)
         except KeyError:
             raise _EX.InvalidKeyException(
                 "The private key provided is invalid or not supported"
             ) from KeyError
 
     @staticmethod
-    def from_decode(data: bytes) -> Tuple["SignatureField", bytes]:
+    def from_cursor(cursor: DecodeCursor) -> "SignatureField":
         """
         Generates a SignatureField child class from the encoded signature
 
         Args:
-            data (bytes): The bytestring containing the encoded signature
+            cursor (DecodeCursor): The cursor positioned at the encoded signature
+
+        Raises:
+            _EX.InvalidDataException: Invalid data
+
+        Returns:
+            SignatureField: child of SignatureField
+        """
+        return SignatureField.get_class(cursor).from_cursor(cursor)
+
+    @staticmethod
+    def get_class(cursor: DecodeCursor) -> type:
+        """
+        Gets the SignatureField child class for the encoded signature,
+        without advancing the cursor. The class is looked up once
+        per signature type.
+
+        Args:
+            cursor (DecodeCursor): The cursor positioned at the encoded signature
+
+        Raises:
+            _EX.InvalidDataException: Invalid data
+
+        Returns:
+            type: The SignatureField child class
+        """
+        signature_type = bytes(DecodeCursor(cursor.peek_string()).read_string())
+
+        signature_class = SIGNATURE_CLASSES.get(signature_type)
+        if signature_class is None:
+            for key, value in SIGNATURE_TYPE_MAP.items():
+                if key in signature_type:
+                    signature_class = globals()[value]
+                    SIGNATURE_CLASSES[signature_type] = signature_class
+                    break
+            else:
+                raise _EX.InvalidDataException("No matching signature type found")
+
+        return signature_class
+
+    @staticmethod
+    # pylint: disable=protected-access
+    def from_lazy(cursor: DecodeCursor) -> "SignatureField":
+        """
+        Generates a SignatureField child class from the encoded signature,
+        decoding the signature bytes on first access
+
+        Args:
+            cursor (DecodeCursor): The cursor positioned at the encoded signature
 
         Raises:
             _EX.InvalidDataException: Invalid data
@@ -1342,14 +1646,30 @@ class SignatureField(CertificateField):
         Returns:
             SignatureField: child of SignatureField
         """
-        signature, _ = BytestringField.decode(data)
-        signature_type = BytestringField.decode(signature)[0]
+        signature_class = SignatureField.get_class(cursor)
+        field = signature_class.from_signature_type(
+            StringField.read(DecodeCursor(cursor.peek_string()))
+        )
+        start = cursor.offset
+        cursor.skip_string()
 
-        for key, value in SIGNATURE_TYPE_MAP.items():
-            if key in signature_type:
-                return globals()[value].from_decode(data)
+        field.is_signed = True
+        field._raw = cursor.buffer[start : cursor.offset]
+        return field
 
-        raise _EX.InvalidDataException("No matching signature type found")
+    @classmethod
+    # pylint: disable=unused-argument
+    def from_signature_type(cls, signature_type: str) -> "SignatureField":
+        """
+        Creates an empty signature field for the given signature type
+
+        Args:
+            signature_type (str): The signature type, e.g. rsa-sha2-512
+
+        Returns:
+            SignatureField: The signature field without a signature
+        """
+        return cls()
 
     def can_sign(self):
         """
@@ -1358,13 +1678,101 @@ class SignatureField(CertificateField):
         """
         return self.private_key is not None
 
-    def sign(self, data: bytes, **kwargs) -> None:
+    def get_signer(self, signer=None):
+        """
+        Gets the object to sign with: the private key of the field,
+        or a signer holding the same key, e.g. a
+        sshkey_tools.signer.ProcessSigner
+
+        Args:
+            signer (optional): Signer with a public_key attribute and a sign method
+                               like the private key. Defaults to None.
+
+        Raises:
+            _EX.SignatureNotPossibleException: The signer has another key
+
+        Returns:
+            The private key or the signer
+        """
+        if signer is None:
+            return self.private_key
+
+        if signer.public_key != self.private_key.public_key:
+            raise _EX.SignatureNotPossibleException(
+                "The signer key does not match the CA private key"
+            )
+
+        return signer
+
+    # pylint: disable=unused-argument
+    def get_hash_algorithm(self, **kwargs) -> type:
+        """
+        Gets the hash algorithm the signature is created with
+
+        Args:
+            **kwargs: Arguments for the signature type, ex. hash_alg for RSA signatures
+
+        Returns:
+            type: The cryptography hash algorithm class, or None for signature
+                  types that sign the data without hashing it first
+        """
+        return None
+
+    def get_digest(self, data: bytes, **kwargs) -> bytes:
+        """
+        Hashes data with the hash algorithm of the signature. The digest
+        can be passed to create_signature or sign as digest, so the data
+        is not hashed again, and reused elsewhere, e.g. for audit records.
+
+        Args:
+            data (bytes): The data to hash
+            **kwargs: Arguments for the signature type, ex. hash_alg for RSA signatures
+
+        Returns:
+            bytes: The digest, or None for signature types that sign
+                   the data without hashing it first
+        """
+        # pylint: disable=assignment-from-none
+        algorithm = self.get_hash_algorithm(**kwargs)
+        if algorithm is None:
+            return None
+
+        return hashlib.new(algorithm.name, data).digest()
+
+    def create_signature(self, data: bytes, **kwargs) -> bytes:
         """
         Placeholder signing function
         """
         raise _EX.InvalidClassCallException("The base class has no sign function")
 
-    def __bytes__(self) -> None:
+    # pylint: disable=unused-argument
+    def attach(self, signature: bytes, **kwargs) -> None:
+        """
+        Sets a signature created with create_signature
+
+        Args:
+            signature (bytes): The signature bytes
+        """
+        self.value = signature
+        self.is_signed = True
+
+    def sign(self, data: bytes, **kwargs) -> None:
+        """
+        Signs the provided data with the provided private key
+
+        Args:
+            data (bytes): The data to be signed
+            **kwargs: Arguments for the signature type, ex. hash_alg for RSA
+                      signatures, signer to sign with a signer instead
+                      of the private key, or digest to sign the digest
+                      from get_digest instead of hashing the data
+        """
+        self.attach(self.create_signature(data, **kwargs), **kwargs)
+
+    def __bytes__(self) -> bytes:
+        if self._raw is not None:
+            return bytes(self._raw)
+
         return self.encode(self.value)
 
 
@@ -1387,69 +1795,87 @@ class RsaSignatureField(SignatureField):
 
     @classmethod
     # pylint: disable=arguments-renamed
-    def encode(cls, value: bytes, hash_alg: RsaAlgs = RsaAlgs.SHA512) -> bytes:
+    def write(
+        cls, buffer: EncodeBuffer, value: bytes, hash_alg: RsaAlgs = RsaAlgs.SHA512
+    ) -> None:
         """
-        Encodes the value to a byte string
+        Writes the encoded signature to a buffer
 
         Args:
-            signature (bytes): The signature bytes to encode
+            buffer (EncodeBuffer): The buffer to write to
+            value (bytes): The signature bytes to encode
             hash_alg (RsaAlgs, optional):  The hash algorithm used for the signature.
                                             Defaults to RsaAlgs.SHA256.
-
-        Returns:
-            bytes: The encoded byte string
         """
         cls.__validate_type__(value, True)
 
-        return BytestringField.encode(
-            StringField.encode(hash_alg.value[0]) + BytestringField.encode(value)
-        )
+        start = buffer.begin_string()
+        buffer.write_string(hash_alg.value[0].encode("utf-8"))
+        buffer.write_string(value)
+        buffer.end_string(start)
 
-    @staticmethod
-    def decode(data: bytes) -> Tuple[Tuple[bytes, bytes], bytes]:
+    @classmethod
+    def read(cls, cursor: DecodeCursor) -> Tuple[str, bytes]:
         """
-        Decodes a bytestring containing a signature
+        Reads a signature from a cursor
 
         Args:
-            data (bytes): The bytestring starting with the RSA Signature
+            cursor (DecodeCursor): The cursor positioned at the RSA Signature
 
         Returns:
-            Tuple[ Tuple[ bytes, bytes ], bytes ]: (signature_type, signature), remainder of data
+            Tuple[str, bytes]: (signature_type, signature)
         """
-        signature, data = BytestringField.decode(data)
+        signature = cursor.read_cursor()
 
-        sig_type, signature = StringField.decode(signature)
-        signature, _ = BytestringField.decode(signature)
+        sig_type = StringField.read(signature)
+        return sig_type, BytestringField.read(signature)
 
-        return (sig_type, signature), data
+    @classmethod
+    def read_value(cls, cursor: DecodeCursor) -> bytes:
+        return cls.read(cursor)[1]
 
     @classmethod
-    def from_decode(cls, data: bytes) -> Tuple["RsaSignatureField", bytes]:
+    def from_signature_type(cls, signature_type: str) -> "RsaSignatureField":
+        return cls(
+            private_key=None,
+            hash_alg=[alg for alg in RsaAlgs if alg.value[0] == signature_type][0],
+        )
+
+    @classmethod
+    def from_cursor(cls, cursor: DecodeCursor) -> "RsaSignatureField":
         """
         Generates an RsaSignatureField class from the encoded signature
 
         Args:
-            data (bytes): The bytestring containing the encoded signature
+            cursor (DecodeCursor): The cursor positioned at the encoded signature
 
         Raises:
             _EX.InvalidDataException: Invalid data
 
         Returns:
-            Tuple[RsaSignatureField, bytes]: RSA Signature field and remainder of data
+            RsaSignatureField: RSA Signature field
         """
-        signature, data = cls.decode(data)
+        signature = cls.read(cursor)
 
-        return (
-            cls(
-                private_key=None,
-                hash_alg=[alg for alg in RsaAlgs if alg.value[0] == signature[0]][0],
-                signature=signature[1],
-            ),
-            data,
+        return cls(
+            private_key=None,
+            hash_alg=[alg for alg in RsaAlgs if alg.value[0] == signature[0]][0],
+            signature=signature[1],
         )
 
     # pylint: disable=unused-argument
-    def sign(self, data: bytes, hash_alg: RsaAlgs = RsaAlgs.SHA512, **kwargs) -> None:
+    def get_hash_algorithm(self, hash_alg: RsaAlgs = RsaAlgs.SHA512, **kwargs) -> type:
+        return hash_alg.value[1]
+
+    # pylint: disable=unused-argument,too-many-arguments,too-many-positional-arguments
+    def create_signature(
+        self,
+        data: bytes,
+        hash_alg: RsaAlgs = RsaAlgs.SHA512,
+        signer=None,
+        digest: bytes = None,
+        **kwargs,
+    ) -> bytes:
         """
         Signs the provided data with the provided private key
 
@@ -1457,13 +1883,39 @@ class RsaSignatureField(SignatureField):
             data (bytes): The data to be signed
             hash_alg (RsaAlgs, optional): The RSA algorithm to use for hashing.
                                            Defaults to RsaAlgs.SHA256.
+            signer (optional): Signer to use instead of the private key,
+                               e.g. a sshkey_tools.signer.ProcessSigner.
+                               Defaults to None.
+            digest (bytes, optional): The digest of the data from get_digest,
+                                      to sign instead of hashing the data.
+                                      Defaults to None.
+
+        Returns:
+            bytes: The signature bytes
         """
-        self.value = self.private_key.sign(data, hash_alg)
+        if digest is not None:
+            return self.get_signer(signer).sign_digest(digest, hash_alg)
 
+        return self.get_signer(signer).sign(data, hash_alg)
+
+    def attach(
+        self, signature: bytes, hash_alg: RsaAlgs = RsaAlgs.SHA512, **kwargs
+    ) -> None:
+        """
+        Sets a signature created with create_signature
+
+        Args:
+            signature (bytes): The signature bytes
+            hash_alg (RsaAlgs, optional): The RSA algorithm used for hashing.
+                                           Defaults to RsaAlgs.SHA512.
+        """
+        super().attach(signature)
         self.hash_alg = hash_alg
-        self.is_signed = True
 
     def __bytes__(self):
+        if self._raw is not None:
+            return bytes(self._raw)
+
         return self.encode(self.value, self.hash_alg)
 
 
@@ -1479,24 +1931,22 @@ class DsaSignatureField(SignatureField):
         )
 
     @classmethod
-    def encode(cls, value=None):
+    def write(cls, buffer=None, value=None):
         """
-        Encodes the signature to a byte string
+        Writes the encoded signature to a buffer
 
         Args:
-            signature (bytes): The signature bytes to encode
-
-        Returns:
-            bytes: The encoded byte string
+            buffer (EncodeBuffer): The buffer to write to
+            value (bytes): The signature bytes to encode
         """
         cls()
 
-    @staticmethod
-    def decode(data=None):
-        DsaSignatureField()
+    @classmethod
+    def read(cls, cursor=None):
+        cls()
 
     @classmethod
-    def from_decode(cls, data=None):
+    def from_cursor(cls, cursor=None):
         cls()
 
 
@@ -1523,82 +1973,103 @@ class EcdsaSignatureField(SignatureField):
         self.curve = curve_name
 
     @classmethod
-    def encode(cls, value: bytes, curve_name: str = None) -> bytes:
+    def write(cls, buffer: EncodeBuffer, value: bytes, curve_name: str = None) -> None:
         """
-        Encodes the signature to a byte string
+        Writes the encoded signature to a buffer
 
         Args:
-            signature (bytes): The signature bytes to encode
+            buffer (EncodeBuffer): The buffer to write to
+            value (bytes): The signature bytes to encode
             curve_name (str): The name of the curve used for the signature
                               private key
-
-        Returns:
-            bytes: The encoded byte string
         """
         cls.__validate_type__(value, True)
 
         r, s = decode_dss_signature(value)
 
-        return BytestringField.encode(
-            StringField.encode(curve_name)
-            + BytestringField.encode(
-                MpIntegerField.encode(r) + MpIntegerField.encode(s)
-            )
-        )
+        start = buffer.begin_string()
+        StringField.write(buffer, curve_name)
+        signature_start = buffer.begin_string()
+        buffer.write_string(long_to_bytes(r))
+        buffer.write_string(long_to_bytes(s))
+        buffer.end_string(signature_start)
+        buffer.end_string(start)
 
-    @staticmethod
-    def decode(data: bytes) -> Tuple[Tuple[bytes, bytes], bytes]:
+    @classmethod
+    def read(cls, cursor: DecodeCursor) -> Tuple[str, bytes]:
         """
-        Decodes a bytestring containing a signature
+        Reads a signature from a cursor
 
         Args:
-            data (bytes): The bytestring starting with the Signature
+            cursor (DecodeCursor): The cursor positioned at the Signature
 
         Returns:
-            Tuple[ Tuple[ bytes, bytes ], bytes]: (curve, signature), remainder of the data
+            Tuple[str, bytes]: (curve, signature)
         """
-        signature, data = BytestringField.decode(data)
+        signature = cursor.read_cursor()
+
+        curve = StringField.read(signature)
+        signature = signature.read_cursor()
 
-        curve, signature = StringField.decode(signature)
-        signature, _ = BytestringField.decode(signature)
+        r = MpIntegerField.read(signature)
+        s = MpIntegerField.read(signature)
 
-        r, signature = MpIntegerField.decode(signature)
-        s, _ = MpIntegerField.decode(signature)
+        return curve, encode_dss_signature(r, s)
 
-        signature = encode_dss_signature(r, s)
+    @classmethod
+    def read_value(cls, cursor: DecodeCursor) -> bytes:
+        return cls.read(cursor)[1]
 
-        return (curve, signature), data
+    @classmethod
+    def from_signature_type(cls, signature_type: str) -> "EcdsaSignatureField":
+        return cls(private_key=None, curve_name=signature_type)
 
     @classmethod
-    def from_decode(cls, data: bytes) -> Tuple["EcdsaSignatureField", bytes]:
+    def from_cursor(cls, cursor: DecodeCursor) -> "EcdsaSignatureField":
         """
         Creates a signature field class from the encoded signature
 
         Args:
-            data (bytes): The bytestring starting with the Signature
+            cursor (DecodeCursor): The cursor positioned at the Signature
 
         Returns:
-            Tuple[ EcdsaSignatureField , bytes ]: signature, remainder of the data
+            EcdsaSignatureField: The signature field
         """
-        signature, data = cls.decode(data)
+        signature = cls.read(cursor)
 
-        return (
-            cls(private_key=None, signature=signature[1], curve_name=signature[0]),
-            data,
-        )
+        return cls(private_key=None, signature=signature[1], curve_name=signature[0])
+
+    def get_hash_algorithm(self, **kwargs) -> type:
+        return ECDSA_SIGNATURE_HASHES[self.curve]
 
     # pylint: disable=unused-argument
-    def sign(self, data: bytes, **kwargs) -> None:
+    def create_signature(
+        self, data: bytes, signer=None, digest: bytes = None, **kwargs
+    ) -> bytes:
         """
         Signs the provided data with the provided private key
 
         Args:
             data (bytes): The data to be signed
+            signer (optional): Signer to use instead of the private key,
+                               e.g. a sshkey_tools.signer.ProcessSigner.
+                               Defaults to None.
+            digest (bytes, optional): The digest of the data from get_digest,
+                                      to sign instead of hashing the data.
+                                      Defaults to None.
+
+        Returns:
+            bytes: The signature bytes
         """
-        self.value = self.private_key.sign(data)
-        self.is_signed = True
+        if digest is not None:
+            return self.get_signer(signer).sign_digest(digest)
+
+        return self.get_signer(signer).sign(data)
 
     def __bytes__(self):
+        if self._raw is not None:
+            return bytes(self._raw)
+
         return self.encode(self.value, self.curve)
 
 
@@ -1619,63 +2090,63 @@ class Ed25519SignatureField(SignatureField):
         super().__init__(private_key, signature)
 
     @classmethod
-    def encode(cls, value: bytes) -> None:
+    def write(cls, buffer: EncodeBuffer, value: bytes) -> None:
         """
-        Encodes the signature to a byte string
+        Writes the encoded signature to a buffer
 
         Args:
-            signature (bytes): The signature bytes to encode
-
-        Returns:
-            bytes: The encoded byte string
+            buffer (EncodeBuffer): The buffer to write to
+            value (bytes): The signature bytes to encode
         """
         cls.__validate_type__(value, True)
 
-        return BytestringField.encode(
-            StringField.encode("ssh-ed25519") + BytestringField.encode(value)
-        )
+        start = buffer.begin_string()
+        buffer.write_string(b"ssh-ed25519")
+        buffer.write_string(value)
+        buffer.end_string(start)
 
-    @staticmethod
-    def decode(data: bytes) -> Tuple[bytes, bytes]:
+    @classmethod
+    def read(cls, cursor: DecodeCursor) -> bytes:
         """
-        Decodes a bytestring containing a signature
+        Reads a signature from a cursor
 
         Args:
-            data (bytes): The bytestring starting with the Signature
+            cursor (DecodeCursor): The cursor positioned at the Signature
 
         Returns:
-            Tuple[ bytes, bytes ]: signature, remainder of the data
+            bytes: The signature
         """
-        signature, data = BytestringField.decode(data)
-
-        signature = BytestringField.decode(BytestringField.decode(signature)[1])[0]
+        signature = cursor.read_cursor()
+        signature.skip_string()
 
-        return signature, data
+        return BytestringField.read(signature)
 
     @classmethod
-    def from_decode(cls, data: bytes) -> Tuple["Ed25519SignatureField", bytes]:
+    def from_cursor(cls, cursor: DecodeCursor) -> "Ed25519SignatureField":
         """
         Creates a signature field class from the encoded signature
 
         Args:
-            data (bytes): The bytestring starting with the Signature
+            cursor (DecodeCursor): The cursor positioned at the Signature
 
         Returns:
-            Tuple[ Ed25519SignatureField , bytes ]: signature, remainder of the data
+            Ed25519SignatureField: The signature field
         """
-        signature, data = cls.decode(data)
-
-        return cls(private_key=None, signature=signature), data
+        return cls(private_key=None, signature=cls.read(cursor))
 
     # pylint: disable=unused-argument
-    def sign(self, data: bytes, **kwargs) -> None:
+    def create_signature(self, data: bytes, signer=None, **kwargs) -> bytes:
         """
-        Signs the provided data with the provided private key
+        Signs the provided data with the provided private key.
+        ED25519 signs the data in a single pass, a digest is not used.
 
         Args:
             data (bytes): The data to be signed
-            hash_alg (RsaAlgs, optional): The RSA algorithm to use for hashing.
-                                           Defaults to RsaAlgs.SHA256.
+            signer (optional): Signer to use instead of the private key,
+                               e.g. a sshkey_tools.signer.ProcessSigner.
+                               Defaults to None.
+
+        Returns:
+            bytes: The signature bytes
         """
-        self.value = self.private_key.sign(data)
-        self.is_signed = True
+        return self.get_signer(signer).sign(data)
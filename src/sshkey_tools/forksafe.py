@@ -0,0 +1,45 @@
+"""
+Base class for objects with per-process state, such as buffered random
+values or reserved serials, that a child process created with fork must
+not share with its parent.
+"""
+import os
+import threading
+import weakref
+
+# Instances to reset in a child process after a fork
+_INSTANCES = weakref.WeakSet()
+
+
+# pylint: disable=too-few-public-methods
+class ForkSafe:
+    """
+    Base class for objects with per-process state. The state is set up in
+    _reset(), which is called on creation and again in the child process
+    after a fork. Child classes extend _reset() and call __init__ once
+    their settings are in place.
+    """
+
+    def __init__(self):
+        self._reset()
+        _INSTANCES.add(self)
+
+    def _reset(self) -> None:
+        """
+        Sets up the per-process state. The lock is replaced in the child
+        in case it was held by another thread while the process was forked.
+        """
+        self._lock = threading.Lock()
+
+
+def _reset_instances() -> None:
+    """
+    Resets all instances in a child process after a fork
+    """
+    for instance in list(_INSTANCES):
+        # pylint: disable=protected-access
+        instance._reset()
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_reset_instances)
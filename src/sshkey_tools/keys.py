@@ -2,6 +2,8 @@
 Classes for handling SSH public/private keys
 """
 
+# pylint: disable=too-many-lines
+
 from base64 import b64decode
 from enum import Enum
 from struct import unpack
@@ -17,12 +19,14 @@ from cryptography.hazmat.primitives.asymmetric import ec as _ECDSA
 from cryptography.hazmat.primitives.asymmetric import ed25519 as _ED25519
 from cryptography.hazmat.primitives.asymmetric import padding as _PADDING
 from cryptography.hazmat.primitives.asymmetric import rsa as _RSA
+from cryptography.hazmat.primitives.asymmetric.utils import Prehashed as _PREHASHED
 
 from . import exceptions as _EX
 from .utils import ensure_bytestring, ensure_string, nullsafe_getattr
 from .utils import md5_fingerprint as _FP_MD5
 from .utils import sha256_fingerprint as _FP_SHA256
 from .utils import sha512_fingerprint as _FP_SHA512
+from .wire import BufferTypes, DecodeCursor, EncodeBuffer
 
 PUBKEY_MAP = {
     _RustBinding.openssl.rsa.RSAPublicKey: "RsaPublicKey",
@@ -37,12 +41,26 @@ PRIVKEY_MAP = {
     _RustBinding.openssl.ed25519.Ed25519PrivateKey: "Ed25519PrivateKey",
 }
 
+PUBKEY_TYPE_MAP = {
+    "ssh-rsa": "RsaPublicKey",
+    "ecdsa-sha2-nistp256": "EcdsaPublicKey",
+    "ecdsa-sha2-nistp384": "EcdsaPublicKey",
+    "ecdsa-sha2-nistp521": "EcdsaPublicKey",
+    "ssh-ed25519": "Ed25519PublicKey",
+}
+
 ECDSA_HASHES = {
     "secp256r1": _HASHES.SHA256,
     "secp384r1": _HASHES.SHA384,
     "secp521r1": _HASHES.SHA512,
 }
 
+ECDSA_WIRE_CURVES = {
+    "nistp256": _ECDSA.SECP256R1,
+    "nistp384": _ECDSA.SECP384R1,
+    "nistp521": _ECDSA.SECP521R1,
+}
+
 PubkeyClasses = Union[
     _RSA.RSAPublicKey,
     _DSA.DSAPublicKey,
@@ -102,6 +120,7 @@ class FingerprintHashes(Enum):
     SHA512 = _FP_SHA512
 
 
+# pylint: disable=too-many-instance-attributes
 class PublicKey:
     """
     Class for handling SSH public keys
@@ -116,6 +135,11 @@ class PublicKey:
         self.key_type = kwargs.get("key_type", None)
         self.serialized = kwargs.get("serialized", None)
 
+        # The wire format of the key and its fingerprints, computed on first use
+        self._wire = None
+        self._wire_key = None
+        self._fingerprints = {}
+
         self.export_opts = [
             _SERIALIZATION.Encoding.OpenSSH,
             _SERIALIZATION.PublicFormat.OpenSSH,
@@ -168,14 +192,20 @@ class PublicKey:
             PublicKey: Any of the PublicKey child classes
         """
         split = ensure_bytestring(data, encoding).split(b" ")
-        comment = None
+
+        try:
+            key_data = b64decode(split[1])
+        except (IndexError, ValueError) as ex:
+            raise _EX.InvalidKeyException("Invalid public key") from ex
+
+        public_key = cls.from_bytes(key_data)
+        if bytes(DecodeCursor(key_data).read_string()) != split[0]:
+            raise _EX.InvalidKeyException("The key type does not match the key data")
+
         if len(split) > 2:
-            comment = split[2]
+            public_key.comment = split[2]
 
-        return cls.from_class(
-            key_class=_SERIALIZATION.load_ssh_public_key(b" ".join(split[:2])),
-            comment=comment,
-        )
+        return public_key
 
     @classmethod
     def from_file(cls, path: str) -> "PublicKey":
@@ -194,13 +224,13 @@ class PublicKey:
         return cls.from_string(data)
 
     @classmethod
-    # pylint: disable=broad-except
-    def from_bytes(cls, data: bytes) -> "PublicKey":
+    def from_bytes(cls, data: BufferTypes) -> "PublicKey":
         """
-        Loads a public key from byte data
+        Loads a public key from byte data in the SSH wire format
+        (the base64-decoded middle part of an OpenSSH public key)
 
         Args:
-            data (bytes): The bytestring containing the public key
+            data (BufferTypes): The bytestring containing the public key
 
         Raises:
             _EX.InvalidKeyException: Invalid data input
@@ -208,20 +238,61 @@ class PublicKey:
         Returns:
             PublicKey: PublicKey subclass depending on the key type
         """
-        for key_class in PUBKEY_MAP.values():
-            try:
-                key = globals()[key_class].from_raw_bytes(data)
-                return key
-            except Exception:
-                pass
+        try:
+            cursor = DecodeCursor(data)
+            key_type = str(cursor.read_string(), "utf-8")
+            public_key = globals()[PUBKEY_TYPE_MAP[key_type]].from_wire(
+                cursor, key_type
+            )
+        except (KeyError, ValueError) as ex:
+            raise _EX.InvalidKeyException("Invalid public key") from ex
+
+        if not cursor.at_end():
+            raise _EX.InvalidKeyException("Unexpected data after the public key")
+
+        return public_key
+
+    @classmethod
+    def from_wire(cls, cursor: DecodeCursor, key_type: str) -> "PublicKey":
+        """
+        Builds the public key from its components in the SSH wire format.
+        Implemented by the child classes.
+
+        Args:
+            cursor (DecodeCursor): Cursor positioned after the key type string
+            key_type (str): The key type, e.g. ssh-ed25519
+
+        Returns:
+            PublicKey: PublicKey subclass depending on the key type
+        """
+        raise _EX.InvalidClassCallException("The base class has no wire format")
+
+    def keep_wire(self, key_type: str, cursor: DecodeCursor, start: int) -> "PublicKey":
+        """
+        Keeps the decoded data as the wire format of the key, called by
+        the child classes after reading the key components from a cursor
 
-        raise _EX.InvalidKeyException("Invalid public key")
+        Args:
+            key_type (str): The key type, e.g. ssh-ed25519
+            cursor (DecodeCursor): The cursor positioned after the key components
+            start (int): The offset of the key components in the cursor
+
+        Returns:
+            PublicKey: The public key
+        """
+        buffer = EncodeBuffer()
+        buffer.write_string(key_type.encode("utf-8"))
+        buffer.write(cursor.buffer[start : cursor.offset])
+        self.set_wire(buffer.getvalue())
+
+        return self
 
     def get_fingerprint(
         self, hash_method: FingerprintHashes = FingerprintHashes.SHA256
     ) -> str:
         """
-        Generates a fingerprint of the public key
+        Generates a fingerprint of the public key.
+        The fingerprint is calculated once for each hash method.
 
         Args:
             hash_method (FingerprintHashes, optional): Type of hash. Defaults to SHA256.
@@ -229,7 +300,12 @@ class PublicKey:
         Returns:
             str: The hash of the public key
         """
-        return hash_method(self.raw_bytes())
+        wire = self.raw_bytes()
+        fingerprint = self._fingerprints.get(hash_method)
+        if fingerprint is None:
+            fingerprint = self._fingerprints[hash_method] = hash_method(wire)
+
+        return fingerprint
 
     def serialize(self) -> bytes:
         """
@@ -242,12 +318,38 @@ class PublicKey:
 
     def raw_bytes(self) -> bytes:
         """
-        Export the public key to a raw byte string
+        Export the public key to a raw byte string in the SSH wire format.
+        The bytes are kept from the input when the key was loaded
+        from the wire format, and are otherwise serialized once.
 
         Returns:
-            bytes: The raw certificate bytes
+            bytes: The raw public key bytes
         """
-        return b64decode(self.serialize().split(b" ")[1])
+        if self._wire is None or self._wire_key is not self.key:
+            self.set_wire(b64decode(self.serialize().split(b" ")[1]))
+
+        return self._wire
+
+    def set_wire(self, data: BufferTypes) -> None:
+        """
+        Sets the wire format of the key, e.g. from the data it was decoded from,
+        so it does not need to be serialized again
+
+        Args:
+            data (BufferTypes): The public key in the SSH wire format
+        """
+        self._wire = bytes(data)
+        self._wire_key = self.key
+        self._fingerprints = {}
+
+    def __eq__(self, other) -> bool:
+        if not isinstance(other, PublicKey):
+            return NotImplemented
+
+        return self.raw_bytes() == other.raw_bytes()
+
+    def __hash__(self) -> int:
+        return hash(self.raw_bytes())
 
     def to_string(self, encoding: str = "utf-8") -> str:
         """
@@ -457,6 +559,25 @@ class RsaPublicKey(PublicKey):
         """
         return cls(key=_RSA.RSAPublicNumbers(e, n).public_key())
 
+    @classmethod
+    # pylint: disable=unused-argument
+    def from_wire(cls, cursor: DecodeCursor, key_type: str = "ssh-rsa"):
+        """
+        Loads an RSA Public Key from the e and n mpints in the SSH wire format
+
+        Args:
+            cursor (DecodeCursor): Cursor positioned at the e mpint
+            key_type (str): The key type. Defaults to ssh-rsa.
+
+        Returns:
+            RsaPublicKey: Instance of RsaPublicKey
+        """
+        start = cursor.offset
+        e = int.from_bytes(cursor.read_string(), "big")
+        n = int.from_bytes(cursor.read_string(), "big")
+
+        return cls.from_numbers(e=e, n=n).keep_wire("ssh-rsa", cursor, start)
+
     def verify(
         self, data: bytes, signature: bytes, hash_alg: RsaAlgs = RsaAlgs.SHA512
     ) -> None:
@@ -589,6 +710,23 @@ class RsaPrivateKey(PrivateKey):
         """
         return self.key.sign(data, _PADDING.PKCS1v15(), hash_alg.value[1]())
 
+    def sign_digest(self, digest: bytes, hash_alg: RsaAlgs = RsaAlgs.SHA512) -> bytes:
+        """
+        Signs a digest of the data that has already been calculated,
+        instead of hashing the data again
+
+        Args:
+            digest (bytes): The digest of the data to sign
+            hash_alg (RsaAlgs, optional): Algorithm the digest was calculated with.
+                                          Defaults to SHA512.
+
+        Returns:
+            bytes: The signature bytes
+        """
+        return self.key.sign(
+            digest, _PADDING.PKCS1v15(), _PREHASHED(hash_alg.value[1]())
+        )
+
 
 class DsaPublicKey(PublicKey):
     """
@@ -703,6 +841,53 @@ class EcdsaPublicKey(PublicKey):
             ).public_key()
         )
 
+    @classmethod
+    def from_point(cls, curve: Union[str, bytes], point: BufferTypes):
+        """
+        Create an ECDSA public key from the SSH curve identifier
+        and the SEC1-encoded public point
+
+        Args:
+            curve (Union[str, bytes]): The curve identifier, e.g. nistp256
+            point (BufferTypes): The encoded public point
+
+        Returns:
+            EcdsaPublicKey: An instance of EcdsaPublicKey
+        """
+        curve = ensure_string(curve)
+        if curve not in ECDSA_WIRE_CURVES:
+            raise _EX.InvalidCurveException(
+                f"Invalid curve, must be one of {', '.join(ECDSA_WIRE_CURVES.keys())}"
+            )
+
+        return cls(
+            key=_ECDSA.EllipticCurvePublicKey.from_encoded_point(
+                ECDSA_WIRE_CURVES[curve](), bytes(point)
+            )
+        )
+
+    @classmethod
+    def from_wire(cls, cursor: DecodeCursor, key_type: str = None):
+        """
+        Loads an ECDSA Public Key from the curve identifier and public point
+        in the SSH wire format
+
+        Args:
+            cursor (DecodeCursor): Cursor positioned at the curve identifier
+            key_type (str): The key type, e.g. ecdsa-sha2-nistp256
+
+        Returns:
+            EcdsaPublicKey: An instance of EcdsaPublicKey
+        """
+        start = cursor.offset
+        curve = str(cursor.read_string(), "utf-8")
+        if key_type is not None and key_type != f"ecdsa-sha2-{curve}":
+            raise _EX.InvalidKeyException("The key type does not match the curve")
+
+        return cls.from_point(curve, cursor.read_string()).keep_wire(
+            f"ecdsa-sha2-{curve}", cursor, start
+        )
+
     def verify(self, data: bytes, signature: bytes) -> None:
         """
         Verifies a signature
@@ -797,6 +982,21 @@ class EcdsaPrivateKey(PrivateKey):
         curve_hash = ECDSA_HASHES[self.key.curve.name]()
         return self.key.sign(data, _ECDSA.ECDSA(curve_hash))
 
+    def sign_digest(self, digest: bytes) -> bytes:
+        """
+        Signs a digest of the data that has already been calculated,
+        instead of hashing the data again. The digest is calculated
+        with the hash algorithm of the curve, see ECDSA_HASHES.
+
+        Args:
+            digest (bytes): The digest of the data to sign
+
+        Returns:
+            bytes: The signature bytes
+        """
+        curve_hash = ECDSA_HASHES[self.key.curve.name]()
+        return self.key.sign(digest, _ECDSA.ECDSA(_PREHASHED(curve_hash)))
+
 
 class Ed25519PublicKey(PublicKey):
     """
@@ -833,6 +1033,26 @@ class Ed25519PublicKey(PublicKey):
             _ED25519.Ed25519PublicKey.from_public_bytes(data=raw_bytes)
         )
 
+    @classmethod
+    # pylint: disable=unused-argument
+    def from_wire(cls, cursor: DecodeCursor, key_type: str = "ssh-ed25519"):
+        """
+        Load an ED25519 public key from the raw key in the SSH wire format
+
+        Args:
+            cursor (DecodeCursor): Cursor positioned at the raw key
+            key_type (str): The key type. Defaults to ssh-ed25519.
+
+        Returns:
+            Ed25519PublicKey: Instance of Ed25519PublicKey
+        """
+        start = cursor.offset
+        public_key = cls(
+            _ED25519.Ed25519PublicKey.from_public_bytes(bytes(cursor.read_string()))
+        )
+
+        return public_key.keep_wire("ssh-ed25519", cursor, start)
+
     def verify(self, data: bytes, signature: bytes) -> None:
         """
         Verifies a signature
@@ -0,0 +1,308 @@
+"""
+Signing with CA keys held by a remote signing service, for services with
+a high latency per call that can sign many items in one call.
+
+Concurrent signing requests are coalesced into batches: a batch is sent
+when it is full or when its oldest request has waited for the maximum
+wait time, and the signatures are handed back to the waiting callers.
+"""
+import threading
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from time import monotonic
+from typing import Callable, List, Union
+
+from . import exceptions as _EX
+from .keys import PrivateKey, PublicKey, RsaAlgs, RsaPublicKey
+
+
+# pylint: disable=too-many-instance-attributes
+class BatchCoalescer:
+    """
+    Collects items submitted by concurrent callers into batches for
+    a function that processes a list of items at once
+
+    Args:
+        func (Callable[[List], List]): The function for a batch, returning
+                                       one result per item, in order
+        max_batch_size (int, optional): The maximum number of items in a batch.
+                                        Defaults to 64.
+        max_wait (float, optional): The maximum time in seconds an item waits
+                                    for the batch to fill. Defaults to 0.005.
+        executor (Executor, optional): The executor to run the batches in, so
+                                       several batches can run at the same time.
+                                       Defaults to running them one at a time.
+        max_in_flight (int, optional): The maximum number of batches running at
+                                       the same time. Items wait in the queue,
+                                       filling the next batch, until one is done.
+                                       Defaults to the number of workers of the
+                                       executor.
+    """
+
+    # pylint: disable=too-many-arguments, too-many-positional-arguments
+    def __init__(
+        self,
+        func: Callable[[List], List],
+        max_batch_size: int = 64,
+        max_wait: float = 0.005,
+        executor=None,
+        max_in_flight: int = None,
+    ):
+        self.func = func
+        self.max_batch_size = max(1, max_batch_size)
+        self.max_wait = max_wait
+        self.executor = executor
+
+        if max_in_flight is None:
+            max_in_flight = getattr(executor, "_max_workers", None) or 1
+        self._in_flight = threading.BoundedSemaphore(max(1, max_in_flight))
+
+        self.closed = False
+        self._queue = deque()
+        self._condition = threading.Condition()
+        self._dispatcher = None
+
+    def submit(self, item) -> Future:
+        """
+        Adds an item to the next batch
+
+        Args:
+            item: The item
+
+        Raises:
+            _EX.SignatureNotPossibleException: The coalescer is closed
+
+        Returns:
+            Future: Future for the result of the item
+        """
+        future = Future()
+        future.set_running_or_notify_cancel()
+
+        with self._condition:
+            if self.closed:
+                raise _EX.SignatureNotPossibleException("The signer is closed")
+
+            self._queue.append((monotonic(), item, future))
+            if self._dispatcher is None:
+                self._dispatcher = threading.Thread(target=self._dispatch, daemon=True)
+                self._dispatcher.start()
+
+            # Wake the dispatcher for a new batch, or when the batch is full
+            if len(self._queue) in (1, self.max_batch_size):
+                self._condition.notify()
+
+        return future
+
+    def close(self) -> None:
+        """
+        Sends the remaining items without waiting for the batch to fill,
+        and waits for the dispatcher to finish
+        """
+        with self._condition:
+            self.closed = True
+            self._condition.notify()
+
+        if self._dispatcher is not None:
+            self._dispatcher.join()
+
+    def _dispatch(self) -> None:
+        """
+        Takes batches from the queue and runs them, until the coalescer
+        is closed and the queue is empty
+        """
+        while True:
+            with self._condition:
+                while not self._queue and not self.closed:
+                    self._condition.wait()
+
+                if not self._queue:
+                    return
+
+                deadline = self._queue[0][0] + self.max_wait
+                while len(self._queue) < self.max_batch_size and not self.closed:
+                    remaining = deadline - monotonic()
+                    if remaining <= 0:
+                        break
+                    self._condition.wait(remaining)
+
+            # Wait for a running batch to finish, while the queue fills up
+            self._in_flight.acquire()
+            with self._condition:
+                batch = [
+                    self._queue.popleft()[1:]
+                    for _ in range(min(len(self._queue), self.max_batch_size))
+                ]
+
+            if self.executor is None:
+                self._run(batch)
+            else:
+                try:
+                    self.executor.submit(self._run, batch)
+                except BaseException:
+                    self._in_flight.release()
+                    raise
+
+    # pylint: disable=broad-exception-caught
+    def _run(self, batch: list) -> None:
+        """
+        Runs the function for a batch and completes the futures of its items
+
+        Args:
+            batch (list): The items and their futures
+        """
+        try:
+            results = self.func([item for item, _ in batch])
+            if len(results) != len(batch):
+                raise _EX.InvalidDataException(
+                    f"Expected {len(batch)} results for the batch, got {len(results)}"
+                )
+        except Exception as ex:
+            for _, future in batch:
+                future.set_exception(ex)
+            return
+        finally:
+            self._in_flight.release()
+
+        for (_, future), result in zip(batch, results):
+            future.set_result(result)
+
+
+class RemoteSigner(PrivateKey):
+    """
+    A private key held by a remote signing service. Can be used as the
+    CA private key of a certificate, like the other PrivateKey classes,
+    but the key cannot be exported.
+
+    The signing service is called with a list of data to sign, and returns
+    the signatures in the same order and format as the sign method of the
+    PrivateKey class for the key type, e.g. DER encoded signatures for ECDSA.
+    For RSA keys, the hash algorithm is passed as the second argument, and
+    each batch only contains data for the same hash algorithm.
+
+    Concurrent calls to sign, e.g. from SSHCertificate.sign_many or
+    sshkey_tools.aio.sign, are coalesced into batches.
+
+    Args:
+        public_key (PublicKey): The public key of the CA key
+        sign_batch (Callable): The function calling the signing service
+        max_batch_size (int, optional): The maximum number of signatures per call.
+                                        Defaults to 64.
+        max_wait (float, optional): The maximum time in seconds a signature waits
+                                    for the batch to fill. Defaults to 0.005.
+        max_in_flight (int, optional): The maximum number of calls to the signing
+                                       service at the same time. Defaults to 4.
+    """
+
+    # pylint: disable=too-many-arguments, too-many-positional-arguments
+    def __init__(
+        self,
+        public_key: PublicKey,
+        sign_batch: Callable[..., List[bytes]],
+        max_batch_size: int = 64,
+        max_wait: float = 0.005,
+        max_in_flight: int = 4,
+    ):
+        super().__init__(None, public_key)
+        self.sign_batch = sign_batch
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait
+
+        self.executor = ThreadPoolExecutor(max_workers=max_in_flight)
+        self.closed = False
+        self._coalescers = {}
+        self._lock = threading.Lock()
+
+    def __enter__(self) -> "RemoteSigner":
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+    def submit(self, data: bytes, hash_alg: RsaAlgs = None) -> Future:
+        """
+        Adds data to the next batch to be signed
+
+        Args:
+            data (bytes): The data to sign
+            hash_alg (RsaAlgs, optional): The hash algorithm for RSA keys.
+                                          Defaults to RsaAlgs.SHA512.
+
+        Raises:
+            _EX.SignatureNotPossibleException: The signer is closed
+
+        Returns:
+            Future: Future for the signature bytes
+        """
+        if not isinstance(self.public_key, RsaPublicKey):
+            hash_alg = None
+        elif hash_alg is None:
+            hash_alg = RsaAlgs.SHA512
+
+        coalescer = self._coalescers.get(hash_alg)
+        if coalescer is None:
+            with self._lock:
+                if self.closed:
+                    raise _EX.SignatureNotPossibleException("The signer is closed")
+
+                coalescer = self._coalescers.get(hash_alg)
+                if coalescer is None:
+                    coalescer = self._coalescers[hash_alg] = BatchCoalescer(
+                        (
+                            self.sign_batch
+                            if hash_alg is None
+                            else lambda data: self.sign_batch(data, hash_alg)
+                        ),
+                        self.max_batch_size,
+                        self.max_wait,
+                        self.executor,
+                    )
+
+        return coalescer.submit(bytes(data))
+
+    def sign(self, data: bytes, hash_alg: RsaAlgs = RsaAlgs.SHA512) -> bytes:
+        """
+        Signs data with the signing service and waits for the signature
+
+        Args:
+            data (bytes): The data to sign
+            hash_alg (RsaAlgs, optional): The hash algorithm for RSA keys.
+                                          Defaults to RsaAlgs.SHA512.
+
+        Returns:
+            bytes: The signature
+        """
+        return self.submit(data, hash_alg).result()
+
+    def sign_digest(self, digest: bytes, hash_alg: RsaAlgs = RsaAlgs.SHA512) -> bytes:
+        """
+        Not supported, the signing service signs the data
+
+        Raises:
+            _EX.SignatureNotPossibleException: Always
+        """
+        raise _EX.SignatureNotPossibleException(
+            "The signing service cannot sign a digest, sign the data instead"
+        )
+
+    def to_bytes(self, password: Union[str, bytes] = None) -> bytes:
+        """
+        Not supported, the private key cannot be exported from the signing service
+
+        Raises:
+            _EX.InvalidKeyException: Always
+        """
+        raise _EX.InvalidKeyException("The private key is held by the signing service")
+
+    def close(self) -> None:
+        """
+        Sends the pending signatures and waits for them,
+        then stops accepting new ones
+        """
+        with self._lock:
+            self.closed = True
+            coalescers = list(self._coalescers.values())
+
+        for coalescer in coalescers:
+            coalescer.close()
+
+        self.executor.shutdown()
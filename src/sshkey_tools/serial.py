@@ -0,0 +1,241 @@
+"""
+Allocator for unique certificate serial numbers across issuing nodes
+and processes, without checking each serial against a database.
+
+A serial consists of a node prefix in the high bits and a counter in
+the low bits. Each process reserves a block of counter values from a
+state file shared by the processes of the node, and hands out the
+serials of the block from memory. The state file always holds the end
+of the last reserved block, so after a crash the rest of that block
+is skipped instead of being handed out again.
+"""
+import errno
+import os
+from tempfile import mkstemp
+from time import sleep
+
+from . import exceptions as _EX
+from . import fields as _FIELD
+from .forksafe import ForkSafe
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover
+    fcntl = None
+
+try:
+    import msvcrt
+except ImportError:
+    msvcrt = None
+
+# Seconds to wait before trying again to lock the state file with msvcrt
+LOCK_RETRY_DELAY = 0.05
+
+
+def _lock_file(file) -> None:
+    """
+    Takes an exclusive lock on an open file, waiting until it is free
+
+    Args:
+        file (TextIO): The open file
+    """
+    if fcntl is not None:
+        fcntl.flock(file, fcntl.LOCK_EX)
+        return
+
+    # Lock the first byte, msvcrt keeps retrying for about 10 seconds
+    # before it fails, so keep waiting like flock does while the file
+    # is locked by another process. Other errors are raised.
+    file.seek(0)
+    while True:
+        try:
+            msvcrt.locking(file.fileno(), msvcrt.LK_LOCK, 1)
+            return
+        except OSError as ex:
+            if ex.errno not in (errno.EDEADLK, errno.EACCES):
+                raise
+
+        sleep(LOCK_RETRY_DELAY)
+
+
+def _unlock_file(file) -> None:
+    """
+    Releases the lock on an open file
+
+    Args:
+        file (TextIO): The open file
+    """
+    if fcntl is not None:
+        fcntl.flock(file, fcntl.LOCK_UN)
+        return
+
+    file.seek(0)
+    msvcrt.locking(file.fileno(), msvcrt.LK_UNLCK, 1)
+
+
+# pylint: disable=too-many-instance-attributes
+class SerialAllocator(ForkSafe):
+    """
+    Allocates serials with a node prefix and a monotonic counter,
+    reserving blocks of counter values from a state file.
+
+    The processes of a node share its state file, which is locked while
+    a block is reserved. Every node needs its own node number. The
+    allocator is thread-safe, and a child process created with fork,
+    or receiving a pickled allocator, reserves its own blocks.
+
+    Args:
+        path (str): The path of the state file
+        node (int, optional): The node number. Defaults to 0.
+        node_bits (int, optional): The number of high bits for the node number.
+                                   Defaults to 16.
+        block_size (int, optional): The number of serials reserved at once.
+                                    Defaults to 4096.
+
+    Raises:
+        _EX.IntegerOverflowException: The node number does not fit in node_bits
+        OSError: File locking is not available on the platform
+    """
+
+    def __init__(
+        self, path: str, node: int = 0, node_bits: int = 16, block_size: int = 4096
+    ):
+        if fcntl is None and msvcrt is None:
+            raise OSError(
+                "SerialAllocator needs file locking (fcntl or msvcrt), "
+                + "without it processes could reserve the same serials"
+            )
+
+        if not 0 <= node < 2**node_bits or not 0 <= node_bits < 64:
+            raise _EX.IntegerOverflowException(
+                f"The node number must fit in {node_bits} bits"
+            )
+
+        self.path = os.path.abspath(path)
+        self.node = node
+        self.node_bits = node_bits
+        self.prefix = node << (64 - node_bits)
+        self.max_counter = 2 ** (64 - node_bits)
+        self.block_size = max(1, block_size)
+
+        super().__init__()
+
+    def _reset(self) -> None:
+        """
+        Drops the reserved block
+        """
+        super()._reset()
+        self._next = 0
+        self._end = 0
+
+    def __reduce__(self):
+        """
+        Pickles the settings of the allocator, so it can be passed to other
+        processes, which then reserve their own blocks
+        """
+        return (
+            self.__class__,
+            (self.path, self.node, self.node_bits, self.block_size),
+        )
+
+    def next_serial(self) -> int:
+        """
+        Gets the next serial, reserving a new block when needed
+
+        Raises:
+            _EX.IntegerOverflowException: All serials of the node are used
+
+        Returns:
+            int: The serial
+        """
+        with self._lock:
+            if self._next >= self._end:
+                self._next, self._end = self._reserve()
+
+            counter = self._next
+            self._next += 1
+
+        return self.prefix | counter
+
+    def install(self) -> None:
+        """
+        Makes the allocator the default for new SerialField instances,
+        e.g. the serial of new certificates and CertificateTemplate.issue
+        """
+        _FIELD.SerialField.DEFAULT = self.next_serial
+
+    def _reserve(self) -> tuple:
+        """
+        Reserves the next block of counter values in the state file
+
+        Raises:
+            _EX.IntegerOverflowException: All serials of the node are used
+
+        Returns:
+            tuple: The first and the end of the reserved counter values
+        """
+        with open(f"{self.path}.lock", "a", encoding="utf-8") as lock_file:
+            _lock_file(lock_file)
+            try:
+                start = max(1, self._read_state())
+                end = min(start + self.block_size, self.max_counter)
+                if start >= end:
+                    raise _EX.IntegerOverflowException(
+                        f"All serials of node {self.node} are used"
+                    )
+
+                self._write_state(end)
+            finally:
+                _unlock_file(lock_file)
+
+        return start, end
+
+    def _read_state(self) -> int:
+        """
+        Reads the end of the last reserved block
+
+        Raises:
+            _EX.InvalidDataException: The state file is invalid
+
+        Returns:
+            int: The first unreserved counter value
+        """
+        try:
+            with open(self.path, "r", encoding="utf-8") as file:
+                return int(file.read().strip())
+        except FileNotFoundError:
+            return 0
+        except ValueError as ex:
+            raise _EX.InvalidDataException(
+                f"Invalid serial state file {self.path}"
+            ) from ex
+
+    def _write_state(self, value: int) -> None:
+        """
+        Writes the end of the reserved block and flushes it to disk
+        before any serial of the block is handed out
+
+        Args:
+            value (int): The first unreserved counter value
+        """
+        directory = os.path.dirname(self.path)
+        fileno, temp_path = mkstemp(
+            prefix=f".{os.path.basename(self.path)}.", suffix=".tmp", dir=directory
+        )
+        try:
+            with os.fdopen(fileno, "w", encoding="utf-8") as file:
+                file.write(f"{value}\n")
+                file.flush()
+                os.fsync(file.fileno())
+
+            os.replace(temp_path, self.path)
+        except BaseException:
+            os.unlink(temp_path)
+            raise
+
+        if hasattr(os, "O_DIRECTORY"):
+            fileno = os.open(directory, os.O_RDONLY | os.O_DIRECTORY)
+            try:
+                os.fsync(fileno)
+            finally:
+                os.close(fileno)
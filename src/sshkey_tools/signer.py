@@ -0,0 +1,192 @@
+"""
+Signing engine that runs the private key operations in worker processes,
+for CA keys where signing is CPU-bound, such as RSA-4096.
+
+The CA key is loaded once in each worker process. Only the data to sign
+(or its digest) and the hash algorithm are sent to the workers, and only
+the raw signatures are returned.
+"""
+import os
+from concurrent.futures import Future, ProcessPoolExecutor
+from typing import Union
+
+from . import exceptions as _EX
+from .keys import PrivateKey, RsaAlgs
+
+# The CA private key of a worker process, loaded by the initializer
+_WORKER_KEY = None
+
+
+def _load_worker_key(
+    path: str, key_data: bytes, password: Union[str, bytes] = None
+) -> None:
+    """
+    Loads the CA private key in a worker process
+
+    Args:
+        path (str): The path of the private key file, or None
+        key_data (bytes): The private key data, or None
+        password (Union[str, bytes], optional): The key password. Defaults to None.
+    """
+    # pylint: disable=global-statement
+    global _WORKER_KEY
+    _WORKER_KEY = load_private_key(path, key_data, password)
+
+
+def _worker_sign(data: bytes, hash_alg: RsaAlgs = None) -> bytes:
+    """
+    Signs data with the CA private key of the worker process
+
+    Args:
+        data (bytes): The data to sign
+        hash_alg (RsaAlgs, optional): The hash algorithm for RSA keys. Defaults to None.
+
+    Returns:
+        bytes: The raw signature
+    """
+    if hash_alg is None:
+        return _WORKER_KEY.sign(data)
+
+    return _WORKER_KEY.sign(data, hash_alg)
+
+
+def _worker_sign_digest(digest: bytes, hash_alg: RsaAlgs = None) -> bytes:
+    """
+    Signs a digest with the CA private key of the worker process
+
+    Args:
+        digest (bytes): The digest of the data to sign
+        hash_alg (RsaAlgs, optional): The hash algorithm for RSA keys. Defaults to None.
+
+    Returns:
+        bytes: The raw signature
+    """
+    if hash_alg is None:
+        return _WORKER_KEY.sign_digest(digest)
+
+    return _WORKER_KEY.sign_digest(digest, hash_alg)
+
+
+def load_private_key(
+    path: str = None, key_data: Union[str, bytes] = None, password=None
+) -> PrivateKey:
+    """
+    Loads a private key from a file or from the key data
+
+    Args:
+        path (str, optional): The path of the private key file. Defaults to None.
+        key_data (Union[str, bytes], optional): The private key data. Defaults to None.
+        password (Union[str, bytes], optional): The key password. Defaults to None.
+
+    Raises:
+        _EX.InvalidKeyException: Neither or both of path and key_data are given
+
+    Returns:
+        PrivateKey: Any of the PrivateKey child classes
+    """
+    if (path is None) == (key_data is None):
+        raise _EX.InvalidKeyException(
+            "Provide either the path or the data of the private key"
+        )
+
+    if path is not None:
+        return PrivateKey.from_file(path, password)
+
+    return PrivateKey.from_string(key_data, password)
+
+
+class ProcessSigner:
+    """
+    Signs with a CA private key in a pool of worker processes.
+    Each worker loads the key once when it starts, from a file
+    or from the (encrypted) key data.
+
+    Use by passing the signer to SSHCertificate.sign or
+    SSHCertificate.sign_many, e.g. certificate.sign(signer=signer).
+    The certificates are created with signer.private_key as the CA key,
+    which is also loaded in the calling process.
+
+    To keep all workers busy, sign a batch with SSHCertificate.sign_many,
+    using at least as many threads as worker processes.
+
+    Args:
+        path (str, optional): The path of the private key file. Defaults to None.
+        key_data (Union[str, bytes], optional): The private key data. Defaults to None.
+        password (Union[str, bytes], optional): The key password. Defaults to None.
+        max_workers (int, optional): The number of worker processes.
+                                     Defaults to the number of CPUs.
+        mp_context (optional): The multiprocessing context for the workers.
+                               Defaults to the default context.
+    """
+
+    # pylint: disable=too-many-arguments, too-many-positional-arguments
+    def __init__(
+        self,
+        path: str = None,
+        key_data: Union[str, bytes] = None,
+        password: Union[str, bytes] = None,
+        max_workers: int = None,
+        mp_context=None,
+    ):
+        self.private_key = load_private_key(path, key_data, password)
+        self.public_key = self.private_key.public_key
+
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self.executor = ProcessPoolExecutor(
+            max_workers=self.max_workers,
+            mp_context=mp_context,
+            initializer=_load_worker_key,
+            initargs=(path, key_data, password),
+        )
+
+    def __enter__(self) -> "ProcessSigner":
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+    def submit(self, data: bytes, hash_alg: RsaAlgs = None) -> Future:
+        """
+        Sends data to be signed to the worker processes
+
+        Args:
+            data (bytes): The data to sign
+            hash_alg (RsaAlgs, optional): The hash algorithm for RSA keys. Defaults to None.
+
+        Returns:
+            Future: Future for the raw signature bytes
+        """
+        return self.executor.submit(_worker_sign, bytes(data), hash_alg)
+
+    def sign(self, data: bytes, hash_alg: RsaAlgs = None) -> bytes:
+        """
+        Signs data in a worker process and waits for the signature
+
+        Args:
+            data (bytes): The data to sign
+            hash_alg (RsaAlgs, optional): The hash algorithm for RSA keys. Defaults to None.
+
+        Returns:
+            bytes: The raw signature
+        """
+        return self.submit(data, hash_alg).result()
+
+    def sign_digest(self, digest: bytes, hash_alg: RsaAlgs = None) -> bytes:
+        """
+        Signs a digest in a worker process and waits for the signature,
+        for RSA and ECDSA keys
+
+        Args:
+            digest (bytes): The digest of the data to sign
+            hash_alg (RsaAlgs, optional): The hash algorithm for RSA keys. Defaults to None.
+
+        Returns:
+            bytes: The raw signature
+        """
+        return self.executor.submit(_worker_sign_digest, digest, hash_alg).result()
+
+    def close(self) -> None:
+        """
+        Shuts down the worker processes
+        """
+        self.executor.shutdown()
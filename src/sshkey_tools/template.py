@@ -0,0 +1,197 @@
+"""
+Templates for issuing many certificates with the same profile
+"""
+from copy import copy
+from datetime import datetime
+from time import time
+from typing import Iterable, Union
+
+from . import exceptions as _EX
+from . import fields as _FIELD
+from .cert import (
+    CertificateFields,
+    CertificateFooter,
+    CertificateHeader,
+    EcdsaCertificate,
+    Ed25519Certificate,
+    RsaCertificate,
+    SSHCertificate,
+)
+from .keys import (
+    EcdsaPublicKey,
+    Ed25519PublicKey,
+    PrivateKey,
+    PublicKey,
+    RsaPublicKey,
+)
+
+CERTIFICATE_CLASSES = {
+    RsaPublicKey: RsaCertificate,
+    EcdsaPublicKey: EcdsaCertificate,
+    Ed25519PublicKey: Ed25519Certificate,
+}
+
+
+# pylint: disable=too-few-public-methods
+class CertificateTemplate:
+    """
+    Template for issuing certificates that share a profile: the same
+    certificate type, critical options, extensions and CA.
+
+    The constant fields are validated and encoded once when the template
+    is created. Every certificate issued from the template gets its own
+    copy of these fields including their encoding, so only the fields
+    that differ per certificate (subject key, key ID, principals, serial,
+    nonce and validity) are validated and encoded when issuing.
+
+    Args:
+        fields (CertificateFields): The profile. The cert_type, critical_options
+                                    and extensions are used for every certificate,
+                                    the valid_before is the default end of the
+                                    validity, e.g. "8h" for certificates
+                                    that are valid for 8 hours.
+        ca_privkey (PrivateKey): The CA private key to sign the certificates with
+
+    Raises:
+        _EX.SignatureNotPossibleException: The constant fields are invalid
+    """
+
+    CONSTANT_FIELDS = ("cert_type", "critical_options", "extensions")
+
+    def __init__(self, fields: CertificateFields, ca_privkey: PrivateKey):
+        self.ca_privkey = ca_privkey
+        self.valid_before = fields.get("valid_before")
+
+        self.fields = {
+            name: self._copy_field(getattr(fields, name))
+            for name in self.CONSTANT_FIELDS
+        }
+        self.footer = {
+            "reserved": _FIELD.ReservedField.factory(),
+            "ca_pubkey": _FIELD.CAPublicKeyField.from_object(ca_privkey.public_key),
+        }
+
+        constant = list(self.fields.values()) + list(self.footer.values())
+        exceptions = []
+        for field in constant:
+            result = field.validate()
+            if isinstance(result, Exception):
+                exceptions.append(result)
+            elif not result:
+                exceptions += [
+                    ex for ex in field.exception if isinstance(ex, Exception)
+                ]
+
+        if exceptions:
+            raise _EX.SignatureNotPossibleException(
+                "\n".join([str(e) for e in exceptions])
+            )
+
+        # Encode once, the copies of the fields keep the encoding
+        for field in constant:
+            _ = field.encoded
+
+    @staticmethod
+    def _copy_field(field: Union[_FIELD.CertificateField, type]):
+        """
+        Copy a field from the profile, so later changes to the profile
+        do not change the template
+
+        Args:
+            field (Union[_FIELD.CertificateField, type]): The field or unset field class
+
+        Returns:
+            _FIELD.CertificateField: A copy of the field
+        """
+        if isinstance(field, type):
+            return field()
+
+        return copy(field)
+
+    # pylint: disable=too-many-arguments, too-many-positional-arguments
+    def issue(
+        self,
+        subject_pubkey: PublicKey,
+        key_id: str,
+        principals: Iterable[str],
+        serial: int = None,
+        valid_after: Union[datetime, int, str] = None,
+        valid_before: Union[datetime, int, str] = None,
+        nonce: Union[str, bytes] = None,
+        **kwargs,
+    ) -> SSHCertificate:
+        """
+        Issue a signed certificate from the template
+
+        Args:
+            subject_pubkey (PublicKey): The subject public key
+            key_id (str): The key ID
+            principals (Iterable[str]): The principals
+            serial (int, optional): The serial. Defaults to a random serial.
+            valid_after (Union[datetime, int, str], optional): The start of the validity.
+                                                               Defaults to now.
+            valid_before (Union[datetime, int, str], optional): The end of the validity.
+                                                                Defaults to the valid_before
+                                                                of the template.
+            nonce (Union[str, bytes], optional): The nonce. Defaults to a secure random nonce.
+            **kwargs: Arguments to pass to the signature signing method
+                      ex. hash_alg for RSA signatures
+
+        Raises:
+            _EX.InvalidKeyException: Unsupported subject public key
+            _EX.SignatureNotPossibleException: The certificate could not be signed
+
+        Returns:
+            SSHCertificate: The signed certificate, a SSHCertificate subclass
+                            depending on the type of subject_pubkey
+        """
+        try:
+            cert_class = CERTIFICATE_CLASSES[subject_pubkey.__class__]
+        except KeyError:
+            raise _EX.InvalidKeyException("The public key is invalid") from KeyError
+
+        # Relative times are resolved once, instead of on every validation and encoding
+        valid_after = int(time()) if valid_after is None else valid_after
+        valid_before = self.valid_before if valid_before is None else valid_before
+        if isinstance(valid_before, str):
+            valid_before = _FIELD.DateTimeField.parse_string_value(valid_before)
+
+        header = CertificateHeader.from_fields(
+            {
+                "public_key": _FIELD.PublicKeyField.from_object(subject_pubkey),
+                "pubkey_type": _FIELD.PubkeyTypeField(cert_class.DEFAULT_KEY_TYPE),
+                "nonce": (
+                    _FIELD.NonceField.factory()
+                    if nonce is None
+                    else _FIELD.NonceField(nonce)
+                ),
+            }
+        )
+        fields = CertificateFields.from_fields(
+            {
+                "serial": (
+                    _FIELD.SerialField.factory()
+                    if serial is None
+                    else _FIELD.SerialField(serial)
+                ),
+                "cert_type": copy(self.fields["cert_type"]),
+                "key_id": _FIELD.KeyIdField(key_id),
+                "principals": _FIELD.PrincipalsField(list(principals)),
+                "valid_after": _FIELD.ValidAfterField(valid_after),
+                "valid_before": _FIELD.ValidBeforeField(valid_before),
+                "critical_options": copy(self.fields["critical_options"]),
+                "extensions": copy(self.fields["extensions"]),
+            }
+        )
+        footer = CertificateFooter.from_fields(
+            {
+                "reserved": copy(self.footer["reserved"]),
+                "ca_pubkey": copy(self.footer["ca_pubkey"]),
+                "signature": _FIELD.SignatureField.from_object(self.ca_privkey),
+            }
+        )
+
+        certificate = cert_class(header=header, fields=fields, footer=footer)
+        certificate.sign(**kwargs)
+
+        return certificate
@@ -0,0 +1,426 @@
+"""
+Store of trusted certificate authority keys, loaded from files in the
+format of the OpenSSH TrustedUserCAKeys option: one public key per line,
+with blank lines and lines starting with # skipped.
+
+The keys are indexed by their wire format and fingerprint, so the CA of
+a certificate is found with a single lookup instead of trying each key.
+"""
+import os
+from dataclasses import dataclass
+from datetime import datetime
+from threading import Lock
+from time import time
+from typing import Callable, Dict, Iterator, List, Optional, Union
+
+from . import exceptions as _EX
+from .cert import SSHCertificate
+from .fields import CERT_TYPE
+from .keys import PublicKey
+
+TimeTypes = Union[datetime, int, float]
+
+
+def _timestamp(value: Optional[TimeTypes]) -> Optional[float]:
+    """
+    Converts a datetime or UNIX timestamp to a UNIX timestamp
+    """
+    if isinstance(value, datetime):
+        return value.timestamp()
+
+    return value
+
+
+@dataclass
+class TrustEntry:
+    """
+    A trusted CA key, with the purpose and the period it is trusted for
+
+    Args:
+        public_key (PublicKey): The public key of the CA
+        cert_type (CERT_TYPE, optional): The certificate type the CA is trusted
+                                         for, or None for both. Defaults to None.
+        valid_after (float, optional): The UNIX timestamp the CA is trusted from.
+                                       Defaults to None.
+        valid_before (float, optional): The UNIX timestamp the CA is trusted until.
+                                        Defaults to None.
+        source (str, optional): The file the key was loaded from. Defaults to None.
+    """
+
+    public_key: PublicKey
+    cert_type: Optional[CERT_TYPE] = None
+    valid_after: Optional[float] = None
+    valid_before: Optional[float] = None
+    source: Optional[str] = None
+
+    @property
+    def fingerprint(self) -> str:
+        """
+        The SHA256 fingerprint of the CA key
+        """
+        return self.public_key.get_fingerprint()
+
+    def check(self, certificate: SSHCertificate, now: float) -> None:
+        """
+        Checks that the CA is trusted for the certificate at the given time
+
+        Args:
+            certificate (SSHCertificate): The certificate
+            now (float): The time as a UNIX timestamp
+
+        Raises:
+            _EX.UntrustedCAException: The CA is not trusted for the certificate
+        """
+        if self.cert_type is not None:
+            cert_type = certificate.get("cert_type")
+            if getattr(cert_type, "value", cert_type) != self.cert_type.value:
+                raise _EX.UntrustedCAException(
+                    f"The CA {self.fingerprint} is only trusted for "
+                    + f"{self.cert_type.name.lower()} certificates"
+                )
+
+        if (self.valid_after is not None and now < self.valid_after) or (
+            self.valid_before is not None and now >= self.valid_before
+        ):
+            raise _EX.UntrustedCAException(
+                f"The CA {self.fingerprint} is not trusted at this time"
+            )
+
+
+# pylint: disable=too-many-instance-attributes
+class TrustStore:
+    """
+    Store of trusted CA keys, from files, directories of files
+    and individual keys.
+
+    Files are only read again when they changed, when reload() is
+    called or at most every reload_interval seconds when resolving
+    certificates. The index is replaced as a whole, so the store can
+    be used from several threads while it is reloaded. When a reload
+    while resolving fails, e.g. on a half-written file, the store keeps
+    the keys it had and the error is kept in reload_error.
+
+    Args:
+        reload_interval (float, optional): Check the source files for changes
+                                           when resolving certificates, at most
+                                           every interval seconds. Defaults to
+                                           None, only reloading on request.
+        clock (Callable[[], float], optional): Function returning the current
+                                               time as a UNIX timestamp.
+                                               Defaults to time.time.
+    """
+
+    def __init__(
+        self, reload_interval: float = None, clock: Callable[[], float] = time
+    ):
+        self.reload_interval = reload_interval
+        self.clock = clock
+
+        # Settings for each file or directory added, by path
+        self._sources = {}
+
+        # Status and entries for each file read, by path
+        self._files = {}
+
+        # Entries added as keys instead of files
+        self._entries = []
+
+        self._by_wire = {}
+        self._by_fingerprint = {}
+        self._checked = clock()
+        self._lock = Lock()
+
+        # The error of the last reload, None if it succeeded
+        self.reload_error = None
+
+    def __len__(self) -> int:
+        return len(self._by_wire)
+
+    def __iter__(self) -> Iterator[TrustEntry]:
+        return iter(list(self._by_wire.values()))
+
+    def __contains__(self, public_key: PublicKey) -> bool:
+        return public_key.raw_bytes() in self._by_wire
+
+    def keys(self) -> List[PublicKey]:
+        """
+        Gets the trusted public keys, e.g. for SSHCertificate.verify_many
+
+        Returns:
+            List[PublicKey]: The public keys
+        """
+        return [entry.public_key for entry in self]
+
+    def add(
+        self,
+        public_key: PublicKey,
+        cert_type: CERT_TYPE = None,
+        valid_after: TimeTypes = None,
+        valid_before: TimeTypes = None,
+    ) -> TrustEntry:
+        """
+        Adds a trusted CA key
+
+        Args:
+            public_key (PublicKey): The public key of the CA
+            cert_type (CERT_TYPE, optional): The certificate type the CA is trusted
+                                             for, or None for both. Defaults to None.
+            valid_after (TimeTypes, optional): The time the CA is trusted from.
+                                               Defaults to None.
+            valid_before (TimeTypes, optional): The time the CA is trusted until.
+                                                Defaults to None.
+
+        Returns:
+            TrustEntry: The trust entry for the key
+        """
+        entry = TrustEntry(
+            public_key, cert_type, _timestamp(valid_after), _timestamp(valid_before)
+        )
+
+        with self._lock:
+            self._entries.append(entry)
+            self._rebuild()
+
+        return entry
+
+    def add_file(
+        self,
+        path: str,
+        cert_type: CERT_TYPE = None,
+        valid_after: TimeTypes = None,
+        valid_before: TimeTypes = None,
+    ) -> None:
+        """
+        Adds the CA keys from a file, or from all files in a directory.
+        Files added to the directory later are read on reload.
+
+        Args:
+            path (str): The path to the file or directory
+            cert_type (CERT_TYPE, optional): The certificate type the CAs are trusted
+                                             for, or None for both. Defaults to None.
+            valid_after (TimeTypes, optional): The time the CAs are trusted from.
+                                               Defaults to None.
+            valid_before (TimeTypes, optional): The time the CAs are trusted until.
+                                                Defaults to None.
+
+        Raises:
+            _EX.InvalidKeyException: A file contains an invalid public key
+        """
+        with self._lock:
+            sources = self._sources.copy()
+            self._sources[os.path.abspath(path)] = (
+                cert_type,
+                _timestamp(valid_after),
+                _timestamp(valid_before),
+            )
+
+            try:
+                self._reload()
+            except BaseException:
+                self._sources = sources
+                raise
+
+    def reload(self) -> bool:
+        """
+        Reads the files that were added, changed or removed since they
+        were last read. When a file cannot be read, the store is left
+        as it was.
+
+        Raises:
+            _EX.InvalidKeyException: A file contains an invalid public key
+            OSError: A file cannot be read
+
+        Returns:
+            bool: True if any of the files changed
+        """
+        with self._lock:
+            return self._reload_tracked()
+
+    def get(self, public_key: Union[PublicKey, bytes]) -> Optional[TrustEntry]:
+        """
+        Gets the trust entry of a CA key
+
+        Args:
+            public_key (Union[PublicKey, bytes]): The public key,
+                                                  or its wire format
+
+        Returns:
+            Optional[TrustEntry]: The trust entry, or None if the key is not trusted
+        """
+        if isinstance(public_key, PublicKey):
+            public_key = public_key.raw_bytes()
+
+        return self._by_wire.get(bytes(public_key))
+
+    def get_by_fingerprint(self, fingerprint: str) -> Optional[TrustEntry]:
+        """
+        Gets the trust entry of a CA key by its SHA256 fingerprint
+
+        Args:
+            fingerprint (str): The fingerprint, e.g. SHA256:...
+
+        Returns:
+            Optional[TrustEntry]: The trust entry, or None if the key is not trusted
+        """
+        return self._by_fingerprint.get(fingerprint)
+
+    def resolve(self, certificate: SSHCertificate) -> Optional[TrustEntry]:
+        """
+        Gets the trust entry of the CA key in a certificate. The key is
+        looked up by its encoded data, without decoding it.
+
+        Args:
+            certificate (SSHCertificate): The certificate
+
+        Returns:
+            Optional[TrustEntry]: The trust entry, or None if the CA is not trusted
+        """
+        if self._reload_due():
+            with self._lock:
+                # Another thread may have reloaded while this one waited
+                if self._reload_due():
+                    try:
+                        self._reload_tracked()
+                    except (OSError, ValueError):
+                        # Keep serving the current keys, the error is in reload_error
+                        pass
+
+        return self._by_wire.get(bytes(certificate.footer.ca_pubkey.encoded[4:]))
+
+    def verify(
+        self, certificate: SSHCertificate, raise_on_error: bool = False, **kwargs
+    ) -> bool:
+        """
+        Verifies a certificate with the trusted key of its CA, after checking
+        that the CA is trusted for the certificate type at the current time
+
+        Args:
+            certificate (SSHCertificate): The certificate
+            raise_on_error (bool, optional): Raise an exception if the certificate
+                                             is invalid. Defaults to False.
+            **kwargs: Arguments to pass to SSHCertificate.verify, e.g. cache
+
+        Raises:
+            _EX.UntrustedCAException: The CA is not trusted for the certificate
+            _EX.InvalidSignatureException: The signature is invalid
+
+        Returns:
+            bool: True if the certificate is signed by a trusted CA
+        """
+        try:
+            entry = self.resolve(certificate)
+            if entry is None:
+                raise _EX.UntrustedCAException(
+                    "The CA of the certificate is not trusted"
+                )
+
+            entry.check(certificate, self.clock())
+        except _EX.UntrustedCAException:
+            if raise_on_error:
+                raise
+            return False
+
+        return certificate.verify(entry.public_key, raise_on_error, **kwargs)
+
+    def _reload_due(self) -> bool:
+        """
+        Whether the reload interval has passed since the files were last checked
+        """
+        return (
+            self.reload_interval is not None
+            and self.clock() - self._checked >= self.reload_interval
+        )
+
+    def _reload_tracked(self) -> bool:
+        """
+        Reads the changed source files, keeping the error in reload_error.
+        Called with the lock held.
+        """
+        try:
+            changed = self._reload()
+        except (OSError, ValueError) as ex:
+            self.reload_error = ex
+            raise
+
+        self.reload_error = None
+        return changed
+
+    def _reload(self) -> bool:
+        """
+        Reads the changed source files, and replaces the index if any changed
+        """
+        self._checked = self.clock()
+
+        files = {}
+        for source, settings in self._sources.items():
+            if os.path.isdir(source):
+                with os.scandir(source) as entries:
+                    for entry in sorted(entries, key=lambda e: e.name):
+                        if not entry.name.startswith(".") and entry.is_file():
+                            files[entry.path] = settings
+            else:
+                files[source] = settings
+
+        changed = self._files.keys() - files.keys()
+        loaded = {}
+        for path, settings in files.items():
+            try:
+                stat = os.stat(path)
+            except FileNotFoundError:
+                changed.add(path)
+                continue
+
+            status = (stat.st_ino, stat.st_size, stat.st_mtime_ns, settings)
+            if path in self._files and self._files[path][0] == status:
+                loaded[path] = self._files[path]
+            else:
+                loaded[path] = (status, self._read_file(path, settings))
+                changed.add(path)
+
+        if changed:
+            self._files = loaded
+            self._rebuild()
+
+        return bool(changed)
+
+    @staticmethod
+    def _read_file(path: str, settings: tuple) -> List[TrustEntry]:
+        """
+        Reads the CA keys from a file
+
+        Raises:
+            _EX.InvalidKeyException: The file contains an invalid public key
+        """
+        entries = []
+        with open(path, "rb") as file:
+            for line_no, line in enumerate(file, start=1):
+                line = line.strip()
+                if not line or line.startswith(b"#"):
+                    continue
+
+                try:
+                    public_key = PublicKey.from_string(line)
+                except _EX.InvalidKeyException as ex:
+                    raise _EX.InvalidKeyException(
+                        f"Invalid public key in {path} on line {line_no}"
+                    ) from ex
+
+                entries.append(TrustEntry(public_key, *settings, source=path))
+
+        return entries
+
+    def _rebuild(self) -> None:
+        """
+        Replaces the indexes with the entries of all files and added keys.
+        When a key is listed more than once, the last entry is used.
+        """
+        by_wire: Dict[bytes, TrustEntry] = {}
+        for _, entries in self._files.values():
+            for entry in entries:
+                by_wire[entry.public_key.raw_bytes()] = entry
+
+        for entry in self._entries:
+            by_wire[entry.public_key.raw_bytes()] = entry
+
+        self._by_fingerprint = {entry.fingerprint: entry for entry in by_wire.values()}
+        self._by_wire = by_wire
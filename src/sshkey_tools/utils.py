@@ -7,13 +7,13 @@ import sys
 import datetime
 
 from base64 import b64encode
-from random import randint
 from secrets import randbits
 from typing import Dict, List, Union
-from uuid import uuid4
 
 from pytimeparse2 import parse as time_parse
 
+from . import entropy as _ENTROPY
+
 
 NoneType = type(None)
 
@@ -111,21 +111,21 @@ def concat_to_bytestring(*strs, encoding: str = "utf-8") -> bytes:
 
 
 def random_keyid() -> str:
-    """Generates a random Key ID
+    """Generates a random Key ID from the entropy pool
 
     Returns:
         str: Random keyid
     """
-    return str(uuid4())
+    return _ENTROPY.random_keyid()
 
 
-def random_serial() -> str:
-    """Generates a random serial number
+def random_serial() -> int:
+    """Generates a random serial number from the entropy pool
 
     Returns:
         int: Random serial
     """
-    return randint(0, 2**64 - 1)
+    return _ENTROPY.random_serial()
 
 
 def long_to_bytes(
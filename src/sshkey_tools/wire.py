@@ -0,0 +1,376 @@
+"""
+Low-level helpers for reading and writing the OpenSSH wire format
+"""
+from binascii import a2b_base64
+from mmap import mmap
+from struct import Struct
+from typing import Union
+
+from . import exceptions as _EX
+
+UINT32 = Struct(">I")
+UINT64 = Struct(">Q")
+
+BufferTypes = Union[bytes, bytearray, memoryview, mmap]
+
+# Zeroed space for integers that are packed in place
+ZERO32 = bytes(4)
+ZERO64 = bytes(8)
+
+
+class DecodeCursor:
+    """
+    Cursor over a buffer containing OpenSSH wire format data.
+
+    The cursor keeps an explicit offset into the buffer and hands out
+    memoryview slices instead of copying the remainder of the data
+    for every field that is read. The buffer can be any object
+    supporting the buffer protocol, e.g. bytes, bytearray, memoryview
+    or mmap.
+    """
+
+    __slots__ = ("buffer", "offset", "end")
+
+    def __init__(self, data: BufferTypes, offset: int = 0, end: int = None):
+        view = data if isinstance(data, memoryview) else memoryview(data)
+        if view.ndim != 1 or view.itemsize != 1:
+            view = view.cast("B")
+
+        self.buffer = view
+        self.offset = offset
+        self.end = len(view) if end is None else end
+
+    @property
+    def remaining(self) -> int:
+        """
+        The number of unread bytes left in the buffer
+        """
+        return self.end - self.offset
+
+    def _require(self, length: int) -> int:
+        """
+        Ensures the requested number of bytes is available and
+        returns the current offset
+
+        Args:
+            length (int): The number of bytes to read
+
+        Raises:
+            _EX.InvalidDataException: Not enough data left in the buffer
+
+        Returns:
+            int: The offset before advancing
+        """
+        start = self.offset
+        if start + length > self.end:
+            self._raise_truncated(start, length)
+
+        return start
+
+    def _raise_truncated(self, start: int, length: int):
+        """
+        Raises an exception for data that ends before the expected length
+        """
+        raise _EX.InvalidDataException(
+            f"Unexpected end of data, expected {length} bytes at offset {start} "
+            + f"but only {self.end - start} are available"
+        )
+
+    def at_end(self) -> bool:
+        """
+        Check if the cursor has reached the end of the data
+
+        Returns:
+            bool: True if there is no data left to read
+        """
+        return self.offset >= self.end
+
+    def read_uint8(self) -> int:
+        """
+        Reads an unsigned 8-bit integer
+
+        Returns:
+            int: The integer value
+        """
+        start = self._require(1)
+        self.offset = start + 1
+        return self.buffer[start]
+
+    def read_uint32(self) -> int:
+        """
+        Reads an unsigned 32-bit big-endian integer
+
+        Returns:
+            int: The integer value
+        """
+        start = self._require(4)
+        self.offset = start + 4
+        return UINT32.unpack_from(self.buffer, start)[0]
+
+    def read_uint64(self) -> int:
+        """
+        Reads an unsigned 64-bit big-endian integer
+
+        Returns:
+            int: The integer value
+        """
+        start = self._require(8)
+        self.offset = start + 8
+        return UINT64.unpack_from(self.buffer, start)[0]
+
+    def read_bytes(self, length: int) -> memoryview:
+        """
+        Reads a fixed number of bytes without copying them
+
+        Args:
+            length (int): The number of bytes to read
+
+        Returns:
+            memoryview: A view of the bytes in the underlying buffer
+        """
+        start = self._require(length)
+        self.offset = start + length
+        return self.buffer[start : start + length]
+
+    def read_string(self) -> memoryview:
+        """
+        Reads a length-prefixed string without copying it
+
+        Returns:
+            memoryview: A view of the string contents
+        """
+        start = self._require(4) + 4
+        stop = start + UINT32.unpack_from(self.buffer, start - 4)[0]
+        if stop > self.end:
+            self._raise_truncated(start, stop - start)
+
+        self.offset = stop
+        return self.buffer[start:stop]
+
+    def read_cursor(self) -> "DecodeCursor":
+        """
+        Reads a length-prefixed string and returns a new cursor
+        bounded to its contents, sharing the same buffer
+
+        Returns:
+            DecodeCursor: Cursor over the string contents
+        """
+        start = self._require(4) + 4
+        stop = start + UINT32.unpack_from(self.buffer, start - 4)[0]
+        if stop > self.end:
+            self._raise_truncated(start, stop - start)
+
+        self.offset = stop
+        return DecodeCursor(self.buffer, start, stop)
+
+    def peek_string(self) -> memoryview:
+        """
+        Reads the next length-prefixed string without advancing the cursor
+
+        Returns:
+            memoryview: A view of the string contents
+        """
+        start = self.offset
+        try:
+            return self.read_string()
+        finally:
+            self.offset = start
+
+    def skip(self, length: int) -> None:
+        """
+        Advances the cursor without reading the data
+
+        Args:
+            length (int): The number of bytes to skip
+        """
+        self.offset = self._require(length) + length
+
+    def skip_string(self) -> None:
+        """
+        Advances the cursor past the next length-prefixed string
+        """
+        self.skip(self.read_uint32())
+
+    def remainder(self) -> bytes:
+        """
+        Copies the unread part of the buffer
+
+        Returns:
+            bytes: The data left after the current offset
+        """
+        return bytes(self.buffer[self.offset : self.end])
+
+
+class Base64Cursor(DecodeCursor):
+    """
+    Cursor over base64-encoded OpenSSH wire format data.
+
+    The data is decoded in aligned 4-character groups, only as far as
+    the fields that are read require. Data that is skipped over is
+    not decoded at all.
+    """
+
+    __slots__ = ("encoded", "decoded")
+
+    def __init__(self, encoded: BufferTypes):
+        encoded = memoryview(encoded).cast("B")
+        if len(encoded) % 4 != 0:
+            raise _EX.InvalidDataException("Invalid base64 data length")
+
+        padding = 0
+        if len(encoded) > 0 and encoded[-1] == 61:
+            padding = 2 if encoded[-2] == 61 else 1
+
+        super().__init__(bytearray(len(encoded) // 4 * 3 - padding))
+        self.encoded = encoded
+        self.decoded = 0
+
+    def _require(self, length: int) -> int:
+        start = self.offset
+        if start + length > self.decoded:
+            self._decode(start, start + length)
+
+        return super()._require(length)
+
+    def _decode(self, start: int, stop: int) -> None:
+        """
+        Decodes the base64 groups covering the given range of the data,
+        starting at the end of the already decoded data or at the
+        start of the range if the data in between has been skipped
+
+        Args:
+            start (int): The start offset in the decoded data
+            stop (int): The end offset in the decoded data
+        """
+        stop = min(stop, self.end)
+        first = max(self.decoded, start) // 3
+        last = -(-stop // 3)
+        if last <= first:
+            return
+
+        try:
+            data = a2b_base64(self.encoded[first * 4 : last * 4])
+        except ValueError as ex:
+            raise _EX.InvalidDataException("Invalid base64 data") from ex
+
+        self.buffer[first * 3 : first * 3 + len(data)] = data
+        self.decoded = first * 3 + len(data)
+
+    def read_string(self) -> memoryview:
+        return self.read_bytes(self.read_uint32())
+
+    def read_cursor(self) -> DecodeCursor:
+        length = self.read_uint32()
+        start = self._require(length)
+        self.offset = start + length
+        return DecodeCursor(self.buffer, start, start + length)
+
+    def skip(self, length: int) -> None:
+        if self.offset + length > self.end:
+            self._raise_truncated(self.offset, length)
+
+        self.offset += length
+
+
+class EncodeBuffer:
+    """
+    Growable buffer for writing OpenSSH wire format data.
+
+    All fields of a certificate are written into the same bytearray,
+    including nested length-prefixed strings, whose length is filled
+    in after the contents have been written. No intermediate byte
+    strings are created for the encoded fields.
+    """
+
+    __slots__ = ("buffer",)
+
+    def __init__(self):
+        self.buffer = bytearray()
+
+    def __len__(self) -> int:
+        return len(self.buffer)
+
+    def __bytes__(self) -> bytes:
+        return bytes(self.buffer)
+
+    def write(self, data: BufferTypes) -> None:
+        """
+        Writes bytes as-is
+
+        Args:
+            data (BufferTypes): The data to write
+        """
+        self.buffer += data
+
+    def write_uint8(self, value: int) -> None:
+        """
+        Writes an unsigned 8-bit integer
+
+        Args:
+            value (int): The integer value
+        """
+        self.buffer.append(value)
+
+    def write_uint32(self, value: int) -> None:
+        """
+        Writes an unsigned 32-bit big-endian integer
+
+        Args:
+            value (int): The integer value
+        """
+        offset = len(self.buffer)
+        self.buffer += ZERO32
+        UINT32.pack_into(self.buffer, offset, value)
+
+    def write_uint64(self, value: int) -> None:
+        """
+        Writes an unsigned 64-bit big-endian integer
+
+        Args:
+            value (int): The integer value
+        """
+        offset = len(self.buffer)
+        self.buffer += ZERO64
+        UINT64.pack_into(self.buffer, offset, value)
+
+    def write_string(self, data: BufferTypes) -> None:
+        """
+        Writes a length-prefixed string
+
+        Args:
+            data (BufferTypes): The string contents
+        """
+        self.write_uint32(len(data))
+        self.buffer += data
+
+    def begin_string(self) -> int:
+        """
+        Starts a length-prefixed string whose contents are written
+        with the other write methods. The string must be completed
+        with end_string.
+
+        Returns:
+            int: The offset of the length prefix, to pass to end_string
+        """
+        offset = len(self.buffer)
+        self.buffer += ZERO32
+        return offset
+
+    def end_string(self, offset: int) -> None:
+        """
+        Completes a length-prefixed string started with begin_string
+        by filling in its length
+
+        Args:
+            offset (int): The offset returned by begin_string
+        """
+        UINT32.pack_into(self.buffer, offset, len(self.buffer) - offset - 4)
+
+    def getvalue(self) -> bytes:
+        """
+        Copies the written data
+
+        Returns:
+            bytes: The encoded data
+        """
+        return bytes(self.buffer)
@@ -0,0 +1,303 @@
+"""
+Writer for exporting many certificates at once, either each to its own
+file or all into one bundle file or stream.
+
+Files are written to a temporary file in the same directory, which then
+replaces the target file, so readers never see a partially written file.
+"""
+import os
+import stat
+from base64 import b64encode
+from enum import Enum
+from tempfile import mkstemp
+from typing import BinaryIO, Iterable, List, Tuple
+
+from .cert import SSHCertificate
+
+
+class FsyncPolicy(Enum):
+    """
+    When written files are flushed to disk
+    Values:
+        FILE: Before each file replaces its target
+        BATCH: Once for all files written by a single call, with a single
+               os.sync() where available and each file otherwise
+        NEVER: Left to the operating system
+    """
+
+    FILE = "file"
+    BATCH = "batch"
+    NEVER = "never"
+
+
+class CertificateWriter:
+    """
+    Writes certificates in the OpenSSH format, one certificate per line,
+    with large buffered writes and atomic replacement of the target files
+
+    Args:
+        fsync (FsyncPolicy, optional): When to flush the files to disk.
+                                       Defaults to FsyncPolicy.BATCH.
+        buffer_size (int, optional): The size of the writes to bundle files
+                                     and streams in bytes. Defaults to 1 MiB.
+    """
+
+    def __init__(
+        self, fsync: FsyncPolicy = FsyncPolicy.BATCH, buffer_size: int = 2**20
+    ):
+        self.fsync = FsyncPolicy(fsync)
+        self.buffer_size = buffer_size
+
+    @staticmethod
+    def line(certificate: SSHCertificate, comment: str = "") -> bytes:
+        """
+        Exports a certificate as a line in the OpenSSH format
+
+        Args:
+            certificate (SSHCertificate): The signed certificate
+            comment (str, optional): Comment to append to the certificate. Defaults to "".
+
+        Returns:
+            bytes: The line, including the trailing newline
+        """
+        line = b" ".join(
+            (
+                certificate.header.get("pubkey_type").encode("utf-8"),
+                b64encode(bytes(certificate)),
+            )
+        )
+        if comment:
+            line += b" " + comment.encode("utf-8")
+
+        return line + b"\n"
+
+    def write_files(self, certificates: Iterable[Tuple[str, SSHCertificate]]) -> int:
+        """
+        Writes each certificate to its own file
+
+        With FsyncPolicy.BATCH, the files are flushed to disk after all
+        of them have been written and before any of them replaces its
+        target, with a single os.sync() instead of a flush per file
+        where available. The directories are flushed once each afterwards.
+
+        Args:
+            certificates (Iterable[Tuple[str, SSHCertificate]]): Pairs of the path
+                                                                 and the certificate
+
+        Returns:
+            int: The number of certificates written
+        """
+        if self.fsync is not FsyncPolicy.BATCH:
+            count = 0
+            for path, certificate in certificates:
+                self._replace(self._write_temp(path, [self.line(certificate)]), path)
+                count += 1
+
+            return count
+
+        pending = []
+        try:
+            for path, certificate in certificates:
+                temp_path = self._write_temp(path, [self.line(certificate)], False)
+                pending.append((temp_path, path))
+
+            self._sync_all([temp_path for temp_path, _ in pending])
+
+            for index, (temp_path, path) in enumerate(pending):
+                os.replace(temp_path, path)
+                pending[index] = (None, path)
+        finally:
+            for temp_path, _ in pending:
+                if temp_path is not None:
+                    os.unlink(temp_path)
+
+        for directory in {
+            os.path.dirname(os.path.abspath(path)) for _, path in pending
+        }:
+            self._sync_directory(directory)
+
+        return len(pending)
+
+    def write_bundle(self, path: str, certificates: Iterable[SSHCertificate]) -> int:
+        """
+        Writes all certificates to a single bundle file,
+        which can be read with sshkey_tools.bundle.CertificateBundleReader
+
+        Args:
+            path (str): The path of the bundle file
+            certificates (Iterable[SSHCertificate]): The signed certificates
+
+        Returns:
+            int: The number of certificates written
+        """
+        count = [0]
+
+        def lines():
+            for certificate in certificates:
+                count[0] += 1
+                yield self.line(certificate)
+
+        self._replace(self._write_temp(path, lines()), path)
+
+        return count[0]
+
+    def write_stream(
+        self, stream: BinaryIO, certificates: Iterable[SSHCertificate]
+    ) -> int:
+        """
+        Writes all certificates to an open binary stream, e.g. a file or pipe.
+        The stream is flushed but not closed. Unless the fsync policy is
+        FsyncPolicy.NEVER, a stream backed by a regular file is also
+        flushed to disk.
+
+        Args:
+            stream (BinaryIO): The stream to write to
+            certificates (Iterable[SSHCertificate]): The signed certificates
+
+        Returns:
+            int: The number of certificates written
+        """
+        count = self._write_buffered(stream, map(self.line, certificates))
+        stream.flush()
+
+        if self.fsync is not FsyncPolicy.NEVER:
+            try:
+                fileno = stream.fileno()
+            except (AttributeError, OSError):
+                return count
+
+            if stat.S_ISREG(os.fstat(fileno).st_mode):
+                os.fsync(fileno)
+
+        return count
+
+    def _write_buffered(self, stream: BinaryIO, lines: Iterable[bytes]) -> int:
+        """
+        Writes lines to a stream in chunks of the buffer size
+
+        Args:
+            stream (BinaryIO): The stream to write to
+            lines (Iterable[bytes]): The lines to write
+
+        Returns:
+            int: The number of lines written
+        """
+        count, buffer = 0, bytearray()
+        for line in lines:
+            buffer += line
+            count += 1
+
+            if len(buffer) >= self.buffer_size:
+                stream.write(buffer)
+                buffer.clear()
+
+        if buffer:
+            stream.write(buffer)
+
+        return count
+
+    def _write_temp(self, path: str, lines: Iterable[bytes], sync: bool = True) -> str:
+        """
+        Writes lines to a new temporary file next to the target path.
+        The file gets the permissions of the target file if it exists,
+        and is readable by everyone otherwise.
+
+        Args:
+            path (str): The target path
+            lines (Iterable[bytes]): The lines to write
+            sync (bool, optional): Flush the file to disk according to the
+                                   fsync policy. Defaults to True.
+
+        Returns:
+            str: The path of the temporary file
+        """
+        directory, name = os.path.split(os.path.abspath(path))
+        fileno, temp_path = mkstemp(prefix=f".{name}.", suffix=".tmp", dir=directory)
+        try:
+            with os.fdopen(fileno, "wb", buffering=0) as file:
+                try:
+                    mode = stat.S_IMODE(os.stat(path).st_mode)
+                except FileNotFoundError:
+                    mode = 0o644
+                os.chmod(temp_path, mode)
+
+                self._write_buffered(file, lines)
+                if sync:
+                    self._sync(file.fileno())
+        except BaseException:
+            os.unlink(temp_path)
+            raise
+
+        return temp_path
+
+    def _replace(self, temp_path: str, path: str) -> None:
+        """
+        Replaces the target file with a written temporary file
+
+        Args:
+            temp_path (str): The path of the temporary file
+            path (str): The target path
+        """
+        try:
+            os.replace(temp_path, path)
+        except BaseException:
+            os.unlink(temp_path)
+            raise
+
+        self._sync_directory(os.path.dirname(os.path.abspath(path)))
+
+    def _sync(self, fileno: int) -> None:
+        """
+        Flushes an open file to disk, unless the fsync policy is FsyncPolicy.NEVER
+
+        Args:
+            fileno (int): The file descriptor
+        """
+        if self.fsync is not FsyncPolicy.NEVER:
+            os.fsync(fileno)
+
+    def _sync_all(self, paths: List[str]) -> None:
+        """
+        Flushes closed files to disk, all at once with os.sync() if the
+        platform has it, since flushing each file waits for each of them
+
+        Args:
+            paths (List[str]): The paths of the files
+        """
+        if hasattr(os, "sync"):
+            if paths:
+                os.sync()
+            return
+
+        for path in paths:
+            self._sync_path(path)
+
+    def _sync_path(self, path: str) -> None:
+        """
+        Flushes a closed file to disk
+
+        Args:
+            path (str): The path of the file
+        """
+        fileno = os.open(path, os.O_RDWR)
+        try:
+            self._sync(fileno)
+        finally:
+            os.close(fileno)
+
+    def _sync_directory(self, directory: str) -> None:
+        """
+        Flushes a directory to disk, so a replaced file is kept after
+        a crash. Only supported on platforms with O_DIRECTORY.
+
+        Args:
+            directory (str): The path of the directory
+        """
+        if self.fsync is FsyncPolicy.NEVER or not hasattr(os, "O_DIRECTORY"):
+            return
+
+        fileno = os.open(directory or ".", os.O_RDONLY | os.O_DIRECTORY)
+        try:
+            os.fsync(fileno)
+        finally:
+            os.close(fileno)
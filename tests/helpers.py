@@ -0,0 +1,29 @@
+from datetime import datetime, timedelta
+
+import src.sshkey_tools.cert as _CERT
+import src.sshkey_tools.keys as _KEY
+
+
+def create_certificate(
+    ca_privkey, key_id="KeyIdentifier", subject_pubkey=None, sign=False, **fields
+):
+    """
+    Creates a certificate for a new Ed25519 subject key unless one is given,
+    valid for an hour, with the other fields overridden by the keyword arguments
+    """
+    certificate = _CERT.SSHCertificate.create(
+        subject_pubkey=subject_pubkey or _KEY.Ed25519PrivateKey.generate().public_key,
+        ca_privkey=ca_privkey,
+        fields=_CERT.CertificateFields(
+            **{
+                "key_id": key_id,
+                "principals": ["pr_a"],
+                "valid_before": datetime.now() + timedelta(hours=1),
+                **fields,
+            }
+        ),
+    )
+    if sign:
+        certificate.sign()
+
+    return certificate
@@ -0,0 +1,313 @@
+import os
+import shutil
+import socket
+import socketserver
+import tempfile
+import threading
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+from unittest import mock
+
+from cryptography.hazmat.primitives.asymmetric.utils import decode_dss_signature
+
+import src.sshkey_tools.agent as _AGENT
+import src.sshkey_tools.cert as _CERT
+import src.sshkey_tools.exceptions as _EX
+import src.sshkey_tools.fields as _FIELD
+import src.sshkey_tools.keys as _KEY
+from src.sshkey_tools.wire import UINT32, DecodeCursor, EncodeBuffer
+from tests.helpers import create_certificate
+
+RSA_FLAG_ALGS = {
+    _AGENT.SSH_AGENT_RSA_SHA2_512: _KEY.RsaAlgs.SHA512,
+    _AGENT.SSH_AGENT_RSA_SHA2_256: _KEY.RsaAlgs.SHA256,
+}
+
+
+class StandInAgentHandler(socketserver.StreamRequestHandler):
+    def handle(self):
+        with self.server.lock:
+            self.server.connections += 1
+
+        while True:
+            header = self.rfile.read(4)
+            if len(header) < 4:
+                return
+
+            message = self.rfile.read(UINT32.unpack(header)[0])
+            response = EncodeBuffer()
+            start = response.begin_string()
+            self.server.respond(DecodeCursor(message), response)
+            response.end_string(start)
+            self.wfile.write(response.getvalue())
+
+
+# UNIX domain sockets are not available on all platforms, e.g. Windows
+if hasattr(socket, "AF_UNIX"):
+
+    class StandInAgent(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+        """
+        Answers the identity and signing requests of the agent protocol,
+        with the keys it is given
+        """
+
+        daemon_threads = True
+
+        def __init__(self, path, keys, ignore_flags=False):
+            super().__init__(path, StandInAgentHandler)
+            self.keys = {bytes(key.public_key.raw_bytes()): key for key in keys}
+            self.ignore_flags = ignore_flags
+            self.connections = 0
+            self.lock = threading.Lock()
+
+        def respond(self, message, response):
+            message_type = message.read_uint8()
+
+            if message_type == _AGENT.SSH_AGENTC_REQUEST_IDENTITIES:
+                response.write_uint8(_AGENT.SSH_AGENT_IDENTITIES_ANSWER)
+                response.write_uint32(len(self.keys))
+                for index, key_blob in enumerate(self.keys):
+                    response.write_string(key_blob)
+                    response.write_string(f"key{index}".encode("utf-8"))
+                return
+
+            key = self.keys.get(bytes(message.read_string()))
+            if message_type != _AGENT.SSH_AGENTC_SIGN_REQUEST or key is None:
+                response.write_uint8(_AGENT.SSH_AGENT_FAILURE)
+                return
+
+            data = bytes(message.read_string())
+            flags = message.read_uint32()
+            key_blob = key.public_key.raw_bytes()
+
+            signature = EncodeBuffer()
+            if isinstance(key, _KEY.RsaPrivateKey):
+                hash_alg = _KEY.RsaAlgs.SHA1
+                if not self.ignore_flags:
+                    hash_alg = RSA_FLAG_ALGS.get(flags, hash_alg)
+                signature.write_string(hash_alg.value[0].encode("utf-8"))
+                signature.write_string(key.sign(data, hash_alg))
+            elif isinstance(key, _KEY.EcdsaPrivateKey):
+                signature.write_string(DecodeCursor(key_blob).read_string())
+                start = signature.begin_string()
+                for value in decode_dss_signature(key.sign(data)):
+                    _FIELD.MpIntegerField.write(signature, value)
+                signature.end_string(start)
+            else:
+                signature.write_string(b"ssh-ed25519")
+                signature.write_string(key.sign(data))
+
+            response.write_uint8(_AGENT.SSH_AGENT_SIGN_RESPONSE)
+            response.write_string(signature.getvalue())
+
+
+@unittest.skipUnless(hasattr(socket, "AF_UNIX"), "Requires UNIX domain sockets")
+class TestAgent(unittest.TestCase):
+    def setUp(self):
+        self.folder = tempfile.mkdtemp()
+        self.path = os.path.join(self.folder, "agent.sock")
+
+        self.rsa_ca = _KEY.RsaPrivateKey.generate(1024)
+        self.ecdsa_ca = _KEY.EcdsaPrivateKey.generate(_KEY.EcdsaCurves.P384)
+        self.ed25519_ca = _KEY.Ed25519PrivateKey.generate()
+        self.agent = self.start_agent()
+
+    def tearDown(self):
+        self.agent.shutdown()
+        self.agent.server_close()
+        shutil.rmtree(self.folder)
+
+    def start_agent(self, **kwargs):
+        agent = StandInAgent(
+            self.path, [self.rsa_ca, self.ecdsa_ca, self.ed25519_ca], **kwargs
+        )
+        threading.Thread(target=agent.serve_forever, daemon=True).start()
+        return agent
+
+    def test_request_identities(self):
+        with _AGENT.AgentClient(self.path) as client:
+            identities = client.request_identities()
+
+        self.assertEqual(
+            identities,
+            [
+                (self.rsa_ca.public_key, "key0"),
+                (self.ecdsa_ca.public_key, "key1"),
+                (self.ed25519_ca.public_key, "key2"),
+            ],
+        )
+
+    def test_from_agent(self):
+        with _AGENT.AgentClient(self.path) as client:
+            key = _AGENT.AgentPrivateKey.from_agent(
+                self.ecdsa_ca.get_fingerprint(), client=client
+            )
+            self.assertEqual(key.public_key, self.ecdsa_ca.public_key)
+            self.assertEqual(key.comment, "key1")
+
+            key = _AGENT.AgentPrivateKey.from_agent(
+                self.rsa_ca.get_fingerprint(_KEY.FingerprintHashes.MD5), client=client
+            )
+            self.assertEqual(key.public_key, self.rsa_ca.public_key)
+
+            key = _AGENT.AgentPrivateKey.from_agent(
+                public_key=self.ed25519_ca.public_key, client=client
+            )
+            self.assertEqual(key.get_fingerprint(), self.ed25519_ca.get_fingerprint())
+
+            with self.assertRaises(_EX.InvalidKeyException):
+                _AGENT.AgentPrivateKey.from_agent(
+                    _KEY.Ed25519PrivateKey.generate().get_fingerprint(), client=client
+                )
+
+            with self.assertRaises(_EX.InvalidKeyException):
+                _AGENT.AgentPrivateKey.from_agent("SHA1:abcdef", client=client)
+
+            with self.assertRaises(_EX.InvalidKeyException):
+                _AGENT.AgentPrivateKey.from_agent(client=client)
+
+            with self.assertRaises(_EX.InvalidKeyException):
+                key.to_string()
+
+    def test_owned_client(self):
+        with _AGENT.AgentPrivateKey.from_agent(
+            public_key=self.ed25519_ca.public_key, path=self.path
+        ) as key:
+            self.assertTrue(key.owns_client)
+            certificate = create_certificate(key)
+            certificate.sign()
+            self.assertTrue(certificate.verify(self.ed25519_ca.public_key, True))
+            connections = list(key.client.connections)
+
+        self.assertEqual(key.client.connections, [])
+        self.assertTrue(all(connection.closed for connection in connections))
+
+        # The client is closed when the key is not found as well
+        with mock.patch.object(_AGENT.AgentClient, "close", autospec=True) as close:
+            with self.assertRaises(_EX.InvalidKeyException):
+                _AGENT.AgentPrivateKey.from_agent(
+                    _KEY.Ed25519PrivateKey.generate().get_fingerprint(),
+                    path=self.path,
+                )
+
+            close.assert_called_once()
+
+        _AGENT.AgentClient.close(close.call_args.args[0])
+
+        # A client passed in is left open
+        with _AGENT.AgentClient(self.path) as client:
+            with _AGENT.AgentPrivateKey.from_agent(
+                public_key=self.ed25519_ca.public_key, client=client
+            ) as key:
+                self.assertFalse(key.owns_client)
+                key.sign(b"data")
+
+            self.assertEqual(len(client.connections), 1)
+
+    def test_sign_certificates(self):
+        with _AGENT.AgentClient(self.path) as client:
+            for ca in (self.rsa_ca, self.ecdsa_ca, self.ed25519_ca):
+                key = _AGENT.AgentPrivateKey.from_agent(
+                    public_key=ca.public_key, client=client
+                )
+
+                certificate = create_certificate(key)
+                certificate.sign()
+                self.assertTrue(certificate.verify(ca.public_key, True))
+
+                certificate = create_certificate(self.rsa_ca)
+                certificate.replace_ca(key)
+                certificate.sign()
+                self.assertTrue(certificate.verify(ca.public_key, True))
+
+            key = _AGENT.AgentPrivateKey.from_agent(
+                public_key=self.rsa_ca.public_key, client=client
+            )
+            certificate = create_certificate(key)
+            certificate.sign(hash_alg=_KEY.RsaAlgs.SHA256)
+            self.assertEqual(certificate.footer.signature.hash_alg, _KEY.RsaAlgs.SHA256)
+            self.rsa_ca.public_key.verify(
+                certificate.get_signable(),
+                certificate.get("signature"),
+                _KEY.RsaAlgs.SHA256,
+            )
+
+            with self.assertRaises(_EX.SignatureNotPossibleException):
+                certificate.sign(digest=certificate.get_digest())
+
+    def test_pipelined_requests(self):
+        with _AGENT.AgentClient(self.path, max_connections=1) as client:
+            key_blob = self.ed25519_ca.public_key.raw_bytes()
+            futures = [
+                client.submit_sign(key_blob, f"data{i}".encode("utf-8"))
+                for i in range(32)
+            ]
+
+            for i, future in enumerate(futures):
+                signature = client.check_response(
+                    future.result(), _AGENT.SSH_AGENT_SIGN_RESPONSE
+                ).read_cursor()
+                signature.skip_string()
+                self.ed25519_ca.public_key.verify(
+                    f"data{i}".encode("utf-8"), bytes(signature.read_string())
+                )
+
+            key = _AGENT.AgentPrivateKey.from_agent(
+                public_key=self.ecdsa_ca.public_key, client=client
+            )
+            certificates = [
+                create_certificate(key, f"KeyIdentifier{i}") for i in range(16)
+            ]
+            with ThreadPoolExecutor(max_workers=8) as executor:
+                results = _CERT.SSHCertificate.sign_many(certificates, executor)
+
+            self.assertEqual(results, [True] * 16)
+            for certificate in certificates:
+                self.assertTrue(certificate.verify(self.ecdsa_ca.public_key, True))
+
+        self.assertEqual(self.agent.connections, 1)
+
+    def test_refused_requests(self):
+        with _AGENT.AgentClient(self.path) as client:
+            key = _AGENT.AgentPrivateKey(
+                _KEY.Ed25519PrivateKey.generate().public_key, client
+            )
+            with self.assertRaises(_EX.SignatureNotPossibleException):
+                key.sign(b"data")
+
+            # The connection stays usable after a refused request
+            key = _AGENT.AgentPrivateKey(self.ed25519_ca.public_key, client)
+            self.ed25519_ca.public_key.verify(b"data", key.sign(b"data"))
+
+        self.agent.shutdown()
+        self.agent.server_close()
+        os.unlink(self.path)
+        self.agent = self.start_agent(ignore_flags=True)
+
+        with _AGENT.AgentClient(self.path) as client:
+            key = _AGENT.AgentPrivateKey(self.rsa_ca.public_key, client)
+            with self.assertRaises(_EX.SignatureNotPossibleException):
+                key.sign(b"data", _KEY.RsaAlgs.SHA512)
+
+    def test_closed_connection(self):
+        client = _AGENT.AgentClient(self.path)
+        self.assertEqual(len(client.request_identities()), 3)
+
+        connection = client.connections[0]
+        connection.close()
+        self.assertTrue(connection.closed)
+        with self.assertRaises(ConnectionError):
+            connection.submit(b"")
+
+        self.assertEqual(len(client.request_identities()), 3)
+        self.assertEqual(len(client.connections), 1)
+        self.assertEqual(self.agent.connections, 2)
+        client.close()
+
+        with mock.patch.dict(os.environ, {"SSH_AUTH_SOCK": ""}):
+            with self.assertRaises(_EX.SignatureNotPossibleException):
+                _AGENT.AgentClient()
+
+
+if __name__ == "__main__":
+    unittest.main()
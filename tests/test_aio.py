@@ -0,0 +1,93 @@
+import asyncio
+import os
+import shutil
+import threading
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+
+import src.sshkey_tools.aio as _AIO
+import src.sshkey_tools.cert as _CERT
+import src.sshkey_tools.exceptions as _EX
+import src.sshkey_tools.keys as _KEY
+from tests.helpers import create_certificate
+
+
+class TestAsyncRunner(unittest.IsolatedAsyncioTestCase):
+    def setUp(self):
+        self.folder = "tests/aio"
+        if os.path.isdir(self.folder):
+            shutil.rmtree(self.folder)
+        os.mkdir(self.folder)
+
+        self.ca = _KEY.EcdsaPrivateKey.generate()
+
+    def tearDown(self):
+        shutil.rmtree(self.folder)
+
+    async def test_sign_and_verify(self):
+        certificate = create_certificate(self.ca)
+        self.assertTrue(await _AIO.sign(certificate))
+        self.assertTrue(await _AIO.verify(certificate, self.ca.public_key))
+
+        certificate.to_file(f"{self.folder}/cert.pub")
+        loaded = await _AIO.load_certificate(f"{self.folder}/cert.pub")
+        self.assertEqual(bytes(loaded), bytes(certificate))
+
+        loaded.set("key_id", "Modified")
+        self.assertFalse(await _AIO.verify(loaded, self.ca.public_key))
+        with self.assertRaises(_EX.InvalidSignatureException):
+            await _AIO.verify(loaded, self.ca.public_key, True)
+
+        with self.assertRaises(_EX.SignatureNotPossibleException):
+            await _AIO.sign(
+                _CERT.SSHCertificate.create(
+                    subject_pubkey=self.ca.public_key,
+                )
+            )
+
+    async def test_keys(self):
+        key = await _AIO.generate(_KEY.RsaPrivateKey, key_size=1024)
+        self.assertIsInstance(key, _KEY.RsaPrivateKey)
+        self.assertIsInstance(await _AIO.generate(), _KEY.Ed25519PrivateKey)
+
+        key.to_file(f"{self.folder}/key", "password")
+        loaded = await _AIO.load_private_key(f"{self.folder}/key", "password")
+        self.assertEqual(loaded.public_key, key.public_key)
+
+    async def test_max_concurrency(self):
+        runner = _AIO.AsyncRunner(ThreadPoolExecutor(8), max_concurrency=2)
+        running, peak, lock = [0], [0], threading.Lock()
+
+        def work():
+            with lock:
+                running[0] += 1
+                peak[0] = max(peak[0], running[0])
+            threading.Event().wait(0.02)
+            with lock:
+                running[0] -= 1
+
+        await asyncio.gather(*[runner.run(work) for _ in range(8)])
+        self.assertEqual(peak[0], 2)
+
+    async def test_cancel(self):
+        executor = ThreadPoolExecutor(1)
+        runner = _AIO.AsyncRunner(executor)
+        release = threading.Event()
+        executor.submit(release.wait)
+
+        certificate = create_certificate(self.ca)
+        task = asyncio.ensure_future(runner.sign(certificate))
+        await asyncio.sleep(0.01)
+        task.cancel()
+        with self.assertRaises(asyncio.CancelledError):
+            await task
+
+        release.set()
+        self.assertFalse(certificate.footer.signature.is_signed)
+        self.assertTrue(await runner.sign(certificate))
+        self.assertTrue(certificate.verify(self.ca.public_key))
+        executor.shutdown()
+
+
+if __name__ == "__main__":
+    unittest.main()
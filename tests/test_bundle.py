@@ -0,0 +1,152 @@
+import os
+import shutil
+import unittest
+
+import src.sshkey_tools.cert as _CERT
+import src.sshkey_tools.exceptions as _EX
+import src.sshkey_tools.keys as _KEY
+from src.sshkey_tools.bundle import (
+    BundleReader,
+    CertificateBundleReader,
+    PublicKeyBundleReader,
+)
+
+
+class TestBundleReader(unittest.TestCase):
+    def setUp(self):
+        self.folder = "tests/bundles"
+        if os.path.isdir(self.folder):
+            shutil.rmtree(self.folder)
+        os.mkdir(self.folder)
+
+        self.ca = _KEY.Ed25519PrivateKey.generate()
+        self.keys = [
+            _KEY.RsaPrivateKey.generate(1024).public_key,
+            _KEY.EcdsaPrivateKey.generate().public_key,
+            _KEY.Ed25519PrivateKey.generate().public_key,
+        ]
+
+        self.certificates = []
+        for i, key in enumerate(self.keys):
+            certificate = _CERT.SSHCertificate.create(
+                subject_pubkey=key,
+                ca_privkey=self.ca,
+                fields=_CERT.CertificateFields(
+                    serial=i, key_id=f"KeyIdentifier{i}", principals=["pr_a"]
+                ),
+            )
+            certificate.sign()
+            self.certificates.append(certificate)
+
+    def tearDown(self):
+        shutil.rmtree(self.folder)
+
+    def write_bundle(self, name, lines):
+        path = f"{self.folder}/{name}"
+        with open(path, "w", encoding="utf-8") as file:
+            file.write("".join(lines))
+
+        return path
+
+    def test_certificate_bundle(self):
+        path = self.write_bundle(
+            "certificates",
+            ["# Certificate bundle\n", "\n"]
+            + [f"  {cert.to_string('user@host')}\r\n" for cert in self.certificates]
+            + ["   \n", self.certificates[0].to_string()],
+        )
+
+        with CertificateBundleReader(path) as reader:
+            parsed = list(reader)
+            self.assertEqual(len(parsed), 4)
+            self.assertEqual(len(reader), 4)
+
+            for certificate, original in zip(parsed, self.certificates):
+                self.assertEqual(bytes(certificate), bytes(original))
+                self.assertTrue(certificate.verify(self.ca.public_key))
+
+            self.assertEqual(reader[1].get("key_id"), "KeyIdentifier1")
+            self.assertEqual(reader[-1].get("key_id"), "KeyIdentifier0")
+            self.assertEqual(bytes(reader[2]), bytes(self.certificates[2]))
+
+            with self.assertRaises(IndexError):
+                _ = reader[4]
+
+        self.assertTrue(reader.closed)
+        self.assertEqual(parsed[2].get("key_id"), "KeyIdentifier2")
+
+        with self.assertRaises(_EX.InvalidDataException):
+            _ = list(reader)
+
+        with CertificateBundleReader(path, lazy=True) as reader:
+            self.assertEqual(reader[0].get("key_id"), "KeyIdentifier0")
+
+    def test_public_key_bundle(self):
+        path = self.write_bundle(
+            "keys",
+            [f"{key.to_string()} user{i}@host\n" for i, key in enumerate(self.keys)],
+        )
+
+        with PublicKeyBundleReader(path) as reader:
+            for key, original in zip(reader, self.keys):
+                self.assertIsInstance(key, original.__class__)
+                self.assertEqual(key.raw_bytes(), original.raw_bytes())
+
+            self.assertEqual(reader[2].comment, b"user2@host")
+
+        # Tabs separate the fields as well as spaces
+        path = self.write_bundle(
+            "tabs",
+            [
+                "\t".join(key.to_string().split(" ")) + f"\t \tuser{i}@host\n"
+                for i, key in enumerate(self.keys)
+            ],
+        )
+
+        with PublicKeyBundleReader(path) as reader:
+            for key, original in zip(reader, self.keys):
+                self.assertEqual(key.raw_bytes(), original.raw_bytes())
+
+            self.assertEqual(reader[1].comment, b"user1@host")
+
+    def test_closed_while_reading(self):
+        path = self.write_bundle(
+            "certificates", [f"{cert.to_string()}\n" for cert in self.certificates]
+        )
+
+        reader = CertificateBundleReader(path)
+        entries = iter(reader)
+        self.assertEqual(next(entries).get("key_id"), "KeyIdentifier0")
+
+        reader.close()
+        with self.assertRaises(_EX.InvalidDataException):
+            next(entries)
+
+    def test_invalid_entries(self):
+        key_data = self.keys[2].to_string().split(" ")[1]
+        path = self.write_bundle(
+            "invalid", ["no-data\n", f"ssh-rsa {key_data}\n", f"ssh-ed25519 {key_data}"]
+        )
+
+        with PublicKeyBundleReader(path) as reader:
+            with self.assertRaises(_EX.InvalidDataException):
+                _ = reader[0]
+
+            with self.assertRaises(_EX.InvalidKeyException):
+                _ = reader[1]
+
+            self.assertIsInstance(reader[2], _KEY.Ed25519PublicKey)
+
+        with self.assertRaises(_EX.InvalidClassCallException):
+            _ = BundleReader(path)
+
+    def test_empty_bundle(self):
+        path = self.write_bundle("empty", [])
+
+        with CertificateBundleReader(path) as reader:
+            self.assertEqual(list(reader), [])
+            self.assertEqual(len(reader), 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
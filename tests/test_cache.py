@@ -0,0 +1,174 @@
+import unittest
+from copy import copy
+from datetime import datetime, timedelta
+
+import src.sshkey_tools.cert as _CERT
+import src.sshkey_tools.exceptions as _EX
+import src.sshkey_tools.keys as _KEY
+from src.sshkey_tools.cache import CertificateCache, VerificationCache
+from tests.helpers import create_certificate
+
+
+class TestCertificateCache(unittest.TestCase):
+    def setUp(self):
+        self.now = datetime.now().timestamp()
+        self.ca = _KEY.Ed25519PrivateKey.generate()
+        self.user = _KEY.Ed25519PrivateKey.generate().public_key
+
+    def create_certificate(self, key_id="KeyIdentifier", valid_before="1w"):
+        certificate = create_certificate(
+            self.ca,
+            key_id,
+            subject_pubkey=self.user,
+            sign=True,
+            principals=["pr_a", "pr_b"],
+            valid_before=valid_before,
+            critical_options={"force-command": "sftp-internal"},
+        )
+        return bytes(certificate)
+
+    def test_hits_and_misses(self):
+        cache = CertificateCache()
+        cert_bytes = self.create_certificate()
+
+        first = _CERT.SSHCertificate.from_bytes(cert_bytes, cache=cache)
+        second = _CERT.SSHCertificate.from_bytes(cert_bytes, cache=cache)
+        third = _CERT.SSHCertificate.from_string(
+            second.to_string(), cache=cache, lazy=True
+        )
+
+        self.assertEqual(cache.stats["misses"], 1)
+        self.assertEqual(cache.stats["hits"], 2)
+        self.assertEqual(len(cache), 1)
+        self.assertIn(CertificateCache.key(cert_bytes), cache)
+
+        self.assertIsNot(first, second)
+        self.assertEqual(bytes(first), bytes(second))
+        self.assertEqual(bytes(second), bytes(third))
+        self.assertTrue(third.verify(self.ca.public_key))
+
+    def test_copies_are_independent(self):
+        cache = CertificateCache()
+        cert_bytes = self.create_certificate()
+
+        first = _CERT.SSHCertificate.from_bytes(cert_bytes, cache=cache)
+        first.set("key_id", "Modified")
+        first.get("principals").append("pr_c")
+        first.get("critical_options")["source-address"] = "1.2.3.4/32"
+
+        second = _CERT.SSHCertificate.from_bytes(cert_bytes, cache=cache)
+        self.assertEqual(second.get("key_id"), "KeyIdentifier")
+        self.assertEqual(second.get("principals"), ["pr_a", "pr_b"])
+        self.assertEqual(
+            second.get("critical_options"), {"force-command": "sftp-internal"}
+        )
+        self.assertEqual(bytes(second), cert_bytes)
+
+        second.replace_ca(_KEY.Ed25519PrivateKey.generate())
+        second.sign()
+        self.assertEqual(
+            bytes(_CERT.SSHCertificate.from_bytes(cert_bytes, cache=cache)), cert_bytes
+        )
+
+    def test_lru_eviction(self):
+        cache = CertificateCache(maxsize=2)
+        blobs = [self.create_certificate(f"KeyIdentifier{i}") for i in range(3)]
+
+        _CERT.SSHCertificate.from_bytes(blobs[0], cache=cache)
+        _CERT.SSHCertificate.from_bytes(blobs[1], cache=cache)
+        _CERT.SSHCertificate.from_bytes(blobs[0], cache=cache)
+        _CERT.SSHCertificate.from_bytes(blobs[2], cache=cache)
+
+        self.assertEqual(cache.stats["evictions"], 1)
+        self.assertIn(CertificateCache.key(blobs[0]), cache)
+        self.assertNotIn(CertificateCache.key(blobs[1]), cache)
+        self.assertIn(CertificateCache.key(blobs[2]), cache)
+
+    def test_expiry(self):
+        clock = [self.now]
+        cache = CertificateCache(clock=lambda: clock[0])
+
+        short = self.create_certificate(
+            valid_before=datetime.now() + timedelta(minutes=5)
+        )
+        long = self.create_certificate(valid_before=datetime.now() + timedelta(hours=5))
+        _CERT.SSHCertificate.from_bytes(short, cache=cache)
+        _CERT.SSHCertificate.from_bytes(long, cache=cache)
+        self.assertEqual(len(cache), 2)
+
+        clock[0] += 600
+        self.assertIsNone(cache.get(CertificateCache.key(short)))
+        self.assertEqual(cache.stats["expirations"], 1)
+        self.assertIsNotNone(cache.get(CertificateCache.key(long)))
+
+        clock[0] += 86400
+        cache.clear()
+        _CERT.SSHCertificate.from_bytes(long, cache=cache)
+        self.assertNotIn(CertificateCache.key(long), cache)
+
+    def test_copy(self):
+        certificate = _CERT.SSHCertificate.from_bytes(self.create_certificate())
+        copied = copy(certificate)
+
+        self.assertIsInstance(copied, _CERT.Ed25519Certificate)
+        self.assertIsNot(copied.fields.key_id, certificate.fields.key_id)
+        self.assertEqual(bytes(copied), bytes(certificate))
+
+
+class TestVerificationCache(unittest.TestCase):
+    def setUp(self):
+        self.ca = _KEY.RsaPrivateKey.generate(1024)
+        self.certificate = create_certificate(self.ca, sign=True)
+
+    def test_cached_verification(self):
+        cache = VerificationCache()
+
+        self.assertTrue(self.certificate.verify(self.ca.public_key, cache=cache))
+        self.assertEqual(cache.stats["misses"], 1)
+        self.assertEqual(len(cache), 1)
+
+        reloaded = _CERT.SSHCertificate.from_string(self.certificate.to_string())
+        self.assertTrue(reloaded.verify(self.ca.public_key, cache=cache))
+        self.assertEqual(cache.stats["hits"], 1)
+
+        # Another key does not match the cached entry
+        other_ca = _KEY.RsaPrivateKey.generate(1024)
+        self.assertFalse(reloaded.verify(other_ca.public_key, cache=cache))
+        self.assertEqual(len(cache), 1)
+
+    def test_failures_not_cached(self):
+        cache = VerificationCache()
+
+        self.certificate.set("key_id", "Modified")
+        self.assertFalse(self.certificate.verify(self.ca.public_key, cache=cache))
+        self.assertEqual(len(cache), 0)
+
+        with self.assertRaises(_EX.InvalidSignatureException):
+            self.certificate.verify(self.ca.public_key, True, cache=cache)
+
+    def test_expiry(self):
+        clock = [datetime.now().timestamp()]
+        cache = VerificationCache(ttl=600, clock=lambda: clock[0])
+        key = VerificationCache.key(
+            self.certificate.get_signable(),
+            self.ca.public_key,
+            bytes(self.certificate.footer.signature),
+        )
+
+        self.certificate.verify(self.ca.public_key, cache=cache)
+        self.assertTrue(cache.is_verified(key))
+
+        # The TTL ends before the certificate expires
+        clock[0] += 601
+        self.assertFalse(cache.is_verified(key))
+
+        # The certificate expires before the TTL ends
+        cache.ttl = 7200
+        self.certificate.verify(self.ca.public_key, cache=cache)
+        clock[0] += 3000
+        self.assertFalse(cache.is_verified(key))
+        self.assertEqual(cache.stats["expirations"], 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
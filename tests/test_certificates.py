@@ -4,10 +4,15 @@
 # to/from file and string
 # Generated by ssh-keygen and decoded by script, created by script and verified by ssh-keygen
 
+import hashlib
 import os
 import random
 import shutil
+import time
 import unittest
+from concurrent.futures import ThreadPoolExecutor
+from copy import copy
+from unittest import mock
 
 import faker
 
@@ -17,6 +22,7 @@ import src.sshkey_tools.cert as _CERT
 import src.sshkey_tools.exceptions as _EX
 import src.sshkey_tools.fields as _FIELD
 import src.sshkey_tools.keys as _KEY
+from src.sshkey_tools.wire import EncodeBuffer
 
 CERTIFICATE_TYPES = ["rsa", "ecdsa", "ed25519"]
 
@@ -197,6 +203,40 @@ class TestCertificateFields(unittest.TestCase):
         with self.assertRaises(_EX.InvalidDataException):
             field.encode(ValueError)
 
+    def test_kept_encoding(self):
+        field = _FIELD.PrincipalsField(["pr_a", "pr_b"])
+        encoded = field.encoded
+
+        self.assertIs(field.encoded, encoded)
+        self.assertEqual(encoded, _FIELD.PrincipalsField.encode(["pr_a", "pr_b"]))
+        self.assertTrue(field.validate())
+
+        field.value = ["pr_c"]
+        self.assertEqual(field.encoded, _FIELD.PrincipalsField.encode(["pr_c"]))
+        self.assertTrue(field.validate())
+
+        # Changes in place are noticed without invalidating the field
+        revision = field.revision
+        field.value.append("pr_d")
+        self.assertEqual(field.encoded, _FIELD.PrincipalsField.encode(["pr_c", "pr_d"]))
+        self.assertGreater(field.revision, revision)
+
+        field.value.append(ValueError)
+        self.assertFalse(field.validate())
+
+        field = _FIELD.CriticalOptionsField({"force-command": "sftp-internal"})
+        self.assertTrue(field.validate())
+        field.value["no-such-option"] = ""
+        self.assertFalse(field.validate())
+
+        # Relative times are encoded against the current time every time
+        field = _FIELD.ValidBeforeField("1w")
+        self.assertIsNot(field.encoded, field.encoded)
+        self.assertTrue(field.validate())
+
+        field.value = 1
+        self.assertFalse(field.validate())
+
     def test_key_value_field(self):
         self.assertRandomResponse(
             _FIELD.KeyValueField,
@@ -585,6 +625,596 @@ class TestCertificates(unittest.TestCase):
 
         self.assertEqual(certificate.get_signable(), reloaded_cert.get_signable())
 
+    def test_decode_buffer_types(self):
+        certificate = _CERT.SSHCertificate.create(
+            subject_pubkey=self.ed25519_user,
+            ca_privkey=self.ed25519_ca,
+            fields=self.cert_fields,
+        )
+        certificate.sign()
+        cert_bytes = bytes(certificate)
+
+        for buffer in (cert_bytes, bytearray(cert_bytes), memoryview(cert_bytes)):
+            decoded = _CERT.SSHCertificate.from_bytes(buffer)
+
+            self.assertIsInstance(decoded, _CERT.Ed25519Certificate)
+            self.assertEqual(decoded.get_signable(), certificate.get_signable())
+            self.assertTrue(decoded.verify(self.ed25519_ca.public_key))
+
+        with self.assertRaises(_EX.InvalidDataException):
+            _CERT.SSHCertificate.from_bytes(cert_bytes[:-10])
+
+    def test_lazy_decoding(self):
+        for ca_type in CERTIFICATE_TYPES:
+            for user_type in CERTIFICATE_TYPES:
+                certificate = _CERT.SSHCertificate.create(
+                    subject_pubkey=getattr(self, f"{user_type}_user"),
+                    ca_privkey=getattr(self, f"{ca_type}_ca"),
+                    fields=self.cert_fields,
+                )
+                certificate.sign()
+                cert_string = certificate.to_string()
+
+                eager = _CERT.SSHCertificate.from_string(cert_string)
+                lazy = _CERT.SSHCertificate.from_string(cert_string, lazy=True)
+
+                self.assertIs(type(eager), type(lazy))
+                self.assertEqual(lazy.get("key_id"), "KeyIdentifier")
+
+                # Only the accessed field has been decoded
+                self.assertIsNotNone(lazy.header.public_key._raw)
+                self.assertIsNotNone(lazy.footer.ca_pubkey._raw)
+                self.assertIsNotNone(lazy.footer.signature._raw)
+
+                self.assertEqual(bytes(eager), bytes(lazy))
+                self.assertEqual(eager.get_signable(), lazy.get_signable())
+                self.assertIsNotNone(lazy.header.public_key._raw)
+
+                self.assertTrue(lazy.verify(getattr(self, f"{ca_type}_ca").public_key))
+                self.assertTrue(lazy.verify())
+
+                for section in ("header", "fields", "footer"):
+                    for name in getattr(eager, section).getattrs():
+                        self.assertEqual(
+                            bytes(getattr(getattr(eager, section), name)),
+                            bytes(getattr(getattr(lazy, section), name)),
+                        )
+                        if name not in ("public_key", "ca_pubkey"):
+                            self.assertEqual(eager.get(name), lazy.get(name))
+
+                self.assertEqual(
+                    eager.get("public_key").raw_bytes(),
+                    lazy.get("public_key").raw_bytes(),
+                )
+                self.assertEqual(
+                    eager.get("ca_pubkey").raw_bytes(),
+                    lazy.get("ca_pubkey").raw_bytes(),
+                )
+                self.assertEqual(str(eager), str(lazy))
+
+    def test_write_to_buffer(self):
+        certificate = _CERT.SSHCertificate.create(
+            subject_pubkey=self.rsa_user,
+            ca_privkey=self.ecdsa_ca,
+            fields=self.cert_fields,
+        )
+        certificate.sign()
+        cert_bytes = bytes(certificate)
+
+        buffer = EncodeBuffer()
+        buffer.write(b"prefix")
+        certificate.write_to(buffer)
+        self.assertEqual(buffer.getvalue(), b"prefix" + cert_bytes)
+
+        buffer = EncodeBuffer()
+        certificate.write_to(buffer, signature=False)
+        self.assertEqual(buffer.getvalue(), certificate.get_signable())
+        self.assertTrue(cert_bytes.startswith(certificate.get_signable()))
+
+        lazy = _CERT.SSHCertificate.from_bytes(cert_bytes, lazy=True)
+        buffer = EncodeBuffer()
+        lazy.write_to(buffer)
+        self.assertEqual(buffer.getvalue(), cert_bytes)
+        self.assertIsNotNone(lazy.footer.signature._raw)
+
+    def test_cached_encoding(self):
+        certificate = _CERT.SSHCertificate.create(
+            subject_pubkey=self.ed25519_user,
+            ca_privkey=self.ed25519_ca,
+            fields=copy(self.cert_fields),
+        )
+        certificate.sign()
+
+        cert_bytes = bytes(certificate)
+        self.assertIs(bytes(certificate), cert_bytes)
+        self.assertIs(certificate.get_signable(), certificate.get_signable())
+        self.assertTrue(certificate.verify(self.ed25519_ca.public_key))
+
+        # Each way of changing a field drops the cached encodings
+        changes = (
+            lambda: certificate.set("key_id", "ModifiedKeyId"),
+            lambda: setattr(certificate.fields, "serial", 1234),
+            lambda: certificate.header.replace_field(
+                "nonce", _FIELD.NonceField("abcdefghijklmnopqrstuvwxyz")
+            ),
+            lambda: certificate.replace_ca(self.rsa_ca),
+        )
+        for change in changes:
+            signable = certificate.get_signable()
+            change()
+            self.assertNotEqual(certificate.get_signable(), signable)
+
+        certificate.sign()
+        self.assertNotEqual(bytes(certificate), cert_bytes)
+        self.assertTrue(certificate.verify(self.rsa_ca.public_key))
+
+        reloaded = _CERT.SSHCertificate.from_bytes(bytes(certificate))
+        self.assertEqual(reloaded.get("key_id"), "ModifiedKeyId")
+        self.assertEqual(reloaded.get("serial"), 1234)
+
+        # Setting the value of a field directly also drops them
+        for loaded in (certificate, reloaded):
+            loaded.replace_ca(self.ed25519_ca)
+            loaded.sign()
+            bytes(loaded)
+            loaded.fields.serial.value = 99
+            loaded.sign()
+
+            decoded = _CERT.SSHCertificate.from_bytes(bytes(loaded))
+            self.assertEqual(decoded.get("serial"), 99)
+            self.assertTrue(decoded.verify(self.ed25519_ca.public_key))
+
+        # Changes in place are noticed, on created and on decoded certificates
+        certificate.get("principals").append("pr_d")
+        certificate.sign()
+        self.assertEqual(
+            _CERT.SSHCertificate.from_bytes(bytes(certificate)).get("principals"),
+            ["pr_a", "pr_b", "pr_c", "pr_d"],
+        )
+
+        for loaded in (certificate, _CERT.SSHCertificate.from_bytes(bytes(certificate))):
+            loaded.replace_ca(self.ed25519_ca)
+            signable = loaded.get_signable()
+            loaded.fields.principals.value.remove("pr_a")
+            loaded.fields.critical_options.value["force-command"] = "/bin/true"
+            self.assertNotEqual(loaded.get_signable(), signable)
+            loaded.sign()
+
+            decoded = _CERT.SSHCertificate.from_bytes(bytes(loaded))
+            self.assertEqual(decoded.get("principals"), ["pr_b", "pr_c", "pr_d"])
+            self.assertEqual(
+                decoded.get("critical_options")["force-command"], "/bin/true"
+            )
+            self.assertTrue(decoded.verify(self.ed25519_ca.public_key))
+
+        copied = copy(certificate)
+        self.assertIs(bytes(copied), bytes(certificate))
+        copied.set("key_id", "CopiedKeyId")
+        self.assertNotEqual(copied.get_signable(), certificate.get_signable())
+
+    def test_signing_encodes_once(self):
+        certificate = _CERT.SSHCertificate.create(
+            subject_pubkey=self.ed25519_user,
+            ca_privkey=self.ed25519_ca,
+            fields=copy(self.cert_fields),
+        )
+
+        with mock.patch.object(
+            _CERT.CertificateFields,
+            "write_to",
+            autospec=True,
+            side_effect=_CERT.CertificateFields.write_to,
+        ) as write_to:
+            certificate.sign()
+            cert_str = certificate.to_string()
+            certificate.to_string()
+
+            self.assertEqual(write_to.call_count, 1)
+
+            # A new signature only changes the encoding of the whole certificate
+            signature = certificate.footer.signature.value
+            certificate.set_signature(signature)
+            self.assertEqual(certificate.to_string(), cert_str)
+            self.assertEqual(write_to.call_count, 1)
+
+    def test_renewal(self):
+        certificate = _CERT.SSHCertificate.create(
+            subject_pubkey=self.rsa_user,
+            ca_privkey=self.ed25519_ca,
+            fields=copy(self.cert_fields),
+        )
+        certificate.sign()
+        public_key = certificate.header.public_key.encoded
+        principals = certificate.fields.principals.encoded
+
+        certificate.fields.serial = 1234
+        certificate.fields.valid_after = 1968491469
+        certificate.fields.valid_before = 1968534669
+        certificate.sign()
+
+        # Only the changed fields are encoded again
+        self.assertIs(certificate.header.public_key.encoded, public_key)
+        self.assertIs(certificate.fields.principals.encoded, principals)
+
+        renewed = _CERT.SSHCertificate.from_bytes(bytes(certificate))
+        self.assertEqual(renewed.get("serial"), 1234)
+        self.assertEqual(renewed.get("valid_after"), datetime.fromtimestamp(1968491469))
+        self.assertEqual(renewed.get("principals"), ["pr_a", "pr_b", "pr_c"])
+        self.assertTrue(renewed.verify(self.ed25519_ca.public_key))
+
+        renewed.invalidate()
+        self.assertEqual(bytes(renewed), bytes(certificate))
+
+    def test_relative_validity_signed_once(self):
+        certificate = _CERT.SSHCertificate.create(
+            subject_pubkey=self.ed25519_user,
+            ca_privkey=self.ed25519_ca,
+            fields=_CERT.CertificateFields(
+                key_id="KeyIdentifier", principals=["pr_a"], valid_before="1w"
+            ),
+        )
+        certificate.sign()
+        cert_bytes = bytes(certificate)
+
+        time.sleep(1.1)
+        self.assertEqual(bytes(certificate), cert_bytes)
+        self.assertTrue(certificate.verify(self.ed25519_ca.public_key))
+
+    def test_sign_many(self):
+        certificates = []
+        for ca in (self.rsa_ca, self.ecdsa_ca, self.ed25519_ca):
+            certificate = _CERT.SSHCertificate.create(
+                subject_pubkey=self.ed25519_user,
+                ca_privkey=ca,
+                fields=copy(self.cert_fields),
+            )
+            certificates.append(certificate)
+
+        unsignable = _CERT.SSHCertificate.create(
+            subject_pubkey=self.ed25519_user, fields=copy(self.cert_fields)
+        )
+        certificates.insert(1, unsignable)
+
+        results = _CERT.SSHCertificate.sign_many(
+            certificates, max_workers=2, hash_alg=_KEY.RsaAlgs.SHA256
+        )
+        self.assertEqual(len(results), 4)
+        self.assertIsInstance(results[1], _EX.SignatureNotPossibleException)
+        self.assertEqual([results[0], results[2], results[3]], [True, True, True])
+
+        for certificate, ca in zip(certificates[2:], (self.ecdsa_ca, self.ed25519_ca)):
+            reloaded = _CERT.SSHCertificate.from_bytes(bytes(certificate))
+            self.assertTrue(reloaded.verify(ca.public_key))
+
+        reloaded = _CERT.SSHCertificate.from_bytes(bytes(certificates[0]))
+        self.assertEqual(reloaded.footer.signature.hash_alg, _KEY.RsaAlgs.SHA256)
+        self.rsa_ca.public_key.verify(
+            reloaded.get_signable(),
+            reloaded.get("signature"),
+            _KEY.RsaAlgs.SHA256,
+        )
+
+        # Signing again after a change, with a shared executor
+        certificates[3].set("key_id", "ModifiedKeyId")
+        with ThreadPoolExecutor(2) as executor:
+            results = _CERT.SSHCertificate.sign_many(
+                certificates[3:], executor=executor
+            )
+        self.assertEqual(results, [True])
+
+        reloaded = _CERT.SSHCertificate.from_bytes(bytes(certificates[3]))
+        self.assertEqual(reloaded.get("key_id"), "ModifiedKeyId")
+        self.assertTrue(reloaded.verify(self.ed25519_ca.public_key))
+
+    def test_verify_many(self):
+        certificates = []
+        for ca in (self.rsa_ca, self.ecdsa_ca, self.ed25519_ca):
+            certificate = _CERT.SSHCertificate.create(
+                subject_pubkey=self.ed25519_user,
+                ca_privkey=ca,
+                fields=copy(self.cert_fields),
+            )
+            certificate.sign(hash_alg=_KEY.RsaAlgs.SHA256)
+            certificates.append(certificate.to_string())
+
+        untrusted = _CERT.SSHCertificate.create(
+            subject_pubkey=self.ed25519_user,
+            ca_privkey=_KEY.Ed25519PrivateKey.generate(),
+            fields=copy(self.cert_fields),
+        )
+        untrusted.sign()
+
+        tampered = _CERT.SSHCertificate.from_string(certificates[2])
+        tampered.set("key_id", "ModifiedKeyId")
+
+        lines = certificates * 200 + [
+            untrusted.to_string(),
+            "ssh-ed25519-cert-v01@openssh.com invalid",
+        ]
+        trusted_keys = [
+            self.rsa_ca.public_key,
+            self.ecdsa_ca.public_key,
+            self.ed25519_ca.public_key,
+        ]
+
+        for lazy in (False, True):
+            results = _CERT.SSHCertificate.verify_many(
+                _CERT.SSHCertificate.parse_many(lines, lazy=lazy, collect_errors=True),
+                trusted_keys,
+                max_workers=2,
+                chunk_size=16,
+            )
+            self.assertEqual(len(results), 602)
+            self.assertEqual(list(results[:600]), [_CERT.VerifyResult.VALID] * 600)
+            self.assertEqual(results[600], _CERT.VerifyResult.UNTRUSTED_CA)
+            self.assertEqual(results[601], _CERT.VerifyResult.INVALID_CERTIFICATE)
+
+        with ThreadPoolExecutor(2) as executor:
+            results = _CERT.SSHCertificate.verify_many(
+                iter([tampered, untrusted]), trusted_keys, executor=executor
+            )
+        self.assertEqual(
+            list(results),
+            [_CERT.VerifyResult.INVALID_SIGNATURE, _CERT.VerifyResult.UNTRUSTED_CA],
+        )
+
+        # Only a few chunks per worker of a given executor are read ahead
+        read, ahead = [0], []
+
+        def stream():
+            for line in lines[:600]:
+                read[0] += 1
+                yield _CERT.SSHCertificate.from_string(line)
+
+        def verify_chunk(chunk):
+            ahead.append(read[0] - chunk[0][0])
+            return verify_chunk.wrapped(chunk)
+
+        verify_chunk.wrapped = _CERT.SSHCertificate._verify_chunk
+        with ThreadPoolExecutor(1) as executor, mock.patch.object(
+            _CERT.SSHCertificate, "_verify_chunk", side_effect=verify_chunk
+        ), mock.patch.object(os, "cpu_count", return_value=8):
+            results = _CERT.SSHCertificate.verify_many(
+                stream(), trusted_keys, executor=executor, chunk_size=10
+            )
+
+        self.assertEqual(list(results), [_CERT.VerifyResult.VALID] * 600)
+        self.assertLessEqual(max(ahead), 4 * 10)
+
+    def test_sign_digest(self):
+        for ca, kwargs, hash_name in (
+            (self.rsa_ca, {}, "sha512"),
+            (_KEY.EcdsaPrivateKey.generate(_KEY.EcdsaCurves.P256), {}, "sha256"),
+            (_KEY.EcdsaPrivateKey.generate(_KEY.EcdsaCurves.P384), {}, "sha384"),
+            (_KEY.EcdsaPrivateKey.generate(_KEY.EcdsaCurves.P521), {}, "sha512"),
+        ):
+            certificate = _CERT.SSHCertificate.create(
+                subject_pubkey=self.ed25519_user,
+                ca_privkey=ca,
+                fields=copy(self.cert_fields),
+            )
+            digest = certificate.get_digest(**kwargs)
+            self.assertEqual(
+                digest, hashlib.new(hash_name, certificate.get_signable()).digest()
+            )
+
+            certificate.sign(digest=digest, **kwargs)
+            reloaded = _CERT.SSHCertificate.from_bytes(bytes(certificate))
+            self.assertTrue(reloaded.verify(ca.public_key))
+
+        certificate = _CERT.SSHCertificate.create(
+            subject_pubkey=self.ed25519_user,
+            ca_privkey=self.rsa_ca,
+            fields=copy(self.cert_fields),
+        )
+        digest = certificate.get_digest(hash_alg=_KEY.RsaAlgs.SHA256)
+        certificate.sign(digest=digest, hash_alg=_KEY.RsaAlgs.SHA256)
+        self.rsa_ca.public_key.verify(
+            certificate.get_signable(),
+            certificate.get("signature"),
+            _KEY.RsaAlgs.SHA256,
+        )
+
+        # ED25519 signs the data in a single pass
+        certificate = _CERT.SSHCertificate.create(
+            subject_pubkey=self.ed25519_user,
+            ca_privkey=self.ed25519_ca,
+            fields=copy(self.cert_fields),
+        )
+        self.assertIsNone(certificate.get_digest())
+        certificate.sign(digest=None)
+        self.assertTrue(certificate.verify(self.ed25519_ca.public_key))
+
+    def test_lazy_field_modification(self):
+        certificate = _CERT.SSHCertificate.create(
+            subject_pubkey=self.ed25519_user,
+            ca_privkey=self.ed25519_ca,
+            fields=self.cert_fields,
+        )
+        certificate.sign()
+
+        lazy = _CERT.SSHCertificate.from_bytes(bytes(certificate), lazy=True)
+        lazy.fields.key_id = "ModifiedKeyId"
+        lazy.replace_ca(self.ed25519_ca)
+        lazy.sign()
+
+        reloaded = _CERT.SSHCertificate.from_bytes(bytes(lazy))
+        self.assertEqual(reloaded.get("key_id"), "ModifiedKeyId")
+        self.assertEqual(reloaded.get("principals"), ["pr_a", "pr_b", "pr_c"])
+        self.assertTrue(reloaded.verify(self.ed25519_ca.public_key))
+
+    def test_decode_plan(self):
+        for user_type in CERTIFICATE_TYPES:
+            certificate = _CERT.SSHCertificate.create(
+                subject_pubkey=getattr(self, f"{user_type}_user"),
+                ca_privkey=self.ecdsa_ca,
+                fields=self.cert_fields,
+            )
+            certificate.sign()
+            cert_bytes = bytes(certificate)
+
+            plan = _CERT.DecodePlan.for_type(certificate.get("pubkey_type"))
+            self.assertIs(plan, _CERT.DecodePlan.for_type(plan.cert_type))
+
+            decoded = _CERT.SSHCertificate.from_bytes(cert_bytes)
+            self.assertIsInstance(decoded, plan.certificate_class)
+            self.assertEqual(bytes(decoded), cert_bytes)
+
+            for section in ("header", "fields", "footer"):
+                self.assertEqual(
+                    getattr(decoded, section).getattrs(),
+                    getattr(certificate, section).getattrs(),
+                )
+
+            self.assertTrue(decoded.verify(self.ecdsa_ca.public_key))
+
+        with self.assertRaises(_EX.InvalidCertificateFormatException):
+            _CERT.SSHCertificate.from_bytes(
+                _FIELD.StringField.encode("ssh-unknown-cert-v01@openssh.com")
+            )
+
+    def test_parse_many(self):
+        cert_strings = []
+        for user_type in CERTIFICATE_TYPES:
+            certificate = _CERT.SSHCertificate.create(
+                subject_pubkey=getattr(self, f"{user_type}_user"),
+                ca_privkey=self.ed25519_ca,
+                fields=self.cert_fields,
+            )
+            certificate.sign()
+            cert_strings.append(certificate.to_string(comment="user@host"))
+
+        lines = ["# Certificate bundle", ""] + cert_strings + ["   "]
+        with open("tests/certificates/bundle", "w", encoding="utf-8") as file:
+            file.write("\n".join(lines) + "\n")
+
+        with open("tests/certificates/bundle", "rb") as file:
+            sources = (
+                lines,
+                [line.encode("utf-8") for line in lines],
+                file,
+            )
+            for source in sources:
+                parsed = list(_CERT.SSHCertificate.parse_many(source))
+                self.assertEqual(len(parsed), len(cert_strings))
+                for certificate, cert_string in zip(parsed, cert_strings):
+                    self.assertEqual(
+                        certificate.to_string(comment="user@host"), cert_string
+                    )
+                    self.assertTrue(certificate.verify(self.ed25519_ca.public_key))
+
+        lazy = list(_CERT.SSHCertificate.parse_many(cert_strings, lazy=True))
+        self.assertEqual(lazy[0].get("key_id"), "KeyIdentifier")
+
+    def test_parse_many_errors(self):
+        certificate = _CERT.SSHCertificate.create(
+            subject_pubkey=self.ed25519_user,
+            ca_privkey=self.ed25519_ca,
+            fields=self.cert_fields,
+        )
+        certificate.sign()
+        cert_type, cert_data = certificate.to_string().split(" ")[:2]
+
+        lines = [
+            certificate.to_string(),
+            "ssh-unknown-cert-v01@openssh.com " + cert_data,
+            "rsa-sha2-512-cert-v01@openssh.com " + cert_data,
+            cert_type,
+            cert_type + " " + cert_data[:-8],
+            certificate.to_string(),
+        ]
+
+        results = list(_CERT.SSHCertificate.parse_many(lines, collect_errors=True))
+        self.assertIsInstance(results[0], _CERT.Ed25519Certificate)
+        self.assertIsInstance(results[-1], _CERT.Ed25519Certificate)
+        self.assertEqual([result[0] for result in results[1:-1]], [2, 3, 4, 5])
+        for _, error in results[1:-1]:
+            self.assertIsInstance(error, ValueError)
+
+        parser = _CERT.SSHCertificate.parse_many(lines)
+        self.assertIsInstance(next(parser), _CERT.Ed25519Certificate)
+        with self.assertRaises(_EX.InvalidCertificateFormatException):
+            next(parser)
+
+        # A certificate valid forever is decoded, and encoded the same again
+        forever = _CERT.SSHCertificate.create(
+            subject_pubkey=self.ed25519_user,
+            ca_privkey=self.ed25519_ca,
+            fields=_CERT.CertificateFields(valid_before="forever"),
+        )
+        forever.sign()
+
+        decoded = _CERT.SSHCertificate.from_string(forever.to_string())
+        self.assertEqual(decoded.get("valid_before"), datetime.max)
+        self.assertTrue(decoded.verify(self.ed25519_ca.public_key))
+
+        decoded.replace_ca(self.ed25519_ca)
+        decoded.sign()
+        self.assertEqual(decoded.get_signable(), forever.get_signable())
+
+        # A timestamp out of range for datetime does not end the stream
+        far_future = _CERT.SSHCertificate.create(
+            subject_pubkey=self.ed25519_user,
+            ca_privkey=self.ed25519_ca,
+            fields=_CERT.CertificateFields(valid_before=2**62),
+        )
+        far_future.sign()
+
+        lines = [
+            forever.to_string(),
+            far_future.to_string(),
+            certificate.to_string(),
+        ]
+        results = list(_CERT.SSHCertificate.parse_many(lines, collect_errors=True))
+        self.assertEqual(len(results), 3)
+        self.assertEqual(results[0].get("valid_before"), datetime.max)
+        self.assertEqual(results[1][0], 2)
+        self.assertIsInstance(results[1][1], _EX.InvalidDataException)
+        self.assertIsInstance(results[2], _CERT.Ed25519Certificate)
+
+    def test_peek(self):
+        for user_type in CERTIFICATE_TYPES:
+            certificate = _CERT.SSHCertificate.create(
+                subject_pubkey=getattr(self, f"{user_type}_user"),
+                ca_privkey=self.rsa_ca,
+                fields=self.cert_fields,
+            )
+            certificate.sign()
+            cert_string = certificate.to_string(comment="user@host")
+
+            peeked = _CERT.SSHCertificate.peek(cert_string)
+            self.assertEqual(
+                list(peeked.keys()), ["pubkey_type", "nonce", "public_key", "serial"]
+            )
+            self.assertEqual(peeked["pubkey_type"], certificate.get("pubkey_type"))
+            self.assertEqual(
+                peeked["nonce"],
+                _CERT.SSHCertificate.from_string(cert_string).get("nonce"),
+            )
+            self.assertEqual(peeked["serial"], 1234567890)
+            self.assertEqual(
+                peeked["public_key"].get_fingerprint(),
+                getattr(self, f"{user_type}_user").get_fingerprint(),
+            )
+
+            peeked = _CERT.SSHCertificate.peek(
+                cert_string.encode("utf-8"), ["principals", "key_id", "ca_pubkey"]
+            )
+            self.assertEqual(peeked["key_id"], "KeyIdentifier")
+            self.assertEqual(peeked["principals"], ["pr_a", "pr_b", "pr_c"])
+            self.assertEqual(
+                peeked["ca_pubkey"].raw_bytes(), self.rsa_ca.public_key.raw_bytes()
+            )
+
+        with self.assertRaises(_EX.InvalidCertificateFieldException):
+            _CERT.SSHCertificate.peek(cert_string, ["serial", "not_a_field"])
+
+        with self.assertRaises(_EX.InvalidCertificateFormatException):
+            _CERT.SSHCertificate.peek("no-data")
+
+        with self.assertRaises(_EX.InvalidDataException):
+            _CERT.SSHCertificate.peek(cert_string.split(" ")[0] + " AAAAB3")
+
     def test_certificate_creation(self):
         for ca_type in CERTIFICATE_TYPES:
             for user_type in CERTIFICATE_TYPES:
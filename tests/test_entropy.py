@@ -0,0 +1,89 @@
+import os
+import threading
+import unittest
+from uuid import UUID
+
+import src.sshkey_tools.cert as _CERT
+import src.sshkey_tools.entropy as _ENTROPY
+import src.sshkey_tools.fields as _FIELD
+import src.sshkey_tools.keys as _KEY
+
+
+class TestEntropyPool(unittest.TestCase):
+    def test_random_values(self):
+        pool = _ENTROPY.EntropyPool(buffer_size=64)
+
+        nonces = [pool.random_nonce() for _ in range(100)]
+        self.assertTrue(all(isinstance(n, bytes) and len(n) == 32 for n in nonces))
+        self.assertEqual(len(set(nonces)), 100)
+
+        serials = [pool.random_serial() for _ in range(100)]
+        self.assertTrue(all(0 <= s < 2**64 for s in serials))
+        self.assertEqual(len(set(serials)), 100)
+
+        keyids = [pool.random_keyid() for _ in range(100)]
+        self.assertTrue(all(UUID(k).version == 4 for k in keyids))
+        self.assertEqual(len(set(keyids)), 100)
+
+        self.assertEqual(len(pool.random_bytes(1000)), 1000)
+
+    def test_field_defaults(self):
+        certificate = _CERT.SSHCertificate.create(
+            subject_pubkey=_KEY.Ed25519PrivateKey.generate().public_key,
+            ca_privkey=_KEY.Ed25519PrivateKey.generate(),
+        )
+
+        self.assertEqual(len(certificate.get("nonce")), _ENTROPY.NONCE_LENGTH)
+        self.assertIsInstance(certificate.get("serial"), int)
+        UUID(certificate.get("key_id"))
+
+        nonce = _FIELD.NonceField.factory()
+        self.assertTrue(nonce.validate())
+        self.assertNotEqual(nonce.value, _FIELD.NonceField.factory().value)
+
+    def test_threads(self):
+        pool = _ENTROPY.EntropyPool(buffer_size=1024)
+        results = []
+
+        def draw():
+            results.append([pool.random_nonce() for _ in range(1000)])
+
+        threads = [threading.Thread(target=draw) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        nonces = [nonce for result in results for nonce in result]
+        self.assertEqual(len(set(nonces)), 8000)
+
+    @unittest.skipUnless(hasattr(os, "fork"), "Requires fork")
+    def test_fork(self):
+        pool = _ENTROPY.EntropyPool()
+        pool.random_bytes(16)
+        pool.random_nonce()
+        _ENTROPY.random_nonce()
+
+        read_fd, write_fd = os.pipe()
+        pid = os.fork()
+        if pid == 0:
+            os.close(read_fd)
+            os.write(
+                write_fd,
+                pool.random_bytes(16) + pool.random_nonce() + _ENTROPY.random_nonce(),
+            )
+            os._exit(0)
+
+        os.close(write_fd)
+        with os.fdopen(read_fd, "rb") as pipe:
+            child = pipe.read()
+        os.waitpid(pid, 0)
+
+        self.assertEqual(len(child), 80)
+        self.assertNotEqual(child[:16], pool.random_bytes(16))
+        self.assertNotEqual(child[16:48], pool.random_nonce())
+        self.assertNotEqual(child[48:], _ENTROPY.random_nonce())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -2,10 +2,13 @@
 # Test privkey import
 # Test import to right class
 # Test pubkey generation from priv
+import hashlib
 import os
 import shutil
 import unittest
+from base64 import b64decode
 
+from cryptography.hazmat.primitives import serialization as _SERIALIZATION
 from cryptography.hazmat.primitives.asymmetric import ec as _EC
 from cryptography.hazmat.primitives.asymmetric import ed25519 as _ED25519
 from cryptography.hazmat.primitives.asymmetric import rsa as _RSA
@@ -17,8 +20,10 @@ from src.sshkey_tools.keys import (
     EcdsaPublicKey,
     Ed25519PrivateKey,
     Ed25519PublicKey,
+    FingerprintHashes,
     PrivateKey,
     PublicKey,
+    RsaAlgs,
     RsaPrivateKey,
     RsaPublicKey,
 )
@@ -483,6 +488,37 @@ class TestFromComponents(KeypairMethods):
             Ed25519PublicKey, self.ed25519_key.public_key, from_raw_pub
         )
 
+    def test_from_wire_bytes(self):
+        for keyclass, key in (
+            (RsaPublicKey, self.rsa_key.public_key),
+            (EcdsaPublicKey, self.ecdsa_key.public_key),
+            (Ed25519PublicKey, self.ed25519_key.public_key),
+        ):
+            wire = key.raw_bytes()
+            self.assertEqualPublicKeys(keyclass, key, PublicKey.from_bytes(wire))
+            self.assertEqualPublicKeys(
+                keyclass, key, PublicKey.from_bytes(memoryview(bytearray(wire)))
+            )
+
+        for curve in EcdsaCurves:
+            key = EcdsaPrivateKey.generate(curve).public_key
+            cursor_key = PublicKey.from_bytes(key.raw_bytes())
+            self.assertEqualPublicKeys(EcdsaPublicKey, key, cursor_key)
+
+    def test_ecdsa_from_point(self):
+        key = self.ecdsa_key.public_key
+        point = key.key.public_bytes(
+            _SERIALIZATION.Encoding.X962,
+            _SERIALIZATION.PublicFormat.UncompressedPoint,
+        )
+
+        self.assertEqualPublicKeys(
+            EcdsaPublicKey, key, EcdsaPublicKey.from_point("nistp256", point)
+        )
+        self.assertEqualPublicKeys(
+            EcdsaPublicKey, key, EcdsaPublicKey.from_point(b"nistp256", point)
+        )
+
 
 class TestFingerprint(KeypairMethods):
     def setUp(self):
@@ -519,6 +555,64 @@ class TestFingerprint(KeypairMethods):
         self.assertEqual(key.get_fingerprint(), sshkey_fingerprint)
 
 
+class TestKeyIdentity(KeypairMethods):
+    def setUp(self):
+        self.generateClasses()
+
+    def tearDown(self):
+        pass
+
+    def test_cached_wire_and_fingerprints(self):
+        for key in (
+            self.rsa_key.public_key,
+            self.ecdsa_key.public_key,
+            self.ed25519_key.public_key,
+        ):
+            wire = key.raw_bytes()
+            self.assertIs(key.raw_bytes(), wire)
+            self.assertEqual(wire, b64decode(key.serialize().split(b" ")[1]))
+
+            for hash_method in (
+                FingerprintHashes.MD5,
+                FingerprintHashes.SHA256,
+                FingerprintHashes.SHA512,
+            ):
+                self.assertIs(
+                    key.get_fingerprint(hash_method), key.get_fingerprint(hash_method)
+                )
+            self.assertTrue(key.get_fingerprint().startswith("SHA256:"))
+            self.assertTrue(
+                key.get_fingerprint(FingerprintHashes.MD5).startswith("MD5:")
+            )
+
+            # The wire format is kept from the decoded data
+            loaded = PublicKey.from_string(key.to_string())
+            self.assertEqual(loaded.raw_bytes(), wire)
+            self.assertEqual(loaded.get_fingerprint(), key.get_fingerprint())
+
+    def test_replaced_key(self):
+        key = PublicKey.from_string(self.ed25519_key.public_key.to_string())
+        fingerprint = key.get_fingerprint()
+
+        key.key = self.rsa_key.public_key.key
+        self.assertEqual(key.raw_bytes(), self.rsa_key.public_key.raw_bytes())
+        self.assertNotEqual(key.get_fingerprint(), fingerprint)
+
+    def test_equality(self):
+        key = self.ecdsa_key.public_key
+        loaded = PublicKey.from_string(key.to_string())
+        loaded.comment = "Other comment"
+
+        self.assertEqual(key, loaded)
+        self.assertEqual(hash(key), hash(loaded))
+        self.assertNotEqual(key, self.ed25519_key.public_key)
+        self.assertNotEqual(key, key.raw_bytes())
+
+        index = {key: "ecdsa", self.ed25519_key.public_key: "ed25519"}
+        self.assertEqual(index[loaded], "ecdsa")
+        self.assertEqual(len({key, loaded, self.ed25519_key.public_key}), 2)
+
+
 class TestSignatures(KeypairMethods):
     def setUp(self):
         self.generateClasses()
@@ -553,6 +647,23 @@ class TestSignatures(KeypairMethods):
         with self.assertRaises(_EX.InvalidSignatureException):
             self.ed25519_key.public_key.verify(data, signature + b"\x00")
 
+    def test_digest_signature(self):
+        data = b"\x00" + os.urandom(32) + b"\x00"
+
+        for hash_alg in (RsaAlgs.SHA256, RsaAlgs.SHA512):
+            digest = hashlib.new(hash_alg.value[1].name, data).digest()
+            signature = self.rsa_key.sign_digest(digest, hash_alg)
+            self.assertIsNone(self.rsa_key.public_key.verify(data, signature, hash_alg))
+
+        for curve, hash_name in (
+            (EcdsaCurves.P256, "sha256"),
+            (EcdsaCurves.P384, "sha384"),
+            (EcdsaCurves.P521, "sha512"),
+        ):
+            key = EcdsaPrivateKey.generate(curve)
+            signature = key.sign_digest(hashlib.new(hash_name, data).digest())
+            self.assertIsNone(key.public_key.verify(data, signature))
+
 
 class TestExceptions(KeypairMethods):
     def setUp(self):
@@ -581,6 +692,28 @@ class TestExceptions(KeypairMethods):
                 private_value=self.ecdsa_key.private_numbers.private_value,
             )
 
+    def test_invalid_public_key_bytes(self):
+        wire = self.ecdsa_key.public_key.raw_bytes()
+
+        for data in (
+            b"",
+            wire[:-1],
+            wire + b"\x00",
+            wire.replace(b"nistp256", b"nistp999"),
+            self.ed25519_key.public_key.raw_bytes()[:-1],
+        ):
+            with self.assertRaises(_EX.InvalidKeyException):
+                _ = PublicKey.from_bytes(data)
+
+        with self.assertRaises(_EX.InvalidKeyException):
+            _ = PublicKey.from_string(
+                "ssh-rsa "
+                + self.ed25519_key.public_key.to_string().split(" ")[1]
+            )
+
+        with self.assertRaises(_EX.InvalidCurveException):
+            _ = EcdsaPublicKey.from_point("abc123", b"")
+
 
 if __name__ == "__main__":
     unittest.main()
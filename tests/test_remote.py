@@ -0,0 +1,178 @@
+import asyncio
+import threading
+import time
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+
+import src.sshkey_tools.aio as _AIO
+import src.sshkey_tools.cert as _CERT
+import src.sshkey_tools.exceptions as _EX
+import src.sshkey_tools.keys as _KEY
+from src.sshkey_tools.remote import BatchCoalescer, RemoteSigner
+from tests.helpers import create_certificate
+
+
+class StandInSigningService:
+    """
+    Signs batches with a local private key, after a fixed latency per call
+    """
+
+    def __init__(self, private_key, latency=0.05):
+        self.private_key = private_key
+        self.latency = latency
+        self.batches = []
+        self.lock = threading.Lock()
+
+    def sign_batch(self, data, *args):
+        time.sleep(self.latency)
+        with self.lock:
+            self.batches.append(len(data))
+
+        return [self.private_key.sign(item, *args) for item in data]
+
+
+class TestRemoteSigner(unittest.TestCase):
+    def setUp(self):
+        self.rsa_ca = _KEY.RsaPrivateKey.generate(1024)
+        self.ecdsa_ca = _KEY.EcdsaPrivateKey.generate()
+        self.ed25519_ca = _KEY.Ed25519PrivateKey.generate()
+
+    def test_sign_certificates(self):
+        for ca in (self.rsa_ca, self.ecdsa_ca, self.ed25519_ca):
+            service = StandInSigningService(ca, latency=0)
+            with RemoteSigner(ca.public_key, service.sign_batch) as signer:
+                certificate = create_certificate(signer)
+                certificate.sign()
+                self.assertTrue(certificate.verify(ca.public_key, True))
+
+                certificate = create_certificate(self.ed25519_ca)
+                certificate.replace_ca(signer)
+                certificate.sign()
+                self.assertTrue(certificate.verify(ca.public_key, True))
+
+                with self.assertRaises(_EX.InvalidKeyException):
+                    signer.to_string()
+
+        service = StandInSigningService(self.rsa_ca, latency=0)
+        with RemoteSigner(self.rsa_ca.public_key, service.sign_batch) as signer:
+            certificate = create_certificate(signer)
+            certificate.sign(hash_alg=_KEY.RsaAlgs.SHA256)
+            self.assertEqual(certificate.footer.signature.hash_alg, _KEY.RsaAlgs.SHA256)
+            self.rsa_ca.public_key.verify(
+                certificate.get_signable(),
+                certificate.get("signature"),
+                _KEY.RsaAlgs.SHA256,
+            )
+
+            with self.assertRaises(_EX.SignatureNotPossibleException):
+                certificate.sign(digest=certificate.get_digest())
+
+        with self.assertRaises(_EX.SignatureNotPossibleException):
+            signer.sign(b"data")
+
+    def test_coalesced_batches(self):
+        service = StandInSigningService(self.ecdsa_ca)
+        with RemoteSigner(
+            self.ecdsa_ca.public_key, service.sign_batch, max_batch_size=16
+        ) as signer:
+            certificates = [
+                create_certificate(signer, f"KeyIdentifier{i}") for i in range(64)
+            ]
+            with ThreadPoolExecutor(max_workers=64) as executor:
+                results = _CERT.SSHCertificate.sign_many(certificates, executor)
+
+        self.assertEqual(results, [True] * 64)
+        self.assertEqual(sum(service.batches), 64)
+        self.assertLessEqual(max(service.batches), 16)
+        self.assertLess(len(service.batches), 16)
+        for certificate in certificates:
+            self.assertTrue(certificate.verify(self.ecdsa_ca.public_key, True))
+
+    def test_throughput_scales_with_batch_size(self):
+        elapsed = {}
+        for max_batch_size in (1, 32):
+            service = StandInSigningService(self.ed25519_ca)
+            with RemoteSigner(
+                self.ed25519_ca.public_key,
+                service.sign_batch,
+                max_batch_size=max_batch_size,
+                max_in_flight=2,
+            ) as signer:
+                with ThreadPoolExecutor(max_workers=64) as executor:
+                    start = time.perf_counter()
+                    list(executor.map(signer.sign, [b"data"] * 64))
+                    elapsed[max_batch_size] = time.perf_counter() - start
+
+        # 64 calls, two at a time, with single signatures and 2 calls with batches
+        self.assertLess(elapsed[32] * 4, elapsed[1])
+
+    def test_failed_batches(self):
+        def failing(data):
+            raise ConnectionError("The signing service is unavailable")
+
+        with RemoteSigner(self.ed25519_ca.public_key, failing) as signer:
+            certificates = [create_certificate(signer) for _ in range(4)]
+            results = _CERT.SSHCertificate.sign_many(certificates, max_workers=4)
+
+        self.assertTrue(all(isinstance(r, ConnectionError) for r in results))
+        self.assertFalse(any(c.footer.signature.is_signed for c in certificates))
+
+        coalescer = BatchCoalescer(lambda data: data[1:], max_wait=0)
+        with self.assertRaises(_EX.InvalidDataException):
+            coalescer.submit(b"data").result()
+
+        coalescer.close()
+        with self.assertRaises(_EX.SignatureNotPossibleException):
+            coalescer.submit(b"data")
+
+
+    def test_batches_in_flight(self):
+        running, most = [0], [0]
+        lock = threading.Lock()
+
+        def slow(data):
+            with lock:
+                running[0] += 1
+                most[0] = max(most[0], running[0])
+            time.sleep(0.01)
+            with lock:
+                running[0] -= 1
+            return data
+
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            coalescer = BatchCoalescer(
+                slow, max_batch_size=1, max_wait=0, executor=executor, max_in_flight=2
+            )
+            futures = [coalescer.submit(i) for i in range(20)]
+            self.assertEqual([future.result() for future in futures], list(range(20)))
+            coalescer.close()
+
+        self.assertLessEqual(most[0], 2)
+
+
+class TestAsyncRemoteSigner(unittest.IsolatedAsyncioTestCase):
+    async def test_coalesced_batches(self):
+        ca = _KEY.RsaPrivateKey.generate(1024)
+        service = StandInSigningService(ca, latency=0.02)
+        with RemoteSigner(
+            ca.public_key, service.sign_batch, max_batch_size=32, max_wait=5
+        ) as signer:
+            certificates = [
+                create_certificate(signer, f"KeyIdentifier{i}") for i in range(32)
+            ]
+            results = await asyncio.gather(
+                *[_AIO.sign(c, hash_alg=_KEY.RsaAlgs.SHA256) for c in certificates]
+            )
+
+        self.assertEqual(results, [True] * 32)
+        self.assertEqual(service.batches, [32])
+        for certificate in certificates:
+            ca.public_key.verify(
+                certificate.get_signable(),
+                certificate.get("signature"),
+                _KEY.RsaAlgs.SHA256,
+            )
+
+
+if __name__ == "__main__":
+    unittest.main()
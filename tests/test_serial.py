@@ -0,0 +1,145 @@
+import errno
+import multiprocessing
+import os
+import shutil
+import unittest
+from unittest import mock
+
+import src.sshkey_tools.cert as _CERT
+import src.sshkey_tools.exceptions as _EX
+import src.sshkey_tools.fields as _FIELD
+import src.sshkey_tools.keys as _KEY
+import src.sshkey_tools.serial as _SERIAL
+from src.sshkey_tools.serial import SerialAllocator
+
+FOLDER = "tests/serial"
+
+
+def allocate(args):
+    allocator, count = args
+    return [allocator.next_serial() for _ in range(count)]
+
+
+class TestSerialAllocator(unittest.TestCase):
+    def setUp(self):
+        if os.path.isdir(FOLDER):
+            shutil.rmtree(FOLDER)
+        os.mkdir(FOLDER)
+
+        self.path = f"{FOLDER}/serial"
+
+    def tearDown(self):
+        shutil.rmtree(FOLDER)
+
+    def read_state(self):
+        with open(self.path, "r", encoding="utf-8") as file:
+            return int(file.read())
+
+    def test_node_prefix_and_blocks(self):
+        allocator = SerialAllocator(self.path, node=3, node_bits=8, block_size=10)
+
+        serials = [allocator.next_serial() for _ in range(10)]
+        self.assertEqual(serials, [(3 << 56) | i for i in range(1, 11)])
+        self.assertEqual(self.read_state(), 11)
+
+        self.assertEqual(allocator.next_serial(), (3 << 56) | 11)
+        self.assertEqual(self.read_state(), 21)
+
+        with self.assertRaises(_EX.IntegerOverflowException):
+            SerialAllocator(self.path, node=256, node_bits=8)
+
+    def test_resume_after_crash(self):
+        allocator = SerialAllocator(self.path, block_size=100)
+        used = [allocator.next_serial() for _ in range(5)]
+        del allocator
+
+        allocator = SerialAllocator(self.path, block_size=100)
+        self.assertEqual(allocator.next_serial(), 101)
+        self.assertNotIn(101, used)
+
+        with open(self.path, "w", encoding="utf-8") as file:
+            file.write("invalid")
+        with self.assertRaises(_EX.InvalidDataException):
+            SerialAllocator(self.path).next_serial()
+
+    def test_file_locking_required(self):
+        with mock.patch.multiple(_SERIAL, fcntl=None, msvcrt=None):
+            with self.assertRaises(OSError):
+                SerialAllocator(self.path)
+
+    def test_msvcrt_lock_retries(self):
+        fake_msvcrt = mock.Mock(LK_LOCK=1)
+        fake_msvcrt.locking.side_effect = [
+            OSError(errno.EDEADLK, "Resource deadlock avoided"),
+            OSError(errno.EACCES, "Permission denied"),
+            None,
+        ]
+
+        with mock.patch.multiple(
+            _SERIAL, fcntl=None, msvcrt=fake_msvcrt
+        ), mock.patch.object(_SERIAL, "sleep") as sleep, open(
+            self.path, "w", encoding="utf-8"
+        ) as file:
+            _SERIAL._lock_file(file)
+            self.assertEqual(fake_msvcrt.locking.call_count, 3)
+            self.assertEqual(sleep.call_count, 2)
+
+            # Other errors are raised instead of retried
+            fake_msvcrt.locking.side_effect = OSError(errno.EBADF, "Bad file")
+            with self.assertRaises(OSError):
+                _SERIAL._lock_file(file)
+            self.assertEqual(sleep.call_count, 2)
+
+    def test_exhausted_node(self):
+        allocator = SerialAllocator(self.path, node=1, node_bits=60, block_size=10)
+        serials = [allocator.next_serial() for _ in range(15)]
+        self.assertEqual(len(set(serials)), 15)
+
+        with self.assertRaises(_EX.IntegerOverflowException):
+            allocator.next_serial()
+
+    def test_install(self):
+        self.addCleanup(
+            setattr, _FIELD.SerialField, "DEFAULT", _FIELD.SerialField.DEFAULT
+        )
+        SerialAllocator(self.path, node=1).install()
+
+        certificate = _CERT.SSHCertificate.create(
+            subject_pubkey=_KEY.Ed25519PrivateKey.generate().public_key,
+            ca_privkey=_KEY.Ed25519PrivateKey.generate(),
+        )
+        self.assertEqual(certificate.get("serial"), (1 << 48) | 1)
+        self.assertEqual(_FIELD.SerialField.factory().value, (1 << 48) | 2)
+
+    @unittest.skipUnless(hasattr(os, "fork"), "Requires fork")
+    def test_processes(self):
+        allocator = SerialAllocator(self.path, block_size=64)
+        parent = [allocator.next_serial() for _ in range(10)]
+
+        context = multiprocessing.get_context("fork")
+        with context.Pool(4) as pool:
+            results = pool.map(allocate, [(allocator, 2000)] * 8)
+
+        parent += [allocator.next_serial() for _ in range(100)]
+        serials = parent + [serial for result in results for serial in result]
+
+        self.assertEqual(len(serials), 16110)
+        self.assertEqual(len(set(serials)), len(serials))
+
+    @unittest.skipUnless(hasattr(os, "fork"), "Requires fork")
+    def test_fork(self):
+        allocator = SerialAllocator(self.path, block_size=100)
+        allocator.next_serial()
+
+        pid = os.fork()
+        if pid == 0:
+            allocator.next_serial()
+            os._exit(0)
+
+        os.waitpid(pid, 0)
+        self.assertEqual(self.read_state(), 201)
+        self.assertEqual(allocator.next_serial(), 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
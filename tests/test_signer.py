@@ -0,0 +1,75 @@
+import os
+import shutil
+import unittest
+
+import src.sshkey_tools.cert as _CERT
+import src.sshkey_tools.exceptions as _EX
+import src.sshkey_tools.keys as _KEY
+from src.sshkey_tools.signer import ProcessSigner, load_private_key
+from tests.helpers import create_certificate
+
+
+class TestProcessSigner(unittest.TestCase):
+    def setUp(self):
+        self.folder = "tests/signer"
+        if os.path.isdir(self.folder):
+            shutil.rmtree(self.folder)
+        os.mkdir(self.folder)
+
+        self.rsa_ca = _KEY.RsaPrivateKey.generate(1024)
+        self.rsa_ca.to_file(f"{self.folder}/rsa_ca")
+        self.ecdsa_ca = _KEY.EcdsaPrivateKey.generate()
+
+    def tearDown(self):
+        shutil.rmtree(self.folder)
+
+    def test_sign_from_file(self):
+        with ProcessSigner(f"{self.folder}/rsa_ca", max_workers=2) as signer:
+            self.assertEqual(signer.public_key, self.rsa_ca.public_key)
+
+            certificate = create_certificate(signer.private_key)
+            certificate.sign(signer=signer)
+            self.assertTrue(certificate.verify(self.rsa_ca.public_key, True))
+
+            certificate = create_certificate(signer.private_key)
+            certificate.sign(signer=signer, digest=certificate.get_digest())
+            self.assertTrue(certificate.verify(self.rsa_ca.public_key, True))
+
+            certificate = create_certificate(self.rsa_ca)
+            certificate.sign(signer=signer, hash_alg=_KEY.RsaAlgs.SHA256)
+            self.assertEqual(certificate.footer.signature.hash_alg, _KEY.RsaAlgs.SHA256)
+            self.rsa_ca.public_key.verify(
+                certificate.get_signable(),
+                certificate.get("signature"),
+                _KEY.RsaAlgs.SHA256,
+            )
+
+    def test_sign_encrypted_key_data(self):
+        key_data = self.ecdsa_ca.to_bytes("password")
+        with ProcessSigner(
+            key_data=key_data, password="password", max_workers=2
+        ) as signer:
+            certificates = [
+                create_certificate(self.ecdsa_ca, f"KeyIdentifier{i}") for i in range(4)
+            ]
+            results = _CERT.SSHCertificate.sign_many(
+                certificates, max_workers=signer.max_workers, signer=signer
+            )
+            self.assertEqual(results, [True] * 4)
+
+        for certificate in certificates:
+            reloaded = _CERT.SSHCertificate.from_bytes(bytes(certificate))
+            self.assertTrue(reloaded.verify(self.ecdsa_ca.public_key, True))
+
+    def test_invalid_signer(self):
+        with self.assertRaises(_EX.InvalidKeyException):
+            load_private_key()
+
+        with ProcessSigner(f"{self.folder}/rsa_ca", max_workers=1) as signer:
+            certificate = create_certificate(_KEY.RsaPrivateKey.generate(1024))
+            with self.assertRaises(_EX.SignatureNotPossibleException):
+                certificate.sign(signer=signer)
+
+
+if __name__ == "__main__":
+    unittest.main()
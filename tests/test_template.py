@@ -0,0 +1,116 @@
+import unittest
+from datetime import datetime, timedelta
+
+import src.sshkey_tools.cert as _CERT
+import src.sshkey_tools.exceptions as _EX
+import src.sshkey_tools.fields as _FIELD
+import src.sshkey_tools.keys as _KEY
+from src.sshkey_tools.template import CertificateTemplate
+
+
+class TestCertificateTemplate(unittest.TestCase):
+    def setUp(self):
+        self.ca = _KEY.EcdsaPrivateKey.generate()
+        self.profile = _CERT.CertificateFields(
+            cert_type=_FIELD.CERT_TYPE.HOST,
+            valid_before="8h",
+            critical_options={"source-address": "1.2.3.4/8"},
+            extensions=["permit-pty", "permit-agent-forwarding"],
+        )
+        self.template = CertificateTemplate(self.profile, self.ca)
+
+    def test_issue(self):
+        for subject in (
+            _KEY.RsaPrivateKey.generate(1024).public_key,
+            _KEY.EcdsaPrivateKey.generate(_KEY.EcdsaCurves.P384).public_key,
+            _KEY.Ed25519PrivateKey.generate().public_key,
+        ):
+            certificate = self.template.issue(
+                subject, "KeyIdentifier", ["pr_a", "pr_b"], serial=1234
+            )
+            reloaded = _CERT.SSHCertificate.from_string(certificate.to_string())
+
+            self.assertIsInstance(reloaded, type(certificate))
+            self.assertTrue(reloaded.verify(self.ca.public_key))
+            self.assertEqual(
+                reloaded.get("public_key").raw_bytes(), subject.raw_bytes()
+            )
+            self.assertEqual(reloaded.get("key_id"), "KeyIdentifier")
+            self.assertEqual(reloaded.get("principals"), ["pr_a", "pr_b"])
+            self.assertEqual(reloaded.get("serial"), 1234)
+            self.assertEqual(reloaded.get("cert_type"), 2)
+            self.assertEqual(
+                reloaded.get("critical_options"), {"source-address": "1.2.3.4/8"}
+            )
+            self.assertEqual(
+                reloaded.get("extensions"), ["permit-pty", "permit-agent-forwarding"]
+            )
+
+            if isinstance(subject, _KEY.EcdsaPublicKey):
+                self.assertEqual(
+                    reloaded.get("pubkey_type"),
+                    "ecdsa-sha2-nistp384-cert-v01@openssh.com",
+                )
+
+    def test_defaults(self):
+        subject = _KEY.Ed25519PrivateKey.generate().public_key
+        first = self.template.issue(subject, "KeyIdentifier", ["pr_a"])
+        second = self.template.issue(subject, "KeyIdentifier", ["pr_a"])
+
+        self.assertNotEqual(first.get("serial"), second.get("serial"))
+        self.assertNotEqual(first.get("nonce"), second.get("nonce"))
+
+        valid_before = first.get("valid_before")
+        self.assertIsInstance(valid_before, int)
+        self.assertAlmostEqual(
+            valid_before,
+            (datetime.now() + timedelta(hours=8)).timestamp(),
+            delta=5,
+        )
+
+        valid_before = datetime.now() + timedelta(hours=1)
+        certificate = self.template.issue(
+            subject, "KeyIdentifier", ["pr_a"], valid_before=valid_before
+        )
+        self.assertEqual(certificate.get("valid_before"), valid_before)
+
+    def test_constant_fields_are_copied(self):
+        subject = _KEY.Ed25519PrivateKey.generate().public_key
+        first = self.template.issue(subject, "KeyIdentifier", ["pr_a"])
+        encoded = self.template.fields["extensions"].encoded
+
+        # The encoding from the template is reused
+        self.assertIs(first.fields.extensions.encoded, encoded)
+
+        first.fields.extensions = ["permit-pty"]
+        first.get("critical_options")["force-command"] = "sftp-internal"
+        self.profile.extensions = []
+
+        second = self.template.issue(subject, "KeyIdentifier", ["pr_a"])
+        self.assertEqual(
+            second.get("extensions"), ["permit-pty", "permit-agent-forwarding"]
+        )
+        self.assertEqual(
+            second.get("critical_options"), {"source-address": "1.2.3.4/8"}
+        )
+
+    def test_invalid_template(self):
+        with self.assertRaises(_EX.SignatureNotPossibleException):
+            CertificateTemplate(
+                _CERT.CertificateFields(cert_type=3, extensions=[ValueError]),
+                self.ca,
+            )
+
+        with self.assertRaises(_EX.InvalidKeyException):
+            self.template.issue("not a key", "KeyIdentifier", ["pr_a"])
+
+        with self.assertRaises(_EX.SignatureNotPossibleException):
+            self.template.issue(
+                _KEY.Ed25519PrivateKey.generate().public_key,
+                "KeyIdentifier",
+                [ValueError],
+            )
+
+
+if __name__ == "__main__":
+    unittest.main()
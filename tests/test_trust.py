@@ -0,0 +1,185 @@
+import os
+import shutil
+import time
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+from unittest import mock
+
+import src.sshkey_tools.cert as _CERT
+import src.sshkey_tools.exceptions as _EX
+import src.sshkey_tools.keys as _KEY
+from src.sshkey_tools.fields import CERT_TYPE
+from src.sshkey_tools.trust import TrustStore
+from tests.helpers import create_certificate
+
+FOLDER = "tests/trust"
+
+
+class TestTrustStore(unittest.TestCase):
+    def setUp(self):
+        if os.path.isdir(FOLDER):
+            shutil.rmtree(FOLDER)
+        os.mkdir(FOLDER)
+
+        self.cas = [
+            _KEY.RsaPrivateKey.generate(1024),
+            _KEY.EcdsaPrivateKey.generate(),
+            _KEY.Ed25519PrivateKey.generate(),
+        ]
+
+    def tearDown(self):
+        shutil.rmtree(FOLDER)
+
+    def write_keys(self, path, cas):
+        lines = ["# Trusted CA keys", ""]
+        lines += [ca.public_key.to_string() for ca in cas]
+        with open(path, "w", encoding="utf-8") as file:
+            file.write("\n".join(lines) + "\n")
+
+    def test_resolve_and_verify(self):
+        self.write_keys(f"{FOLDER}/trusted", self.cas[:2])
+        store = TrustStore()
+        store.add_file(f"{FOLDER}/trusted")
+        host_ca = store.add(self.cas[2].public_key, cert_type=CERT_TYPE.HOST)
+
+        self.assertEqual(len(store), 3)
+        self.assertIn(self.cas[0].public_key, store)
+        self.assertEqual(set(store.keys()), {ca.public_key for ca in self.cas})
+
+        entry = store.get_by_fingerprint(self.cas[1].public_key.get_fingerprint())
+        self.assertEqual(entry.public_key, self.cas[1].public_key)
+        self.assertEqual(entry.source, os.path.abspath(f"{FOLDER}/trusted"))
+        self.assertIs(store.get(self.cas[2].public_key.raw_bytes()), host_ca)
+
+        for ca in self.cas[1:]:
+            certificate = create_certificate(ca, sign=True)
+            for lazy in (False, True):
+                loaded = _CERT.SSHCertificate.from_string(
+                    certificate.to_string(), lazy=lazy
+                )
+                self.assertIs(store.resolve(loaded), store.get(ca.public_key))
+
+        self.assertTrue(store.verify(create_certificate(self.cas[1], sign=True)))
+        self.assertTrue(
+            store.verify(
+                create_certificate(self.cas[2], cert_type=CERT_TYPE.HOST, sign=True)
+            )
+        )
+
+        # Only trusted for host certificates
+        certificate = create_certificate(self.cas[2], sign=True)
+        self.assertFalse(store.verify(certificate))
+        with self.assertRaises(_EX.UntrustedCAException):
+            store.verify(certificate, True)
+
+        certificate = create_certificate(_KEY.Ed25519PrivateKey.generate(), sign=True)
+        self.assertIsNone(store.resolve(certificate))
+        self.assertFalse(store.verify(certificate))
+
+        certificate = create_certificate(self.cas[1], sign=True)
+        certificate.set("key_id", "ModifiedKeyId")
+        with self.assertRaises(_EX.InvalidSignatureException):
+            store.verify(certificate, True)
+
+    def test_validity_window(self):
+        now = datetime.now()
+        store = TrustStore(clock=lambda: now.timestamp())
+        store.add(self.cas[1].public_key, valid_before=now)
+        store.add(self.cas[2].public_key, valid_after=now - timedelta(days=1))
+
+        self.assertFalse(store.verify(create_certificate(self.cas[1], sign=True)))
+        self.assertTrue(store.verify(create_certificate(self.cas[2], sign=True)))
+
+    def test_incremental_reload(self):
+        os.mkdir(f"{FOLDER}/ca.d")
+        self.write_keys(f"{FOLDER}/ca.d/a", self.cas[:1])
+        self.write_keys(f"{FOLDER}/ca.d/b", self.cas[1:2])
+
+        clock = [0]
+        store = TrustStore(reload_interval=60, clock=lambda: clock[0])
+        store.add_file(f"{FOLDER}/ca.d")
+        self.assertEqual(len(store), 2)
+        self.assertFalse(store.reload())
+
+        entries = {entry.fingerprint: entry for entry in store}
+        certificate = create_certificate(self.cas[2], sign=True)
+        self.write_keys(f"{FOLDER}/ca.d/c", self.cas[2:])
+        self.assertIsNone(store.resolve(certificate))
+
+        # The unchanged files are not read again
+        clock[0] = 60
+        self.assertIsNotNone(store.resolve(certificate))
+        for entry in store:
+            if entry.fingerprint in entries:
+                self.assertIs(entry, entries[entry.fingerprint])
+
+        os.remove(f"{FOLDER}/ca.d/a")
+        self.assertTrue(store.reload())
+        self.assertNotIn(self.cas[0].public_key, store)
+        self.assertEqual(len(store), 2)
+
+        # An invalid file leaves the store as it was
+        with open(f"{FOLDER}/ca.d/b", "w", encoding="utf-8") as file:
+            file.write("ssh-ed25519 invalid\n")
+        with self.assertRaises(_EX.InvalidKeyException):
+            store.reload()
+        self.assertIn(self.cas[1].public_key, store)
+
+        with self.assertRaises(_EX.InvalidKeyException):
+            store.add_file(f"{FOLDER}/ca.d/b")
+
+    def test_failed_automatic_reload(self):
+        self.write_keys(f"{FOLDER}/trusted", self.cas)
+        clock = [0]
+        store = TrustStore(reload_interval=60, clock=lambda: clock[0])
+        store.add_file(f"{FOLDER}/trusted")
+        certificate = create_certificate(self.cas[2], sign=True)
+
+        # A half-written file keeps the current keys when resolving
+        with open(f"{FOLDER}/trusted", "a", encoding="utf-8") as file:
+            file.write("ssh-ed25519 AAAA")
+        clock[0] = 60
+        self.assertTrue(store.verify(certificate))
+        self.assertIsInstance(store.reload_error, _EX.InvalidKeyException)
+        self.assertEqual(len(store), 3)
+
+        with self.assertRaises(_EX.InvalidKeyException):
+            store.reload()
+
+        self.write_keys(f"{FOLDER}/trusted", self.cas[2:])
+        clock[0] = 120
+        self.assertTrue(store.verify(certificate))
+        self.assertIsNone(store.reload_error)
+        self.assertEqual(len(store), 1)
+
+    def test_concurrent_automatic_reload(self):
+        self.write_keys(f"{FOLDER}/trusted", self.cas)
+        clock = [0]
+        store = TrustStore(reload_interval=60, clock=lambda: clock[0])
+        store.add_file(f"{FOLDER}/trusted")
+        certificate = create_certificate(self.cas[2], sign=True)
+
+        # The threads waiting for the lock find the files already checked
+        reload = TrustStore._reload
+        reloads = []
+
+        def slow_reload(store):
+            reloads.append(store)
+            time.sleep(0.05)
+            return reload(store)
+
+        self.write_keys(f"{FOLDER}/trusted", self.cas[1:])
+        clock[0] = 60
+        with mock.patch.object(
+            TrustStore, "_reload", autospec=True, side_effect=slow_reload
+        ), ThreadPoolExecutor(max_workers=8) as executor:
+            results = list(executor.map(store.resolve, [certificate] * 8))
+
+        self.assertEqual(len(reloads), 1)
+        self.assertTrue(all(result is not None for result in results))
+        self.assertEqual(len(store), 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,199 @@
+import mmap
+import tempfile
+import unittest
+from base64 import b64encode
+
+import src.sshkey_tools.exceptions as _EX
+import src.sshkey_tools.fields as _FIELD
+from src.sshkey_tools.wire import Base64Cursor, DecodeCursor, EncodeBuffer
+
+
+class TestDecodeCursor(unittest.TestCase):
+    def setUp(self):
+        self.data = (
+            _FIELD.StringField.encode("first")
+            + _FIELD.Integer32Field.encode(1234)
+            + _FIELD.Integer64Field.encode(2**40)
+            + _FIELD.ListField.encode(["a", "b", "c"])
+        )
+
+    def assertCursorReads(self, buffer):
+        cursor = DecodeCursor(buffer)
+
+        self.assertEqual(_FIELD.StringField.read(cursor), "first")
+        self.assertEqual(_FIELD.Integer32Field.read(cursor), 1234)
+        self.assertEqual(_FIELD.Integer64Field.read(cursor), 2**40)
+        self.assertEqual(_FIELD.ListField.read(cursor), ["a", "b", "c"])
+        self.assertTrue(cursor.at_end())
+
+    def test_buffer_types(self):
+        self.assertCursorReads(self.data)
+        self.assertCursorReads(bytearray(self.data))
+        self.assertCursorReads(memoryview(self.data))
+
+        with tempfile.TemporaryFile() as file:
+            file.write(self.data)
+            file.flush()
+
+            with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                self.assertCursorReads(mapped)
+
+    def test_zero_copy_slices(self):
+        cursor = DecodeCursor(self.data)
+        value = cursor.read_string()
+
+        self.assertIsInstance(value, memoryview)
+        self.assertIs(value.obj, self.data)
+        self.assertEqual(cursor.offset, 9)
+
+    def test_peek_and_skip(self):
+        cursor = DecodeCursor(self.data)
+
+        self.assertEqual(bytes(cursor.peek_string()), b"first")
+        self.assertEqual(cursor.offset, 0)
+
+        cursor.skip_string()
+        cursor.skip(12)
+        self.assertEqual(len(cursor.remainder()), cursor.remaining)
+
+    def test_sub_cursor_bounds(self):
+        cursor = DecodeCursor(_FIELD.StringField.encode("abc") + b"trailing")
+        sub = cursor.read_cursor()
+
+        self.assertEqual(bytes(sub.read_bytes(3)), b"abc")
+        self.assertTrue(sub.at_end())
+
+        with self.assertRaises(_EX.InvalidDataException):
+            sub.read_uint8()
+
+    def test_truncated_data(self):
+        with self.assertRaises(_EX.InvalidDataException):
+            DecodeCursor(b"\x00\x00").read_uint32()
+
+        with self.assertRaises(_EX.InvalidDataException):
+            DecodeCursor(b"\x00\x00\x00\x10abc").read_string()
+
+        with self.assertRaises(_EX.InvalidDataException):
+            _FIELD.StringField.decode(self.data[:6])
+
+
+class TestBase64Cursor(unittest.TestCase):
+    def setUp(self):
+        self.data = (
+            _FIELD.StringField.encode("first")
+            + _FIELD.Integer32Field.encode(1234)
+            + _FIELD.Integer64Field.encode(2**40)
+            + _FIELD.ListField.encode(["a", "b", "c"])
+        )
+
+    def assertCursorReads(self, buffer):
+        cursor = Base64Cursor(b64encode(buffer))
+
+        self.assertEqual(_FIELD.StringField.read(cursor), "first")
+        self.assertEqual(_FIELD.Integer32Field.read(cursor), 1234)
+        self.assertEqual(_FIELD.Integer64Field.read(cursor), 2**40)
+        self.assertEqual(_FIELD.ListField.read(cursor), ["a", "b", "c"])
+        self.assertTrue(cursor.at_end())
+
+    def test_buffer_types(self):
+        self.assertCursorReads(self.data)
+        self.assertCursorReads(memoryview(self.data))
+
+    def test_padding(self):
+        for tail in (b"", b"a", b"ab", b"abc"):
+            cursor = Base64Cursor(
+                b64encode(self.data + _FIELD.BytestringField.encode(tail))
+            )
+            cursor.skip(len(self.data))
+
+            self.assertEqual(_FIELD.BytestringField.read(cursor), tail)
+            self.assertTrue(cursor.at_end())
+
+    def test_incremental_decoding(self):
+        data = (
+            _FIELD.StringField.encode("first")
+            + _FIELD.BytestringField.encode(b"\xff" * 3000)
+            + _FIELD.Integer32Field.encode(1234)
+        )
+
+        cursor = Base64Cursor(b64encode(data))
+        self.assertEqual(cursor.decoded, 0)
+        self.assertEqual(_FIELD.StringField.read(cursor), "first")
+        self.assertLess(cursor.decoded, 16)
+
+        cursor.skip_string()
+        self.assertEqual(_FIELD.Integer32Field.read(cursor), 1234)
+        self.assertTrue(cursor.at_end())
+        self.assertEqual(bytes(cursor.buffer[-4:]), data[-4:])
+        self.assertEqual(bytes(cursor.buffer[100:200]), bytes(100))
+
+    def test_invalid_base64(self):
+        with self.assertRaises(_EX.InvalidDataException):
+            _ = Base64Cursor(b"abc")
+
+        with self.assertRaises(_EX.InvalidDataException):
+            _ = Base64Cursor(b"ab!@").read_uint8()
+
+        with self.assertRaises(_EX.InvalidDataException):
+            _ = Base64Cursor(b64encode(self.data[:6])).read_string()
+
+    def test_zero_copy_slices(self):
+        cursor = Base64Cursor(b64encode(self.data))
+        view = cursor.read_string()
+
+        self.assertIsInstance(view, memoryview)
+        self.assertIs(view.obj, cursor.buffer.obj)
+
+
+
+class TestEncodeBuffer(unittest.TestCase):
+    def test_write_and_read(self):
+        buffer = EncodeBuffer()
+        buffer.write_uint8(1)
+        buffer.write_uint32(1234)
+        buffer.write_uint64(2**40)
+        buffer.write_string(b"first")
+        buffer.write_string(memoryview(b"second"))
+
+        start = buffer.begin_string()
+        buffer.write_string(b"nested")
+        buffer.write(b"raw")
+        buffer.end_string(start)
+
+        cursor = DecodeCursor(buffer.getvalue())
+        self.assertEqual(cursor.read_uint8(), 1)
+        self.assertEqual(cursor.read_uint32(), 1234)
+        self.assertEqual(cursor.read_uint64(), 2**40)
+        self.assertEqual(bytes(cursor.read_string()), b"first")
+        self.assertEqual(bytes(cursor.read_string()), b"second")
+
+        nested = cursor.read_cursor()
+        self.assertEqual(bytes(nested.read_string()), b"nested")
+        self.assertEqual(nested.remainder(), b"raw")
+        self.assertTrue(cursor.at_end())
+        self.assertEqual(len(buffer), len(bytes(buffer)))
+
+    def test_field_encoding(self):
+        buffer = EncodeBuffer()
+        _FIELD.StringField.write(buffer, "first")
+        _FIELD.Integer32Field.write(buffer, 1234)
+        _FIELD.ListField.write(buffer, ["a", "b", "c"])
+        _FIELD.KeyValueField.write(buffer, {"key": "value", "flag": ""})
+
+        self.assertEqual(
+            buffer.getvalue(),
+            _FIELD.StringField.encode("first")
+            + _FIELD.Integer32Field.encode(1234)
+            + _FIELD.ListField.encode(["a", "b", "c"])
+            + _FIELD.KeyValueField.encode({"key": "value", "flag": ""}),
+        )
+
+    def test_multibyte_strings(self):
+        encoded = _FIELD.StringField.encode("pr\u00e9fix")
+
+        self.assertEqual(encoded[:4], b"\x00\x00\x00\x07")
+        self.assertEqual(_FIELD.StringField.read(DecodeCursor(encoded)), "pr\u00e9fix")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,145 @@
+import io
+import os
+import shutil
+import stat
+import unittest
+from unittest import mock
+
+import src.sshkey_tools.cert as _CERT
+import src.sshkey_tools.exceptions as _EX
+import src.sshkey_tools.keys as _KEY
+from src.sshkey_tools.bundle import CertificateBundleReader
+from src.sshkey_tools.writer import CertificateWriter, FsyncPolicy
+
+
+class TestCertificateWriter(unittest.TestCase):
+    def setUp(self):
+        self.folder = "tests/writer"
+        if os.path.isdir(self.folder):
+            shutil.rmtree(self.folder)
+        os.mkdir(self.folder)
+
+        self.ca = _KEY.Ed25519PrivateKey.generate()
+        self.certificates = []
+        for i in range(5):
+            certificate = _CERT.SSHCertificate.create(
+                subject_pubkey=_KEY.Ed25519PrivateKey.generate().public_key,
+                ca_privkey=self.ca,
+                fields=_CERT.CertificateFields(
+                    serial=i, key_id=f"KeyIdentifier{i}", principals=["pr_a"]
+                ),
+            )
+            certificate.sign()
+            self.certificates.append(certificate)
+
+    def tearDown(self):
+        shutil.rmtree(self.folder)
+
+    def test_write_files(self):
+        for policy in FsyncPolicy:
+            paths = [f"{self.folder}/{policy.value}-{i}-cert.pub" for i in range(5)]
+            with open(paths[0], "w", encoding="utf-8") as file:
+                file.write("Old certificate")
+            os.chmod(paths[0], 0o600)
+
+            writer = CertificateWriter(fsync=policy)
+            self.assertEqual(writer.write_files(zip(paths, self.certificates)), 5)
+
+            for path, certificate in zip(paths, self.certificates):
+                loaded = _CERT.SSHCertificate.from_file(path)
+                self.assertEqual(bytes(loaded), bytes(certificate))
+                self.assertTrue(loaded.verify(self.ca.public_key))
+
+            self.assertEqual(stat.S_IMODE(os.stat(paths[0]).st_mode), 0o600)
+            self.assertEqual(stat.S_IMODE(os.stat(paths[1]).st_mode), 0o644)
+
+        self.assertEqual(len(os.listdir(self.folder)), 15)
+
+    def test_batch_sync(self):
+        paths = [f"{self.folder}/batch-{i}-cert.pub" for i in range(5)]
+        writer = CertificateWriter(fsync=FsyncPolicy.BATCH)
+
+        # All files are flushed with one call, then only the directory
+        with mock.patch.object(os, "sync", create=True) as sync, mock.patch.object(
+            os, "fsync"
+        ) as fsync:
+            self.assertEqual(writer.write_files(zip(paths, self.certificates)), 5)
+
+        sync.assert_called_once_with()
+        self.assertLessEqual(fsync.call_count, 1)
+
+        # Without os.sync each file is flushed instead
+        sync = getattr(os, "sync", None)
+        if sync is not None:
+            del os.sync
+        try:
+            with mock.patch.object(os, "fsync") as fsync:
+                self.assertEqual(writer.write_files(zip(paths, self.certificates)), 5)
+        finally:
+            if sync is not None:
+                os.sync = sync
+
+        self.assertGreaterEqual(fsync.call_count, 5)
+
+    def test_write_bundle(self):
+        path = f"{self.folder}/bundle"
+        writer = CertificateWriter(buffer_size=512)
+        self.assertEqual(writer.write_bundle(path, self.certificates), 5)
+
+        with CertificateBundleReader(path) as reader:
+            self.assertEqual(
+                [bytes(cert) for cert in reader],
+                [bytes(cert) for cert in self.certificates],
+            )
+
+        self.assertEqual(writer.write_bundle(path, self.certificates[:2]), 2)
+        with CertificateBundleReader(path) as reader:
+            self.assertEqual(len(reader), 2)
+
+    def test_write_stream(self):
+        stream = io.BytesIO()
+        writer = CertificateWriter(buffer_size=512)
+        self.assertEqual(writer.write_stream(stream, self.certificates), 5)
+
+        lines = stream.getvalue().decode("utf-8").splitlines()
+        self.assertEqual(
+            lines, [cert.to_string().strip() for cert in self.certificates]
+        )
+
+        read_end, write_end = os.pipe()
+        with os.fdopen(write_end, "wb") as pipe:
+            writer.write_stream(pipe, self.certificates[:1])
+
+        with os.fdopen(read_end, "rb") as pipe:
+            self.assertEqual(pipe.read().decode("utf-8"), lines[0] + "\n")
+
+    def test_failed_write(self):
+        path = f"{self.folder}/bundle"
+        writer = CertificateWriter()
+        writer.write_bundle(path, self.certificates)
+
+        unsigned = _CERT.SSHCertificate.create(
+            subject_pubkey=_KEY.Ed25519PrivateKey.generate().public_key,
+            ca_privkey=self.ca,
+        )
+        for policy in FsyncPolicy:
+            writer = CertificateWriter(fsync=policy)
+            with self.assertRaises(_EX.InvalidCertificateFormatException):
+                writer.write_bundle(path, [self.certificates[0], unsigned])
+
+            with self.assertRaises(_EX.InvalidCertificateFormatException):
+                writer.write_files(
+                    [
+                        (f"{self.folder}/first", self.certificates[0]),
+                        (f"{self.folder}/second", unsigned),
+                    ]
+                )
+
+        # The existing bundle is unchanged and no temporary files are left
+        with CertificateBundleReader(path) as reader:
+            self.assertEqual(len(reader), 5)
+        self.assertEqual(sorted(os.listdir(self.folder)), ["bundle", "first"])
+
+
+if __name__ == "__main__":
+    unittest.main()